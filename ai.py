@@ -1,18 +1,28 @@
 """ This module contains `AI` - artificial player. """
 
 
-import time
+import math
+import queue
+import threading
+from typing import Iterable, List, Optional, Tuple
 import pygame
 # project modules #
 import game
+import game_configs as configs
 import singleton
 import exceptions
 
 
-class AI(metaclass=singleton.Singleton):
-    """ Artificial player. Now it imitates enemy. """
+class AIPlayer:
+    """ Artificial player of `empire`: builds mines and a barrack near its main city,
+    recruits scouts and sends them to attack enemy objects. """
 
-    def __init__(self, empire, create_delay: float = 2):
+    def __init__(self, empire, create_delay: float = 2, start_delay: float = 0,
+                 background_planning: bool = False):
+        """ Units are recruited every `create_delay` seconds, the first ones are recruited
+        right at the start of the game or `start_delay` seconds of game time later.
+        If `background_planning` is true, targets are planned on a worker thread
+        (see `BackgroundTargetPlanner`). """
         self.empire = empire
         for city in self.empire.cities:
             self.main_city = city
@@ -21,7 +31,9 @@ class AI(metaclass=singleton.Singleton):
         self.scouts = pygame.sprite.Group()
         self.warriors = pygame.sprite.Group()
         self._create_delay = create_delay
-        self._previous_unit_creation = 0
+        # As if units had been recruited `create_delay` seconds before the start.
+        self._previous_unit_creation = start_delay - create_delay
+        self.planner = BackgroundTargetPlanner(empire) if background_planning else TargetPlanner(empire)
         self.create_buildings()
 
     def create_buildings(self):
@@ -36,22 +48,204 @@ class AI(metaclass=singleton.Singleton):
 
     def play_step(self):
         try:
-            if time.time() - self._previous_unit_creation > self._create_delay:
-                self._previous_unit_creation = time.time()
+            now = game.Game().clock.time()
+            if now - self._previous_unit_creation > self._create_delay:
+                self._previous_unit_creation = now
                 for barrack in self.barracks:
                     self.scouts.add(barrack.create_scout())
         except exceptions.CreationError:
             pass
         finally:
-            for scout in self.scouts:
-                follow_scout_strategy(scout)
+            self.planner.update(self.scouts)
 
 
-def follow_scout_strategy(scout):
-    if scout.attack_target.sprite is None:
-        for _scout in AI().scouts:
-            if _scout.attack_target.sprite is not None:
-                scout.attack_target.add(_scout.attack_target.sprite)
+class AI(AIPlayer, metaclass=singleton.Singleton):
+    """ Artificial player which imitates enemy. Now it is the only opponent of player. """
+
+
+class TargetPlanner:
+    """ Assigns attack targets to AI units which have no target.
+    Targets are assigned for all units at once every `interval` seconds,
+    so per tick cost does not depend on number of units and enemy objects.
+
+    Every unit gets the enemy object with the lowest cost:
+
+        distance + health_weight * health + spread_weight * assigned damage / health
+
+    i.e. closer and weaker objects are preferred, and objects which are already
+    attacked by enough units (their damage covers object health) are less attractive,
+    so units spread between targets instead of piling onto one. """
+
+    def __init__(self, empire, interval: float = 0.5,
+                 health_weight: float = 20, spread_weight: float = 500):
+        self.empire = empire
+        self.interval = interval
+        self.health_weight = health_weight
+        self.spread_weight = spread_weight
+        self._previous_plan_time = None
+
+    def update(self, units: Iterable):
+        """ Plans targets of `units` if planning interval is over. """
+        now = game.Game().clock.time()
+        if self._previous_plan_time is None or now - self._previous_plan_time >= self.interval:
+            self._previous_plan_time = now
+            self.plan(units)
+
+    def reset(self):
+        """ Forgets previous planning (e.g. after game state has been restored). """
+        self._previous_plan_time = None
+
+    def plan(self, units: Iterable):
+        """ Assigns targets to `units` which have no target. """
+        self._apply(self.assign_targets(*self._world_state(units)))
+
+    def assign_targets(self, units: List[tuple], targets: List[tuple]) -> List[Tuple[int, int]]:
+        """ Returns `(unit id, target id)` assignments of `units` which have no target.
+        `units` and `targets` are states returned by `_world_state`. Game objects are not accessed,
+        so it can be called from any thread. """
+
+        idle_units = [unit for unit in units if unit[3] is None]
+        if not idle_units or not targets:
+            return []
+
+        # Damage of units which attack the target (including ones assigned earlier).
+        assigned_damage = {target_id: 0 for target_id, _, _ in targets}
+        for _, _, damage, target_id in units:
+            if target_id in assigned_damage:
+                assigned_damage[target_id] += damage
+
+        assignments = []
+        for unit_id, (x, y), damage, _ in idle_units:
+            best_target, best_cost = None, None
+            for target_id, (target_x, target_y), health in targets:
+                health = max(health, 1)
+                cost = (math.hypot(target_x - x, target_y - y)
+                        + self.health_weight * health
+                        + self.spread_weight * assigned_damage[target_id] / health)
+                if best_cost is None or cost < best_cost:
+                    best_target, best_cost = target_id, cost
+            assignments.append((unit_id, best_target))
+            assigned_damage[best_target] += damage
+        return assignments
+
+    def _world_state(self, units: Iterable) -> Tuple[List[tuple], List[tuple]]:
+        """ Returns immutable state planning depends on: `units` as `(id, position, damage, target id)`
+        (target id is `None` if unit has no target) and enemy objects as `(id, position, health)`. """
+        registry = game.Game().registry
+        unit_states = []
+        for unit in units:
+            target = unit.attack_target.sprite
+            unit_states.append((unit.entity_id, unit.rect.center, unit.damage,
+                                target.entity_id if target is not None else None))
+        targets = [(obj.entity_id, obj.rect.center, obj.health)
+                   for obj in self._enemy_objects() if not registry.is_pending_kill(obj)]
+        return unit_states, targets
+
+    def _apply(self, assignments: List[Tuple[int, int]]):
+        """ Sets targets of `assignments`. Assignments of units which have died or got a target
+        and of targets which have died are skipped. """
+        registry = game.Game().registry
+        for unit_id, target_id in assignments:
+            unit, target = registry.get(unit_id), registry.get(target_id)
+            if unit is None or target is None or registry.is_pending_kill(unit) or \
+                    registry.is_pending_kill(target) or unit.attack_target.sprite is not None:
+                continue
+            unit.attack_target.add(target)
+
+    def _enemy_objects(self) -> List:
+        """ Returns objects of empires other than planner empire. """
+        return [obj for obj in game.Game().registry if obj.empire is not self.empire]
+
+
+class BackgroundTargetPlanner(TargetPlanner):
+    """ Plans targets on a worker thread, so planning does not take frame time.
+
+    Every `interval` seconds planner passes immutable state of units and targets
+    (see `_world_state`) to the worker, unless the previous plan is still in progress:
+    the main loop never waits for the worker. Ready plans are applied at tick boundaries
+    (when `update` is called). A plan which is older than `max_age` ticks is discarded
+    since units have moved since then, and assignments of units or targets which have died
+    or of units which have got a target are skipped.
+
+    Planning is pure Python, so the worker shares the interpreter with the main loop:
+    it plans while the main loop sleeps between frames. The tick a plan is applied at
+    depends on the worker, so the game is not deterministic with this planner
+    (replays and tournaments use `TargetPlanner`). """
+
+    def __init__(self, empire, interval: float = 0.5,
+                 health_weight: float = 20, spread_weight: float = 500,
+                 max_age: int = configs.AI_PLAN_MAX_AGE):
+        TargetPlanner.__init__(self, empire, interval, health_weight, spread_weight)
+        self.max_age = max_age
+        self._jobs = queue.SimpleQueue()
+        self._plans = queue.SimpleQueue()
+        self._in_progress = False
+        # Plans of previous generations (before `reset`) are discarded.
+        self._generation = 0
+        self._thread = threading.Thread(target=self._work, name='ai-planner', daemon=True)
+        self._thread.start()
+
+    def update(self, units: Iterable):
+        """ Applies ready plans and starts planning of `units` if planning interval is over
+        and there is no plan in progress. """
+        self._apply_ready_plans()
+        if not self._in_progress:
+            TargetPlanner.update(self, units)
+
+    def plan(self, units: Iterable):
+        """ Passes state of `units` and their targets to the worker. """
+        unit_states, targets = self._world_state(units)
+        if all(unit[3] is not None for unit in unit_states) or not targets:
+            return
+        self._in_progress = True
+        self._jobs.put((self._generation, game.Game().clock.ticks, unit_states, targets))
+
+    def wait(self, timeout: float = None) -> bool:
+        """ Waits for the plan in progress and applies it.
+        Returns false if the plan is not ready after `timeout` seconds. """
+        while self._in_progress:
+            try:
+                self._handle(self._plans.get(timeout=timeout))
+            except queue.Empty:
+                return False
+        return True
+
+    def reset(self):
+        """ Forgets previous planning. The plan in progress is discarded. """
+        TargetPlanner.reset(self)
+        self._generation += 1
+        self._in_progress = False
+
+    def close(self):
+        """ Stops the worker. """
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
                 return
-        for obj in game.Game().player_emp.objects:
-            scout.attack_target.add(obj)
+            generation, tick, units, targets = job
+            try:
+                self._plans.put((generation, tick, self.assign_targets(units, targets), None))
+            except Exception as error:  # Is re-raised by the main thread.
+                self._plans.put((generation, tick, [], error))
+
+    def _apply_ready_plans(self):
+        while True:
+            try:
+                plan = self._plans.get_nowait()
+            except queue.Empty:
+                return
+            self._handle(plan)
+
+    def _handle(self, plan: Tuple[int, int, List[Tuple[int, int]], Optional[Exception]]):
+        generation, tick, assignments, error = plan
+        if generation != self._generation:
+            return
+        self._in_progress = False
+        if error is not None:
+            raise error
+        if game.Game().clock.ticks - tick <= self.max_age:
+            self._apply(assignments)
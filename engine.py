@@ -0,0 +1,118 @@
+""" This module contains game engine functions which advance game state
+independently of rendering. Both `play_game` and `headless` are based on it. """
+
+
+from typing import Tuple
+# project modules #
+import user_configs
+import game_configs as configs
+import game_clock
+import navigation
+from profiler import Profiler
+from game import Game
+from game_objects import races
+from game_objects import game_objects_configs as objects_configs
+from game_objects.empire import Empire
+from game_objects.units import movement
+from world_map import Map
+from ai import AI
+from interface.interface_class import Interface
+
+
+def init_game(player_race: str = user_configs.EMPIRE_RACE,
+              player_name: str = user_configs.EMPIRE_NAME,
+              city_name: str = user_configs.CITY_NAME,
+              enemy_race: str = races.DWARFS,
+              ai_start_delay: float = 0,
+              background_ai: bool = False,
+              enemy_name: str = 'Durden',
+              enemy_ai: bool = True,
+              local_enemy: bool = False) -> Tuple[Empire, Empire]:
+    """ Creates empires with their default cities and initializes game singletons.
+    Enemy AI recruits the first units `ai_start_delay` seconds later than usual.
+    If `background_ai` is true, it plans on a worker thread (see `ai.BackgroundTargetPlanner`).
+    If `enemy_ai` is false, enemy is played by another player (see `lockstep`),
+    and if `local_enemy` is true, interface is shown to enemy empire player.
+    Returns player and enemy empires. """
+
+    player_empire = Empire(player_race, name=player_name)
+    enemy_empire = Empire(enemy_race, name=enemy_name)
+
+    # Initialize game singletons.
+    Game(player_empire, enemy_empire,
+         clock=game_clock.GameClock(speed=user_configs.GAME_SPEED),
+         movement=movement.MovementSystem() if configs.VECTORIZED_MOVEMENT else None,
+         navigation=_create_navigation() if configs.FLOW_FIELD_NAVIGATION else None)
+    if local_enemy:
+        Interface(enemy_empire, player_empire)
+    else:
+        Interface(player_empire, enemy_empire)
+
+    player_empire.set_city(city_name)
+    player_default_city = player_empire.get_city(city_name)
+    player_default_city.rect.x = 500
+    player_default_city.rect.centery = Map().rect.centery
+    player_default_city.update_position()
+
+    enemy_empire.set_city("Nuhen")
+    enemy_default_city = enemy_empire.get_city("Nuhen")
+    enemy_default_city.rect.right = Map().rect.right - 700
+    enemy_default_city.rect.centery = Map().rect.centery
+    enemy_default_city.update_position()
+
+    if local_enemy:
+        # Enemy player starts looking at its city.
+        Interface().camera.center = enemy_default_city.rect.center
+        Interface().camera.clamp_ip(Map().rect)
+        Interface().minimap.move_frame(Interface().camera.topleft)
+    if enemy_ai:
+        AI(enemy_empire, start_delay=ai_start_delay, background_planning=background_ai)
+    return player_empire, enemy_empire
+
+
+def _create_navigation() -> navigation.NavigationGrid:
+    return navigation.NavigationGrid(configs.MAP_SIZE,
+                                     objects_configs.NAVIGATION_CELL_SIZE,
+                                     objects_configs.NAVIGATION_CLEARANCE,
+                                     objects_configs.FLOW_FIELD_CACHE_SIZE)
+
+
+def is_finished() -> bool:
+    """ Returns true if any of empires is out of cities. """
+    return not Game().player_emp.alive() or not Game().enemy_emp.alive()
+
+
+def update_objects():
+    """ Updates all game objects except ones which have died during the tick. """
+    # Objects which die during the tick are killed only at its end (see `EntityRegistry.flush`),
+    # so they are not updated after death, but stay in groups till the tick is over.
+    registry = Game().registry
+    for obj in Game().objects:
+        if not registry.is_pending_kill(obj):
+            obj.update()
+
+
+def tick(ai: bool = True) -> bool:
+    """ Advances the game by one fixed tick: AI step, win/loss check, objects update,
+    batched units movement (if enabled), removal of dead objects and game clock step.
+    If `ai` is false, AI step is skipped (AI is played by the caller at its own rate).
+    Returns false if the game is finished (objects are not updated in this case). """
+
+    profiler = Profiler()
+    if ai:
+        with profiler.phase('ai'):
+            # AI is singleton, which has been initialized before.
+            AI().play_step()
+
+    if is_finished():
+        return False
+
+    with profiler.phase('update_objects'):
+        update_objects()
+    if Game().movement is not None:
+        with profiler.phase('movement'):
+            Game().movement.step(Game().objects, Game().navigation)
+    with profiler.phase('flush'):
+        Game().registry.flush()
+    Game().clock.tick()
+    return True
@@ -0,0 +1,111 @@
+""" This module contains `EntityRegistry` which keeps track of game objects by stable integer ids. """
+
+
+from typing import Dict, Iterator, List
+
+
+class EntityRegistry:
+    """ Assigns stable integer ids to game objects and lets to look them up by id,
+    empire or kind (class) cheaply.
+    Also it postpones objects removal: objects which died during a tick are
+    scheduled to be killed and are killed all at once at the end of the tick (see `flush`). """
+
+    def __init__(self):
+        self._entities: Dict[int, object] = {}
+        self._by_empire: Dict[object, Dict[int, object]] = {}
+        self._by_kind: Dict[type, Dict[int, object]] = {}
+        self._pending_kill: Dict[int, object] = {}
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._entities.values()))
+
+    def __contains__(self, obj) -> bool:
+        return self._entities.get(getattr(obj, 'entity_id', None)) is obj
+
+    @property
+    def next_id(self) -> int:
+        """ Id the next registered object gets if id is not specified. """
+        return self._next_id
+
+    @next_id.setter
+    def next_id(self, value: int):
+        """ Sets id of the next object (used to restore saved games).
+        It must be greater than ids of all registered objects. """
+        if self._entities and value <= max(self._entities):
+            raise EntityRegistryError(f'Next entity id {value} is already used or passed.')
+        self._next_id = value
+
+    def register(self, obj, entity_id: int = None) -> int:
+        """ Adds `obj` to registry and sets its `entity_id`.
+        If `entity_id` is not specified, a new unique id is assigned. Returns the id. """
+
+        if entity_id is None:
+            entity_id = self._next_id
+        elif entity_id in self._entities:
+            raise EntityRegistryError(f'Entity id {entity_id} is already in use.')
+        self._next_id = max(self._next_id, entity_id + 1)
+
+        obj.entity_id = entity_id
+        self._entities[entity_id] = obj
+        self._by_empire.setdefault(obj.empire, {})[entity_id] = obj
+        self._by_kind.setdefault(type(obj), {})[entity_id] = obj
+        return entity_id
+
+    def unregister(self, obj):
+        """ Removes `obj` from registry. Does nothing if it is not registered. """
+        if obj not in self:
+            return
+        entity_id = obj.entity_id
+        del self._entities[entity_id]
+        del self._by_empire[obj.empire][entity_id]
+        del self._by_kind[type(obj)][entity_id]
+        self._pending_kill.pop(entity_id, None)
+
+    def reassign(self, obj, entity_id: int):
+        """ Changes id of registered `obj` to `entity_id` (used to restore saved games). """
+        self.unregister(obj)
+        self.register(obj, entity_id)
+
+    def get(self, entity_id: int):
+        """ Returns object with `entity_id` id or `None` if it does not exist. """
+        return self._entities.get(entity_id)
+
+    def of_empire(self, empire) -> List:
+        """ Returns objects of `empire`. """
+        return list(self._by_empire.get(empire, {}).values())
+
+    def of_kind(self, kind: type, empire=None) -> List:
+        """ Returns objects which are instances of `kind` (of `empire` if it is specified). """
+        result = []
+        for cls, objects in self._by_kind.items():
+            if issubclass(cls, kind):
+                if empire is None:
+                    result += objects.values()
+                else:
+                    result += [obj for obj in objects.values() if obj.empire is empire]
+        return result
+
+    def schedule_kill(self, obj):
+        """ Marks `obj` to be killed at the end of current tick. """
+        if obj in self:
+            self._pending_kill[obj.entity_id] = obj
+
+    def is_pending_kill(self, obj) -> bool:
+        """ Returns true if `obj` is going to be killed at the end of current tick. """
+        return getattr(obj, 'entity_id', None) in self._pending_kill
+
+    def flush(self):
+        """ Kills all objects scheduled to be killed. """
+        if not self._pending_kill:
+            return
+        for obj in list(self._pending_kill.values()):
+            obj.kill()
+        self._pending_kill.clear()
+
+
+class EntityRegistryError(Exception):
+    pass
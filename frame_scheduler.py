@@ -0,0 +1,118 @@
+""" This module contains `FrameScheduler` which runs periodic tasks of the game loop
+(input polling, ticks, rendering, etc.) as cooperative asyncio tasks.
+Usage example:
+
+scheduler = FrameScheduler()
+scheduler.add('tick', engine.tick, rate=lambda: Game().clock.frame_rate())
+scheduler.add('minimap', refresh_minimap, rate=2, low_priority=True)
+asyncio.run(scheduler.run())
+
+Every task has its own rate (runs per second), which may change over time.
+High priority tasks run when they are due. Low priority tasks run only if they are
+expected to finish before the next high priority task is due (their last duration
+is the estimation), so they are postponed instead of stretching a frame. A low priority
+task runs anyway if it has been postponed for its whole period, so it is never starved.
+
+Callbacks may be coroutine functions: they yield to other tasks while they wait
+(e.g. for a file write in executor or for a socket). """
+
+
+import time
+import asyncio
+from typing import Callable, Dict, List, Text, Union
+
+
+class _Task:
+    def __init__(self, name: Text, callback: Callable, rate: Union[float, Callable[[], float]], low_priority: bool):
+        self.name = name
+        self.callback = callback
+        self.rate = rate if callable(rate) else lambda: rate
+        self.low_priority = low_priority
+        self.next_time = 0.0
+        # Duration of the last run (in seconds).
+        self.estimate = 0.0
+        self.runs = 0
+        self.postponed = 0
+
+
+class FrameScheduler:
+    """ Runs added tasks until `stop` is called or a task raises an exception. """
+
+    def __init__(self):
+        self._tasks: List[_Task] = []
+        self._stopped = False
+
+    def add(self, name: Text, callback: Callable, rate: Union[float, Callable[[], float]],
+            low_priority: bool = False):
+        """ Adds `name` task which calls `callback` `rate` times per second.
+        `rate` is either a number or a function which returns the current rate. """
+        if any(task.name == name for task in self._tasks):
+            raise FrameSchedulerError(f'Task {name} has already been added.')
+        self._tasks.append(_Task(name, callback, rate, low_priority))
+
+    def stop(self):
+        """ Stops all tasks. A running task is finished first. """
+        self._stopped = True
+
+    def statistics(self) -> Dict[Text, Dict[Text, float]]:
+        """ Returns numbers of runs and postponements and the last duration (in milliseconds) of tasks. """
+        return {task.name: {'runs': task.runs, 'postponed': task.postponed, 'last_ms': task.estimate * 1000}
+                for task in self._tasks}
+
+    async def run(self):
+        """ Runs tasks in the current event loop. """
+        self._stopped = False
+        now = time.perf_counter()
+        for task in self._tasks:
+            task.next_time = now
+        tasks = [asyncio.ensure_future(self._run_task(task)) for task in self._tasks]
+        try:
+            # The first exception stops the scheduler.
+            await asyncio.gather(*tasks)
+        finally:
+            self._stopped = True
+            for task in tasks:
+                task.cancel()
+
+    async def _run_task(self, task: _Task):
+        while not self._stopped:
+            await _sleep_until(task.next_time)
+            if task.low_priority:
+                await self._wait_for_spare_time(task)
+            if self._stopped:
+                return
+
+            start = time.perf_counter()
+            result = task.callback()
+            if asyncio.iscoroutine(result):
+                await result
+            end = time.perf_counter()
+            task.estimate = end - start
+            task.runs += 1
+
+            task.next_time += 1 / task.rate()
+            # Missed runs are skipped instead of being run in a burst.
+            task.next_time = max(task.next_time, end)
+
+    async def _wait_for_spare_time(self, task: _Task):
+        """ Waits until `task` fits before the next high priority task or its whole period has passed. """
+        deadline = task.next_time + 1 / task.rate()
+        while not self._stopped:
+            now = time.perf_counter()
+            next_high_priority = min((other.next_time for other in self._tasks if not other.low_priority),
+                                     default=float('inf'))
+            if now + task.estimate <= next_high_priority or now >= deadline:
+                return
+            task.postponed += 1
+            # Let high priority tasks run, then check again.
+            await _sleep_until(min(next_high_priority, deadline))
+            await asyncio.sleep(0)
+
+
+async def _sleep_until(moment: float):
+    delay = moment - time.perf_counter()
+    await asyncio.sleep(max(delay, 0))
+
+
+class FrameSchedulerError(Exception):
+    pass
@@ -1,16 +1,39 @@
 """ This module contains `Game` singleton which links game entities and represents game states. """
 
 
-import pygame
 # project modules #
 import singleton
+import game_clock
+import spatial_index
+import entity_registry
+import proximity_index
+import navigation as navigation_grid
+from game_objects.units import movement as movement_system
+from game_objects import game_objects_configs as configs
 
 
 class Game(metaclass=singleton.Singleton):
     """ A mediator which links game entities and represents game states (play, menu, etc.). """
 
-    objects = pygame.sprite.RenderUpdates()
+    # All game objects. They are indexed spatially, so objects nearby a point or rect
+    # can be found quickly (see `spatial_index.SpatialGroup`).
+    objects = spatial_index.SpatialGroup(configs.SPATIAL_INDEX_CELL_SIZE)
+    # The same objects by their ids. Also it is responsible for deferred objects removal.
+    registry = entity_registry.EntityRegistry()
+    # Centers of the same objects grouped by empire. It answers "nearest enemy" queries.
+    proximity = proximity_index.ProximityIndex(configs.PROXIMITY_INDEX_CELL_SIZE)
 
-    def __init__(self, player_empire, enemy_empire):
+    def __init__(self, player_empire, enemy_empire,
+                 clock: game_clock.GameClock = None,
+                 movement: movement_system.MovementSystem = None,
+                 navigation: 'navigation_grid.NavigationGrid' = None):
         self.player_emp = player_empire
         self.enemy_emp = enemy_empire
+        # All timed behaviour reads game time from this clock.
+        self.clock = clock if clock is not None else game_clock.GameClock()
+        # Optional system which moves all units in one batched step per tick.
+        # If it is None, every unit moves itself during its update.
+        self.movement = movement
+        # Optional grid units use to walk around buildings.
+        # If it is None, units move straight toward their destinations.
+        self.navigation = navigation
@@ -0,0 +1,67 @@
+""" This module contains `GameClock` - a virtual clock all timed game behaviour is based on. """
+
+
+# project modules #
+import game_configs as configs
+
+
+# Available game speeds (multipliers of the normal tick rate). `None` means unbounded speed.
+SPEEDS = (1, 2, 4, 8, None)
+
+
+class GameClock:
+    """ Virtual simulation clock. It advances by a fixed step every tick,
+    so game time does not depend on how fast ticks are computed.
+    Game speed shows how many ticks are computed per real second. """
+
+    def __init__(self, tick_rate: int = configs.TICK_RATE, speed: int = 1):
+        self.tick_rate = tick_rate
+        self.tick_duration = 1 / tick_rate
+        self.ticks = 0
+        self._time = 0.0
+        self._speed_index = SPEEDS.index(speed)
+
+    def time(self) -> float:
+        """ Returns game time (in seconds) passed since game start. """
+        return self._time
+
+    def tick(self):
+        """ Advances clock by one tick. """
+        self.set_ticks(self.ticks + 1)
+
+    def set_ticks(self, ticks: int):
+        """ Moves clock to `ticks` tick (used to restore saved games). """
+        if ticks < 0:
+            raise GameClockError(f'Ticks number must not be negative, got {ticks}.')
+        self.ticks = ticks
+        self._time = self.ticks * self.tick_duration
+
+    @property
+    def speed(self) -> int or None:
+        """ Returns current game speed multiplier (`None` if speed is unbounded). """
+        return SPEEDS[self._speed_index]
+
+    def set_speed(self, speed: int or None):
+        """ Sets game speed multiplier. It must be one of `SPEEDS`. """
+        if speed not in SPEEDS:
+            raise GameClockError(f'Speed must be one of {SPEEDS}, not {speed}.')
+        self._speed_index = SPEEDS.index(speed)
+
+    def speed_up(self):
+        """ Switches to the next (faster) game speed if it exists. """
+        self._speed_index = min(self._speed_index + 1, len(SPEEDS) - 1)
+
+    def slow_down(self):
+        """ Switches to the previous (slower) game speed if it exists. """
+        self._speed_index = max(self._speed_index - 1, 0)
+
+    def frame_rate(self) -> int:
+        """ Returns number of ticks per real second for current speed.
+        0 means there is no limit (`pygame.time.Clock.tick` convention). """
+        if self.speed is None:
+            return 0
+        return self.tick_rate * self.speed
+
+
+class GameClockError(Exception):
+    pass
@@ -5,3 +5,64 @@ Do not change if not confident. """
 
 MAP_SIZE = MAP_WIDTH, MAP_HEIGHT = 5000, 5000
 SCR_SIZE = SCR_WIDTH, SCR_HEIGHT = 1920, 1000
+
+# Number of simulation ticks per second of game time.
+TICK_RATE = 50
+
+# If true, only changed screen areas are redrawn every frame. Otherwise, the whole screen is.
+DIRTY_RECT_RENDERING = True
+
+# If true, all units are moved in one batched step per tick (requires NumPy).
+# Otherwise, every unit moves itself during its update.
+VECTORIZED_MOVEMENT = False
+
+# If true, units walk around buildings using flow fields (see `navigation`).
+# Otherwise, they move straight toward their destinations.
+FLOW_FIELD_NAVIGATION = True
+
+# If true, AI plans targets of its units on a worker thread, so planning does not take frame time.
+# It makes the game nondeterministic, so it is not used while the game is recorded.
+BACKGROUND_AI_PLANNING = True
+# AI plans which are older than this number of ticks are discarded.
+AI_PLAN_MAX_AGE = TICK_RATE // 5
+
+# asyncio game loop settings (see `play_game.py --asyncio`): frames and AI steps per second.
+ASYNC_RENDER_RATE = 50
+ASYNC_AI_RATE = TICK_RATE // 2
+# Every this number of seconds frame profiler statistics are appended to telemetry file
+# (only while the profiler is enabled).
+TELEMETRY_INTERVAL = 5
+TELEMETRY_FILE = 'telemetry.jsonl'
+
+# Lockstep multiplayer settings (see `lockstep`): orders are executed this number of ticks
+# after they are issued (it hides network latency), batches of orders of this number of ticks
+# are sent together (it must not exceed the delay), players compare game states every
+# this number of ticks, connection and other player answers are waited for this number of seconds.
+LOCKSTEP_INPUT_DELAY = TICK_RATE // 5
+LOCKSTEP_SEND_INTERVAL = TICK_RATE // 10
+LOCKSTEP_CHECKSUM_INTERVAL = TICK_RATE
+LOCKSTEP_CONNECT_TIMEOUT = 30
+
+# Number of last frames frame profiler keeps timings of (see `profiler`).
+PROFILER_WINDOW = 300
+# Frame profiler histograms consist of this number of bins of this width (in milliseconds).
+PROFILER_HISTOGRAM_BINS = 20
+PROFILER_HISTOGRAM_BIN_WIDTH = 2
+# File and number of last frames exported as Chrome trace from the game.
+PROFILER_TRACE_FILE = 'frames_trace.json'
+PROFILER_TRACE_FRAMES = 120
+
+# Every this number of ticks the whole game state is saved into input recording,
+# so replay can start from the nearest saved state (see `replay`).
+REPLAY_KEYFRAME_INTERVAL = 500
+
+# Quick save file (see `snapshot`). The game is saved into it by F5 and is loaded from it by F9.
+SAVE_FILE = 'quicksave.lots'
+
+# AI-vs-AI tournament settings (see `tournament`): matches per race pairing,
+# game time limit (in ticks), real time limit (in seconds) of a match
+# and interval (in ticks) empires resources are sampled at.
+TOURNAMENT_MATCHES = 10
+TOURNAMENT_MAX_TICKS = TICK_RATE * 60 * 10
+TOURNAMENT_TIMEOUT = 120
+TOURNAMENT_SAMPLE_INTERVAL = TICK_RATE * 5
@@ -3,6 +3,7 @@
 
 import collections
 from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List
 from game_objects.units import unit as unit_mod
 
 # Army is based on wide-spread Composite & Iterator & Visitor pattern.
@@ -10,7 +11,7 @@ from game_objects.units import unit as unit_mod
 # Composite.
 class ArmyComponent(ABC):
 
-    _parent: 'ArmyComponent'
+    _parent: 'ArmyComponent' = None
 
     @property
     def parent(self):
@@ -22,7 +23,7 @@ class ArmyComponent(ABC):
 
     @property
     @abstractmethod
-    def groups(self) -> list:
+    def groups(self) -> Iterable['ArmyComponent']:
         pass
 
     def get_unit(self) -> unit_mod.Unit:
@@ -34,24 +35,26 @@ class ArmyComponent(ABC):
 
 class ArmyComposite(ArmyComponent):
 
-    _groups: list
+    # Dict is used as ordered set, so components are removed in constant time.
+    _groups: Dict[ArmyComponent, None]
 
     def __init__(self):
-        self._groups = list()
+        self._groups = dict()
 
     def __iter__(self) -> 'ArmyIterator':
         return ArmyIterator(self)
 
     @property
-    def groups(self) -> list:
-        return self._groups
+    def groups(self) -> Iterable[ArmyComponent]:
+        return self._groups.keys()
 
     def add(self, component: ArmyComponent):
-        self._groups.append(component)
+        self._groups[component] = None
         component.parent = self
 
     def remove(self, component):
-        self._groups.remove(component)
+        del self._groups[component]
+        component.parent = None
 
 
 class ArmyLeaf(ArmyComponent):
@@ -59,9 +62,9 @@ class ArmyLeaf(ArmyComponent):
         self._unit = unit
 
     @property
-    def groups(self) -> list:
-        """returns empty list, for there are no children"""
-        return list()
+    def groups(self) -> Iterable[ArmyComponent]:
+        """returns empty tuple, for there are no children"""
+        return ()
 
     def get_unit(self) -> unit_mod.Unit:
         return self._unit
@@ -93,32 +96,79 @@ class ArmyIterator(collections.abc.Iterator):
 
 # Visitor.
 class Army:
-    """ Army rules with units and lets to group them in troops. """
+    """ Army rules with units and lets to group them in troops.
+    Besides the hierarchy, it keeps units leaves by unit ids and numbers of units
+    of every type, so lookups and statistics do not walk the hierarchy.
+    Units leave the army when they are killed (see `Unit.kill`). """
 
     def __init__(self, empire):
         self.empire = empire
         self._army = ArmyComposite()
+        # Unit id -> leaf of the unit.
+        self._leaves: Dict[int, ArmyLeaf] = {}
+        # Unit type -> number of units of the type.
+        self._counts: Dict[type, int] = collections.Counter()
+
+    def __contains__(self, unit: unit_mod.Unit) -> bool:
+        leaf = self._leaves.get(getattr(unit, 'entity_id', None))
+        return leaf is not None and leaf.get_unit() is unit
 
     def info(self):
         print("Empire: {}".format(self.empire.name))
         print("Race: {}".format(self.empire.race))
         print("Army consists of:")
-        for group in self._army:
-            if not group.is_compound():
-                group.get_unit().info()
+        for leaf in self._leaves.values():
+            leaf.get_unit().info()
 
     def recruit_unit(self, unit: unit_mod.Unit):
-        self._army.add(ArmyLeaf(unit))
+        leaf = ArmyLeaf(unit)
+        self._army.add(leaf)
+        self._index(leaf)
+
+    def get_leaf(self, unit_id: int) -> ArmyLeaf:
+        """ Returns leaf of unit with `unit_id` id or `None` if there is no such unit in the army. """
+        return self._leaves.get(unit_id)
+
+    def remove_unit(self, unit: unit_mod.Unit):
+        """ Removes `unit` from the army. Does nothing if it is not in the army. """
+        if unit in self:
+            self.remove_group(self._leaves[unit.entity_id])
 
     def remove_group(self, group: ArmyComponent):
-        for component in self._army:
-            if component is group:
-                component.parent.remove(component)
-                break
+        if group is self._army or not self._is_member(group):
+            return
+        for component in ArmyIterator(group):
+            if not component.is_compound():
+                self._unindex(component)
+        group.parent.remove(group)
+
+    def units(self) -> List[unit_mod.Unit]:
+        """ Returns units of the army in order they have been recruited. """
+        return [leaf.get_unit() for leaf in self._leaves.values()]
 
     def size(self) -> int:
-        result = 0
-        for component in self._army:
-            if not component.is_compound():
-                result += 1
-        return result
+        return len(self._leaves)
+
+    def count(self, kind: type = unit_mod.Unit) -> int:
+        """ Returns number of units which are instances of `kind`. """
+        return sum(number for unit_type, number in self._counts.items() if issubclass(unit_type, kind))
+
+    def _is_member(self, component: ArmyComponent) -> bool:
+        """ Returns true if `component` is a part of the army hierarchy. """
+        if not component.is_compound():
+            return self._leaves.get(component.get_unit().entity_id) is component
+        while component is not None and component is not self._army:
+            component = component.parent
+        return component is self._army
+
+    def _index(self, leaf: ArmyLeaf):
+        unit = leaf.get_unit()
+        self._leaves[unit.entity_id] = leaf
+        self._counts[type(unit)] += 1
+
+    def _unindex(self, leaf: ArmyLeaf):
+        unit = leaf.get_unit()
+        del self._leaves[unit.entity_id]
+        self._counts[type(unit)] -= 1
+        if not self._counts[type(unit)]:
+            del self._counts[type(unit)]
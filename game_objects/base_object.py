@@ -9,6 +9,7 @@ import pygame
 import exceptions
 import image as img
 import game
+import game_configs
 from game_objects import game_objects_configs as configs
 from interface import click_handler
 from windows import window
@@ -17,27 +18,43 @@ from windows import window
 class GameObject(window.Window, ABC):
     """ Base class of all visible objects (buildings, units, etc. ). """
 
+    # Shows if object can change its position (i.e. it is a unit).
+    movable = False
+
     def __init__(self,
                  empire,
                  health: int,
                  cost: int,
-                 image: pygame.Surface,
+                 kind: Text,
                  size: Tuple[int, int]):
+        """ `kind` is a name of empire race image (e.g. 'WARRIOR', see `image.get_image`). """
 
         self._assert_creation_is_possible(empire, cost)
 
-        window.Window.__init__(self, image, size=size)
+        # Images are shared between all objects of the same race, kind and size.
+        window.Window.__init__(self, img.get_sprite(empire.race, kind, size), shared=True)
 
         self.empire = empire
         self.cost = cost
         self.health = health
-        self.icon_image = image
-        self.minimap_image = pygame.transform.scale(self.icon_image, tuple(
+        self.kind = kind
+        self.icon_image = getattr(img.get_image(empire), kind)
+        self.minimap_image = img.get_sprite(empire.race, kind, tuple(
             [int(i * configs.MINIMAP_ICONS_SIZE_NORMALIZATION_FACTOR) for i in size]))
         self._all_objects = game.Game().objects
+        self._registry = game.Game().registry
 
         game.Game().objects.add(self)
         self.empire.objects.add(self)
+        # Sets `entity_id`.
+        self._registry.register(self)
+
+    def update_position(self):
+        """ Is called after object position is changed outside of the object itself
+        (e.g. after placing) to keep spatial index and navigation grid up to date. """
+        self._all_objects.reindex(self)
+        if not self.movable:
+            self._invalidate_navigation()
 
     def increase_health(self, value: int):
         """ Increases health by positive `value` value. """
@@ -50,9 +67,8 @@ class GameObject(window.Window, ABC):
         if self.health <= 0:
             self.die()
 
-        tmp_image = pygame.Surface(self.rect.size)
-        tmp_image.fill(pygame.Color('red'))
-        self.set_tmp_image(tmp_image, delay=0.06)
+        # Flash image is shared, so hits do not create new surfaces.
+        self.set_tmp_image(img.SpriteAtlas().filled(self.rect.size, pygame.Color('red')), delay=0.06)
 
     def info(self) -> Text:
         """ Returns string represents object information. """
@@ -71,9 +87,17 @@ class GameObject(window.Window, ABC):
         self.die()
 
     def die(self):
-        """ Is called when object is out of health. """
+        """ Is called when object is out of health.
+        Object is killed at the end of current tick (see `EntityRegistry.flush`). """
         click_handler.ClickHandler().handle_object_kill(self)
-        self.kill()
+        self._registry.schedule_kill(self)
+
+    def kill(self):
+        """ Removes object from the game immediately. """
+        self._registry.unregister(self)
+        window.Window.kill(self)
+        if not self.movable:
+            self._invalidate_navigation()
 
     # Window methods.
     def first_click_action(self):
@@ -112,6 +136,21 @@ class GameObject(window.Window, ABC):
         while clicked, these commands wait for another object click to interact with one. """
         return []
 
+    def _find_free_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """ Returns the nearest to `rect` free place of the same size on the map.
+        Raises `CreationPlaceError` if there is no free place nearby. """
+        free_rect = self._all_objects.find_free_rect(rect, configs.PLACEMENT_SEARCH_DISTANCE,
+                                                     bounds=pygame.Rect((0, 0), game_configs.MAP_SIZE))
+        if free_rect is None:
+            raise exceptions.CreationPlaceError("Can't create object - there is no free place nearby.")
+        return free_rect
+
+    @staticmethod
+    def _invalidate_navigation():
+        """ Is called when a building appears or disappears, so paths should be recomputed. """
+        if game.Game().navigation is not None:
+            game.Game().navigation.invalidate()
+
     def _assert_creation_is_possible(self, empire, cost: int):
         if empire.resources - cost < 0:
             raise exceptions.CreationResourcesLimitError(f"Can't create object - lack of resources")
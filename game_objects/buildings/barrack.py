@@ -1,12 +1,12 @@
 """ This module contains `Barrack` - a units factory. """
 
 
-import time
 from abc import ABC, abstractmethod
 from typing import Tuple, List, Callable, Text
 import pygame
 # project modules #
 import exceptions
+import game
 import image as img
 from game_objects import game_objects_configs as configs
 from game_objects.buildings import base_building
@@ -21,8 +21,7 @@ class Barrack(base_building.Building, ABC):
     def create_builder(self):
         """ Creates and returns builder. """
 
-        rect = self._get_unit_rect(configs.BUILDER_SIZE)
-        self._assert_creation_place_is_free(rect)
+        rect = self._find_free_rect(self._get_unit_rect(configs.BUILDER_SIZE))
         unit = self._create_builder(size=configs.BUILDER_SIZE)
         self._action_after_unit_creation(unit, rect)
         return unit
@@ -30,8 +29,7 @@ class Barrack(base_building.Building, ABC):
     def create_scout(self):
         """ Creates and returns scout. """
 
-        rect = self._get_unit_rect(configs.SCOUT_SIZE)
-        self._assert_creation_place_is_free(rect)
+        rect = self._find_free_rect(self._get_unit_rect(configs.SCOUT_SIZE))
         unit = self._create_scout(size=configs.SCOUT_SIZE)
         self._action_after_unit_creation(unit, rect)
         return unit
@@ -39,12 +37,38 @@ class Barrack(base_building.Building, ABC):
     def create_warrior(self):
         """ Creates and returns warrior. """
 
-        rect = self._get_unit_rect(configs.WARRIOR_SIZE)
-        self._assert_creation_place_is_free(rect)
+        rect = self._find_free_rect(self._get_unit_rect(configs.WARRIOR_SIZE))
         unit = self._create_warrior(size=configs.WARRIOR_SIZE)
         self._action_after_unit_creation(unit, rect)
         return unit
 
+    def create_builders(self, number: int) -> List[builder.Builder]:
+        """ Creates and returns up to `number` builders (see `create_units`). """
+        return self.create_units(self.create_builder, number)
+
+    def create_scouts(self, number: int) -> List[scout.Scout]:
+        """ Creates and returns up to `number` scouts (see `create_units`). """
+        return self.create_units(self.create_scout, number)
+
+    def create_warriors(self, number: int) -> List[warrior.Warrior]:
+        """ Creates and returns up to `number` warriors (see `create_units`). """
+        return self.create_units(self.create_warrior, number)
+
+    @staticmethod
+    def create_units(create: Callable, number: int) -> List:
+        """ Calls `create` (e.g. `create_scout`) `number` times and returns created units.
+        Stops when a unit can't be created (e.g. resources are over) and raises
+        the error only if no unit has been created. """
+        units = []
+        for _ in range(number):
+            try:
+                units.append(create())
+            except exceptions.CreationError:
+                if not units:
+                    raise
+                break
+        return units
+
     # These methods are hidden and overridden in inheritors.
     # They take `size` as argument to avoid unnecessary copies.
     # (Builders of any race, for example, have identical size, so
@@ -67,13 +91,6 @@ class Barrack(base_building.Building, ABC):
         rect.top = self.rect.bottom + 20
         return rect
 
-    def _assert_creation_place_is_free(self, rect: pygame.Rect):
-        sprite = pygame.sprite.Sprite()
-        sprite.rect = rect
-        if pygame.sprite.spritecollideany(sprite, self._all_objects):
-            raise exceptions.CreationPlaceError(
-                "Can't create unit - place is occupied")
-
     def _action_after_unit_creation(self, unit, rect: pygame.Rect):
         self.empire.army.recruit_unit(unit=unit)
         unit.rect = rect
@@ -122,7 +139,7 @@ class DwarfsBarrack(Barrack):
 
 
 def _assert_delay_is_over(delay: float, last_call_time: float):
-    difference = time.time() - last_call_time
+    difference = game.Game().clock.time() - last_call_time
     if difference < delay:
         raise exceptions.CreationTimeError(
             f"Can't create unit - not enough time's passed since previous call. \
@@ -3,7 +3,6 @@
 
 from abc import ABC, abstractmethod
 # project modules #
-import image as img
 from game_objects import game_objects_configs as configs
 from game_objects.buildings import barrack, mine, wall
 from game_objects import races
@@ -48,7 +47,7 @@ class ElvesFabric(Fabric):
         return barrack.ElvesBarrack(health=15,
                                     cost=configs.BARRACK_COST,
                                     empire=self.empire,
-                                    image=img.get_image(self.empire).BARRACK,
+                                    kind='BARRACK',
                                     size=configs.BARRACK_SIZE)
 
     def build_mine(self) -> mine.Mine:
@@ -56,14 +55,14 @@ class ElvesFabric(Fabric):
                          reload=60,
                          cost=configs.MINE_COST,
                          empire=self.empire,
-                         image=img.get_image(self.empire).MINE,
+                         kind='MINE',
                          size=configs.MINE_SIZE)
 
     def build_wall(self) -> wall.Wall:
         return wall.Wall(health=10,
                          cost=configs.WALL_COST,
                          empire=self.empire,
-                         image=img.get_image(self.empire).WALL,
+                         kind='WALL',
                          size=configs.WALL_SIZE)
 
 
@@ -74,7 +73,7 @@ class OrcsFabric(Fabric):
         return barrack.OrcsBarrack(health=15,
                                    cost=configs.BARRACK_COST,
                                    empire=self.empire,
-                                   image=img.get_image(self.empire).BARRACK,
+                                   kind='BARRACK',
                                    size=configs.BARRACK_SIZE)
 
     def build_mine(self) -> mine.Mine:
@@ -82,14 +81,14 @@ class OrcsFabric(Fabric):
                          reload=60,
                          cost=configs.MINE_COST,
                          empire=self.empire,
-                         image=img.get_image(self.empire).MINE,
+                         kind='MINE',
                          size=configs.MINE_SIZE)
 
     def build_wall(self) -> wall.Wall:
         return wall.Wall(health=10,
                          cost=configs.WALL_COST,
                          empire=self.empire,
-                         image=img.get_image(self.empire).WALL,
+                         kind='WALL',
                          size=configs.WALL_SIZE)
 
 
@@ -100,7 +99,7 @@ class DwarfsFabric(Fabric):
         return barrack.DwarfsBarrack(health=30,
                                      cost=configs.BARRACK_COST,
                                      empire=self.empire,
-                                     image=img.get_image(self.empire).BARRACK,
+                                     kind='BARRACK',
                                      size=configs.BARRACK_SIZE)
 
     def build_mine(self) -> mine.Mine:
@@ -108,14 +107,14 @@ class DwarfsFabric(Fabric):
                          reload=60,
                          cost=configs.MINE_COST,
                          empire=self.empire,
-                         image=img.get_image(self.empire).MINE,
+                         kind='MINE',
                          size=configs.MINE_SIZE)
 
     def build_wall(self) -> wall.Wall:
         return wall.Wall(health=20,
                          cost=configs.WALL_COST,
                          empire=self.empire,
-                         image=img.get_image(self.empire).WALL,
+                         kind='WALL',
                          size=configs.WALL_SIZE)
 
 
@@ -1,34 +1,34 @@
 """ This module contains different race mines which mine game resources. """
 
 
-import time
-from typing import Tuple
-import pygame
+from typing import Tuple, Text
 # project modules #
 import exceptions
+import game
 from game_objects.buildings import base_building
 
 
 class Mine(base_building.Building):
     """ Mines resources. """
 
-    def __init__(self, empire, health, cost: int, image: pygame.Surface, size: Tuple[int, int], reload: int):
+    def __init__(self, empire, health, cost: int, kind: Text, size: Tuple[int, int], reload: int):
         base_building.Building.__init__(
-            self, empire=empire, health=health, cost=cost, size=size, image=image)
+            self, empire=empire, health=health, cost=cost, size=size, kind=kind)
         if reload > 0:
             self.reload = reload
         else:
             raise exceptions.CreationError(
                 "Can't create mine with reload <= 0.")
-        self.last_call_time = time.time()
+        self.last_call_time = game.Game().clock.time()
 
     def mine(self):
         """ Increases empire resources. """
         self.empire.resources += 5
 
     def action_while_update(self):
-        if time.time() - self.last_call_time > self.reload:
-            self.last_call_time = time.time()
+        now = game.Game().clock.time()
+        if now - self.last_call_time > self.reload:
+            self.last_call_time = now
             self.mine()
 
 
@@ -4,7 +4,6 @@
 from typing import Tuple, List, Callable, Text
 import pygame
 # project modules #
-import exceptions
 import image as img
 from game_objects import game_objects_configs as configs
 from game_objects import base_object
@@ -18,7 +17,7 @@ class City(base_object.GameObject):
                  name: str,
                  health: int,
                  cost: int,
-                 image: pygame.Surface,
+                 kind: Text,
                  size: Tuple[int, int],
                  empire):
 
@@ -26,7 +25,7 @@ class City(base_object.GameObject):
                                         empire=empire,
                                         health=health,
                                         cost=cost,
-                                        image=image,
+                                        kind=kind,
                                         size=size)
 
         self.name = name
@@ -35,28 +34,25 @@ class City(base_object.GameObject):
         self._fabric = fabric.create_fabric(self.empire)
 
     def build_barrack(self, mouse_pos: Tuple[int, int]):
-        """ Builds barrack on `mouse_pos` position. """
+        """ Builds barrack on `mouse_pos` position (or the nearest free place). """
 
-        rect = _get_building_rect(configs.BARRACK_SIZE, mouse_pos)
-        self._assert_creation_place_is_free(rect)
+        rect = self._find_free_rect(_get_building_rect(configs.BARRACK_SIZE, mouse_pos))
         building = self._fabric.build_barrack()
         self._action_after_building_creation(building, rect)
         return building
 
     def build_mine(self, mouse_pos: Tuple[int, int]):
-        """ Builds mine on `mouse_pos` position. """
+        """ Builds mine on `mouse_pos` position (or the nearest free place). """
 
-        rect = _get_building_rect(configs.MINE_SIZE, mouse_pos)
-        self._assert_creation_place_is_free(rect)
+        rect = self._find_free_rect(_get_building_rect(configs.MINE_SIZE, mouse_pos))
         building = self._fabric.build_mine()
         self._action_after_building_creation(building, rect)
         return building
 
     def build_wall(self, mouse_pos: Tuple[int, int]):
-        """ Builds wall on `mouse_pos` position. """
+        """ Builds wall on `mouse_pos` position (or the nearest free place). """
 
-        rect = _get_building_rect(configs.WALL_SIZE, mouse_pos)
-        self._assert_creation_place_is_free(rect)
+        rect = self._find_free_rect(_get_building_rect(configs.WALL_SIZE, mouse_pos))
         building = self._fabric.build_wall()
         self._action_after_building_creation(building, rect)
         return building
@@ -75,15 +71,10 @@ class City(base_object.GameObject):
                 (img.get_image(self.empire).WALL, self.build_wall, 'build wall'),
                 (img.get_image(self.empire).MINE, self.build_mine, 'build mine')]
 
-    def _assert_creation_place_is_free(self, rect: pygame.Rect):
-        sprite = pygame.sprite.Sprite()
-        sprite.rect = rect
-        if pygame.sprite.spritecollideany(sprite, self._all_objects):
-            raise exceptions.CreationPlaceError(f"Can't create building here - place is occupied.")
-
     def _action_after_building_creation(self, building, rect: pygame.Rect):
         self.buildings.add(building)
         building.rect = rect
+        building.update_position()
 
 
 def _get_building_rect(size: Tuple[int, int], mouse_pos: Tuple[int, int]) -> pygame.Rect:
@@ -40,7 +40,7 @@ class Empire:
         city_ = city.City(empire=self,
                           name=name,
                           cost=cost,
-                          image=img.get_image(self).CITY,
+                          kind='CITY',
                           size=(200, 200),
                           health=30)
         self.cities.add(city_)
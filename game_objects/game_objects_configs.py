@@ -21,3 +21,24 @@ WARRIOR_SIZE = 90, 90
 BUILDER_COST = 5
 SCOUT_COST = 8
 WARRIOR_COST = 10
+
+# Side of spatial index cells game objects are placed into (see `spatial_index`).
+# A cell twice as big as the largest unit lets a unit intersect at most 4 cells,
+# while one cell contains just a few units (units do not overlap).
+SPATIAL_INDEX_CELL_SIZE = 2 * max(*BUILDER_SIZE, *SCOUT_SIZE, *WARRIOR_SIZE)
+
+# Side of cells objects centers are grouped into to find enemies nearby (see `proximity_index`).
+# It is about units fight distance, so a query checks just a few cells.
+PROXIMITY_INDEX_CELL_SIZE = 400
+
+# Side of navigation grid cells (see `navigation`).
+NAVIGATION_CELL_SIZE = 50
+# Units walk through navigation cells centers, so cells closer than half of unit size
+# to a building are blocked.
+NAVIGATION_CLEARANCE = max(*BUILDER_SIZE, *SCOUT_SIZE, *WARRIOR_SIZE) // 2
+# How many flow fields (one per goal cell) are kept to be reused.
+FLOW_FIELD_CACHE_SIZE = 64
+
+# If place chosen for a new object is occupied, the nearest free place is searched
+# not farther than this distance (see `SpatialGroup.find_free_rect`).
+PLACEMENT_SEARCH_DISTANCE = 600
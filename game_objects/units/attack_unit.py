@@ -1,11 +1,12 @@
 """ This module contains `AttackUnit` - a base class for units which are able to attack. """
 
 
-import time
 from abc import ABC
-from typing import Tuple, Text
+import math
+from typing import Tuple, Text, List
 import pygame
 # project modules #
+import game
 from game_objects.units.unit import Unit
 
 
@@ -20,12 +21,12 @@ class AttackUnit(Unit, ABC):
                  fight_distance: int,
                  cost: int,
                  size: Tuple[int, int],
-                 image: pygame.Surface):
+                 kind: Text):
 
         Unit.__init__(self,
                       empire=empire,
                       size=size,
-                      image=image,
+                      kind=kind,
                       health=health,
                       speed=speed,
                       cost=cost)
@@ -34,12 +35,13 @@ class AttackUnit(Unit, ABC):
         self.fight_distance = fight_distance
         self.attack_target = pygame.sprite.GroupSingle()
         self.attack_delay = 3  # time in seconds
-        self._last_attack_time = time.time()
+        self._last_attack_time = game.Game().clock.time()
 
     def attack(self, obj):
-        if time.time() - self._last_attack_time > self.attack_delay:
+        now = game.Game().clock.time()
+        if now - self._last_attack_time > self.attack_delay:
             obj.decrease_health(self.damage)
-            self._last_attack_time = time.time()
+            self._last_attack_time = now
 
     def handle_empty_click(self, mouse_pos: Tuple[int, int]):
         self.attack_target.empty()
@@ -59,15 +61,18 @@ class AttackUnit(Unit, ABC):
         return result
 
     def action_while_update(self):
-        self.set_move_to(self.destination)
+        self.set_move_to(self.destination, self._navigate)
+        if self.attack_target.sprite is None and self.is_idle():
+            self._acquire_target()
         for target in self.attack_target:
             if self.is_on_attack_distance_to(target):
                 self.attack(target)
                 return
-            self.set_move_to(target.rect.center)
+            # Paths are computed only to buildings since units change their positions every tick.
+            self.set_move_to(target.rect.center, navigate=not target.movable)
         self.move()
 
-    def action_while_stuck(self, intersected: pygame.sprite.Group):
+    def action_while_stuck(self, intersected: List[Unit]):
         """ Chooses a collided object as attack target. """
         for obj in intersected:
             if obj.empire is not self.empire:
@@ -77,6 +82,17 @@ class AttackUnit(Unit, ABC):
     def is_on_attack_distance_to(self, target):
         return _distance_between_points(self.rect.center, target.rect.center) < self.fight_distance
 
+    def is_idle(self) -> bool:
+        """ Returns true if unit has reached its destination. """
+        return (abs(self.rect.centerx - self.destination[0]) < self.max_speed and
+                abs(self.rect.centery - self.destination[1]) < self.max_speed)
+
+    def _acquire_target(self):
+        """ Chooses the nearest enemy within fight distance as attack target. """
+        target = game.Game().proximity.nearest_enemy(self.empire, self.rect.center, self.fight_distance)
+        if target is not None:
+            self.attack_target.add(target)
+
 
 def _distance_between_points(point1, point2) -> float:
-    return pygame.math.Vector2(point1).distance_to(pygame.math.Vector2(point2))
+    return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
@@ -3,7 +3,6 @@
 
 from abc import ABC
 # project modules #
-import image as img
 from game_objects import game_objects_configs as configs
 from game_objects.units.unit import Unit
 
@@ -21,7 +20,7 @@ class Builder(Unit, ABC):
                       health=health,
                       speed=speed,
                       size=configs.BUILDER_SIZE,
-                      image=img.get_image(empire).BUILDER,
+                      kind='BUILDER',
                       cost=configs.BUILDER_COST)
 
 
@@ -0,0 +1,305 @@
+""" This module contains `MovementSystem` which moves all units in one batched step per tick.
+Positions, destinations and max speeds of units are kept in contiguous NumPy arrays,
+so navigation waypoints, speed vectors and steps of all units are computed at once instead of per unit.
+Only units which may collide with other objects make their steps one by one.
+The system is optional and requires NumPy (see `game_configs.VECTORIZED_MOVEMENT`). """
+
+
+import weakref
+import itertools
+from typing import List, Tuple
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class MovementSystem:
+    """ Keeps movement data of registered units and moves units which requested it
+    (see `Unit.move`) in one batched step (see `step`). """
+
+    def __init__(self, capacity: int = 256):
+        if numpy is None:
+            raise MovementError('Vectorized movement requires NumPy.')
+        # Slot -> unit. Slots of removed units are reused.
+        self._units = [None] * capacity
+        self._free_slots = list(reversed(range(capacity)))
+        self._centers = numpy.zeros((capacity, 2))
+        # Not rounded positions (see `Unit.cur_real_pos`).
+        self._positions = numpy.zeros((capacity, 2))
+        self._sizes = numpy.zeros((capacity, 2), dtype=numpy.int64)
+        self._destinations = numpy.zeros((capacity, 2))
+        self._max_speeds = numpy.zeros(capacity)
+        # If true, unit walks around buildings (see `Unit.set_move_to`).
+        self._navigate = numpy.zeros(capacity, dtype=bool)
+        self._requested = numpy.zeros(capacity, dtype=bool)
+        # Flow field -> its next cells (see `navigation.FlowField.next_cells`) as array.
+        self._next_cells = weakref.WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return len(self._units) - len(self._free_slots)
+
+    def register(self, unit):
+        """ Adds `unit` to the system. """
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        self._units[slot] = unit
+        unit._movement_slot = slot
+        self._max_speeds[slot] = unit.max_speed
+        self._sizes[slot] = unit.rect.size
+        self.sync(unit)
+
+    def unregister(self, unit):
+        """ Removes `unit` from the system. Does nothing if it is not registered. """
+        slot = getattr(unit, '_movement_slot', None)
+        if slot is None or self._units[slot] is not unit:
+            return
+        self._units[slot] = None
+        self._sizes[slot] = 0
+        self._requested[slot] = False
+        self._free_slots.append(slot)
+        unit._movement_slot = None
+
+    def sync(self, unit):
+        """ Copies `unit` position and destination into the system.
+        Must be called after unit position is changed outside of the system. """
+        slot = unit._movement_slot
+        self._centers[slot] = unit.rect.center
+        self._positions[slot] = unit.cur_real_pos
+        self._destinations[slot] = unit.destination
+        self._navigate[slot] = unit._navigate and unit._navigation is not None
+
+    def set_destination(self, unit, dest: Tuple[int, int], navigate: bool = True):
+        """ Sets `unit` destination. If `navigate` is true, unit walks around buildings. """
+        slot = unit._movement_slot
+        self._destinations[slot] = dest
+        self._navigate[slot] = navigate and unit._navigation is not None
+
+    def request_move(self, unit):
+        """ Marks `unit` to make a step toward its destination during next `step`. """
+        self._requested[unit._movement_slot] = True
+
+    def step(self, objects, navigation=None):
+        """ Moves all units which requested it by one step toward their destinations
+        (toward next `navigation` waypoints if it is given, see `Unit._steering_point`).
+        Waypoints, speeds and new positions are computed for all units at once.
+        Units which can not collide with other `objects` (see `_alone`) are moved at once first,
+        then the other units apply their steps one by one in slots order with collisions
+        (see `Unit.apply_step`). """
+
+        slots = numpy.flatnonzero(self._requested)
+        if len(slots) == 0:
+            return
+        self._requested[slots] = False
+
+        # Unit moves only if it is not closer than one step to destination on both axes.
+        offsets = numpy.abs(self._destinations[slots] - self._centers[slots])
+        max_speeds = self._max_speeds[slots]
+        slots = slots[(offsets[:, 0] >= max_speeds) | (offsets[:, 1] >= max_speeds)]
+        if len(slots) == 0:
+            return
+        centers = self._centers[slots]
+        targets = self._destinations[slots]
+        navigating = self._navigate[slots]
+        if navigation is not None and navigating.any():
+            targets[navigating] = self._waypoints(navigation, centers[navigating], targets[navigating])
+
+        deltas = targets - centers
+        max_speeds = self._max_speeds[slots]
+        distances = numpy.hypot(deltas[:, 0], deltas[:, 1])
+        scales = numpy.divide(max_speeds, distances,
+                              out=numpy.zeros_like(distances), where=distances > 0)
+        speeds = deltas * scales[:, None]
+
+        positions = self._positions[slots] + speeds
+        new_centers = _round(positions)
+        alone = self._alone(objects, slots, centers.astype(numpy.int64), new_centers)
+        self._apply_steps(objects, slots[alone], centers[alone], positions[alone], new_centers[alone])
+
+        slots = slots[~alone]
+        new_centers, new_positions = [], []
+        for slot, (speed_x, speed_y) in zip(slots.tolist(), speeds[~alone].tolist()):
+            unit = self._units[slot]
+            previous_pos = unit.rect.center
+            intersected = unit.apply_step(speed_x, speed_y)
+            if unit.rect.center == previous_pos:
+                unit.action_while_stuck(list(dict.fromkeys(intersected)))
+            new_centers.append(unit.rect.center)
+            new_positions.append(unit.cur_real_pos)
+        if new_centers:
+            self._centers[slots] = new_centers
+            self._positions[slots] = new_positions
+
+    def _waypoints(self, navigation, centers: 'numpy.ndarray', destinations: 'numpy.ndarray') -> 'numpy.ndarray':
+        """ Returns next waypoints on the way from `centers` to `destinations`
+        (destinations themselves if there are no waypoints, see `navigation.FlowField.waypoint`).
+        Units heading to the same goal cell share a flow field. """
+
+        waypoints = destinations.copy()
+        cells = _cells_of(navigation, centers)
+        goal_cells = _cells_of(navigation, destinations)
+        for goal_cell in numpy.unique(goal_cells).tolist():
+            units = numpy.flatnonzero(goal_cells == goal_cell)
+            field = navigation.flow_field(navigation.cell_center(goal_cell))
+            next_cells = self._next_cells.get(field)
+            if next_cells is None:
+                next_cells = self._next_cells[field] = numpy.array(field.next_cells)
+            next_units_cells = next_cells[cells[units]]
+            found = next_units_cells != -1
+            rows, cols = numpy.divmod(next_units_cells[found], navigation.cols)
+            half = navigation.cell_size // 2
+            waypoints[units[found]] = numpy.column_stack((cols * navigation.cell_size + half,
+                                                          rows * navigation.cell_size + half))
+        return waypoints
+
+    def _alone(self, objects, slots: 'numpy.ndarray', centers: 'numpy.ndarray',
+               new_centers: 'numpy.ndarray') -> 'numpy.ndarray':
+        """ Returns mask of units (of `slots`) whose rects passed moving from `centers` to `new_centers`
+        collide with no other object of `objects` and with no rect passed by other moving unit.
+        Such units can not collide with anything during the step, unless other unit
+        is pushed out of an object it overlaps into them. """
+
+        sizes = self._sizes[slots]
+        old_topleft = centers - sizes // 2
+        new_topleft = new_centers - sizes // 2
+        passed = numpy.concatenate((numpy.minimum(old_topleft, new_topleft),
+                                    numpy.maximum(old_topleft, new_topleft) + sizes), axis=1)
+        # Other units are taken from the system (slots of removed units have zero sizes),
+        # other objects (i.e. buildings) - from the spatial index.
+        still = numpy.ones(len(self._units), dtype=bool)
+        still[slots] = False
+        still &= self._sizes[:, 0] > 0
+        topleft = self._centers[still].astype(numpy.int64) - self._sizes[still] // 2
+        units = numpy.concatenate((topleft, topleft + self._sizes[still]), axis=1)
+        buildings = [sprite.rect for sprite in objects if getattr(sprite, '_movement_slot', None) is None]
+        buildings = numpy.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in buildings],
+                                dtype=numpy.int64).reshape(-1, 4)
+        rects = numpy.concatenate((passed, units, buildings))
+
+        first, second = _overlapping_pairs(rects, objects.cell_size)
+        # Only moving units are checked, so pairs of other objects do not matter.
+        crowded = numpy.zeros(len(rects), dtype=bool)
+        crowded[first] = crowded[second] = True
+        return ~crowded[:len(slots)]
+
+    def _apply_steps(self, objects, slots: 'numpy.ndarray', centers: 'numpy.ndarray',
+                     positions: 'numpy.ndarray', new_centers: 'numpy.ndarray'):
+        """ Moves units of `slots` from `centers` to `positions` (rounded to `new_centers`)
+        like `Unit.apply_step` does without collisions. """
+
+        self._positions[slots] = positions
+        self._centers[slots] = new_centers
+        sizes = self._sizes[slots]
+        old_topleft = centers.astype(numpy.int64) - sizes // 2
+        new_topleft = new_centers - sizes // 2
+        moved_between_cells = (_cells_ranges(old_topleft, old_topleft + sizes, objects.cell_size) !=
+                               _cells_ranges(new_topleft, new_topleft + sizes, objects.cell_size)).any(axis=1)
+        stuck = (new_centers == centers).all(axis=1)
+        for slot, position, center, reindex, is_stuck in zip(slots.tolist(), positions.tolist(),
+                                                             new_centers.tolist(), moved_between_cells.tolist(),
+                                                             stuck.tolist()):
+            unit = self._units[slot]
+            unit.cur_real_pos = position
+            unit.rect.center = center
+            if reindex:
+                objects.reindex(unit)
+            if is_stuck:
+                unit.action_while_stuck([])
+
+    def layout(self) -> Tuple[int, List[Tuple[int, object]], List[int]]:
+        """ Returns capacity, (slot, unit) pairs and free slots (in order they are reused).
+        Units are stepped in slots order, so the layout is saved with the game. """
+        units = [(slot, unit) for slot, unit in enumerate(self._units) if unit is not None]
+        return len(self._units), units, list(self._free_slots)
+
+    def restore_layout(self, capacity: int, units: List[Tuple[int, object]], free_slots: List[int]):
+        """ Places registered `units` into their slots (see `layout`). Units which are not in `units`
+        are unregistered. Used to restore saved games. """
+
+        for unit in self._units:
+            if unit is not None:
+                unit._movement_slot = None
+        self.__init__(capacity)
+        self._free_slots = list(free_slots)
+        for slot, unit in units:
+            self._units[slot] = unit
+            unit._movement_slot = slot
+            self._max_speeds[slot] = unit.max_speed
+            self._sizes[slot] = unit.rect.size
+            self.sync(unit)
+
+    def _grow(self):
+        """ Doubles capacity of the system. """
+        capacity = len(self._units)
+        self._units += [None] * capacity
+        self._free_slots += reversed(range(capacity, 2 * capacity))
+        self._centers = numpy.concatenate((self._centers, numpy.zeros((capacity, 2))))
+        self._positions = numpy.concatenate((self._positions, numpy.zeros((capacity, 2))))
+        self._sizes = numpy.concatenate((self._sizes, numpy.zeros((capacity, 2), dtype=numpy.int64)))
+        self._destinations = numpy.concatenate((self._destinations, numpy.zeros((capacity, 2))))
+        self._max_speeds = numpy.concatenate((self._max_speeds, numpy.zeros(capacity)))
+        self._navigate = numpy.concatenate((self._navigate, numpy.zeros(capacity, dtype=bool)))
+        self._requested = numpy.concatenate((self._requested, numpy.zeros(capacity, dtype=bool)))
+
+
+def _round(values: 'numpy.ndarray') -> 'numpy.ndarray':
+    """ Rounds `values` half away from zero to integers like `pygame.Rect` does with float coordinates. """
+    integers = numpy.trunc(values)
+    rounded = integers + numpy.sign(values) * (numpy.abs(values - integers) >= 0.5)
+    return rounded.astype(numpy.int64)
+
+
+def _cells_of(navigation, positions: 'numpy.ndarray') -> 'numpy.ndarray':
+    """ Returns indexes of navigation cells `positions` are located in (see `NavigationGrid.cell_of`). """
+    cols = numpy.clip(positions[:, 0] // navigation.cell_size, 0, navigation.cols - 1).astype(numpy.int64)
+    rows = numpy.clip(positions[:, 1] // navigation.cell_size, 0, navigation.rows - 1).astype(numpy.int64)
+    return rows * navigation.cols + cols
+
+
+def _cells_ranges(topleft: 'numpy.ndarray', bottomright: 'numpy.ndarray', cell_size: int) -> 'numpy.ndarray':
+    """ Returns ranges of spatial index cells (left, top, right, bottom) rects intersect
+    (see `SpatialGroup._cells_range`). Rects must not be empty. """
+    return numpy.concatenate((topleft // cell_size, (bottomright - 1) // cell_size), axis=1)
+
+
+def _overlapping_pairs(rects: 'numpy.ndarray', cell_size: int) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+    """ Returns indexes of pairs of `rects` (left, top, right, bottom) which overlap like `pygame.Rect.colliderect`.
+    Only rects which share a grid cell of `cell_size` size are compared. A pair may be returned several times. """
+
+    cols, rows, owners = _expand(_cells_ranges(rects[:, :2], rects[:, 2:], cell_size))
+    order = numpy.argsort(_cells_keys(cols, rows), kind='stable')
+    keys, owners = _cells_keys(cols, rows)[order], owners[order]
+    firsts, seconds = [], []
+    # Rects of the same cell are neighbours after sorting, so every pair is distance apart.
+    for distance in itertools.count(1):
+        same_cell = numpy.flatnonzero(keys[distance:] == keys[:-distance])
+        if len(same_cell) == 0:
+            break
+        firsts.append(owners[same_cell])
+        seconds.append(owners[same_cell + distance])
+    first = numpy.concatenate(firsts) if firsts else numpy.zeros(0, dtype=numpy.int64)
+    second = numpy.concatenate(seconds) if seconds else numpy.zeros(0, dtype=numpy.int64)
+    a, b = rects[first], rects[second]
+    overlap = ((a[:, 0] < b[:, 2]) & (b[:, 0] < a[:, 2]) & (a[:, 1] < b[:, 3]) & (b[:, 1] < a[:, 3]) &
+               (a[:, 0] < a[:, 2]) & (a[:, 1] < a[:, 3]) & (b[:, 0] < b[:, 2]) & (b[:, 1] < b[:, 3]))
+    return first[overlap], second[overlap]
+
+
+def _expand(ranges: 'numpy.ndarray') -> Tuple['numpy.ndarray', 'numpy.ndarray', 'numpy.ndarray']:
+    """ Returns columns, rows and ranges indexes of all cells of `ranges` (left, top, right, bottom). """
+    widths = ranges[:, 2] - ranges[:, 0] + 1
+    numbers = widths * (ranges[:, 3] - ranges[:, 1] + 1)
+    owners = numpy.repeat(numpy.arange(len(ranges)), numbers)
+    within = numpy.arange(len(owners)) - numpy.repeat(numpy.cumsum(numbers) - numbers, numbers)
+    cols = ranges[owners, 0] + within % widths[owners]
+    rows = ranges[owners, 1] + within // widths[owners]
+    return cols, rows, owners
+
+
+def _cells_keys(cols: 'numpy.ndarray', rows: 'numpy.ndarray') -> 'numpy.ndarray':
+    return cols * 2 ** 32 + rows
+
+
+class MovementError(Exception):
+    pass
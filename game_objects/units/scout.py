@@ -3,7 +3,6 @@
 
 from abc import ABC
 # project modules #
-import image as img
 from game_objects import game_objects_configs as configs
 from game_objects.units.attack_unit import AttackUnit
 
@@ -24,7 +23,7 @@ class Scout(AttackUnit, ABC):
                             damage=damage,
                             fight_distance=400,
                             size=configs.SCOUT_SIZE,
-                            image=img.get_image(empire).SCOUT,
+                            kind='SCOUT',
                             cost=configs.SCOUT_COST)
 
 
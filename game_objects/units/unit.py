@@ -2,82 +2,116 @@
 
 
 from abc import ABC
-from typing import Tuple, Text
+from typing import Tuple, Text, List
 import pygame
 # project modules #
+import game
 from game_objects import base_object
 
 
 class Unit(base_object.GameObject, ABC):
     """ A base class for all units. """
 
+    movable = True
+
     def __init__(self,
                  empire,
                  health: int,
                  speed: int,
                  cost: int,
                  size: Tuple[int, int],
-                 image: pygame.Surface):
+                 kind: Text):
 
         base_object.GameObject.__init__(self,
                                         empire=empire,
                                         health=health,
                                         cost=cost,
                                         size=size,
-                                        image=image)
+                                        kind=kind)
 
         self.max_speed = speed
         self.speed = pygame.math.Vector2()
         # Convert tuple to list, so object position can be changed.
         self.cur_real_pos = list(self.rect.center)
         self.destination = self.rect.center
-
-    def set_move_to(self, dest: Tuple[int, int]):
-        """ Starts follow (move toward) the `dest` position. """
-        self.destination = dest
-        self._update_speed()
+        # If navigation is enabled, units walk around buildings (see `navigation`).
+        self._navigation = game.Game().navigation
+        self._navigate = True
+        # If vectorized movement is enabled, steps are computed by movement system
+        # (see `movement.MovementSystem`) and `speed` is not updated.
+        self._movement = game.Game().movement
+        if self._movement is not None:
+            self._movement.register(self)
+
+    def set_move_to(self, dest: Tuple[int, int], navigate: bool = True):
+        """ Starts follow (move toward) the `dest` position.
+        If `navigate` is false, unit goes straight to `dest` even if navigation is enabled
+        (e.g. a moving target changes its position every tick, so there is no sense to compute paths to it). """
+        if self._movement is not None:
+            # Movement system recomputes speed every step, so only a new destination matters.
+            if dest != self.destination or navigate != self._navigate:
+                self._movement.set_destination(self, dest, navigate)
+            self._navigate = navigate
+            self.destination = dest
+        else:
+            self._navigate = navigate
+            self.destination = dest
+            self._update_speed()
 
     def update_position(self):
         """ Tunes coordinates. The method is called after coordinates initialization. """
+        base_object.GameObject.update_position(self)
         self.destination = self.rect.center
         self.cur_real_pos = list(self.rect.center)
+        if self._movement is not None:
+            self._movement.sync(self)
 
     def move(self):
-        """ Makes a step toward destination. """
+        """ Makes a step toward destination.
+        If vectorized movement is enabled, the step (with steering) is postponed till movement system step. """
+
+        if self._movement is not None:
+            self._movement.request_move(self)
+            return
 
         previous_pos = self.rect.center
-        all_intersected = pygame.sprite.Group()
+        all_intersected = []
         if abs(self.rect.centerx - self.destination[0]) >= self.max_speed or abs(
                 self.rect.centery - self.destination[1]) >= self.max_speed:
-
-            self.cur_real_pos[0] += self.speed.x
-            self.rect.centerx = self.cur_real_pos[0]
-            intersected = pygame.sprite.spritecollide(
-                self, self._all_objects, dokill=False)
-            intersected.remove(self)
-            all_intersected.add(intersected)
-            for obj in intersected:
-                if self.speed.x < 0:
-                    self.rect.left = obj.rect.right
-                else:
-                    self.rect.right = obj.rect.left
-                self.cur_real_pos[0] = self.rect.centerx
-
-            self.cur_real_pos[1] += self.speed.y
-            self.rect.centery = self.cur_real_pos[1]
-            intersected = pygame.sprite.spritecollide(
-                self, self._all_objects, False)
-            intersected.remove(self)
-            all_intersected.add(intersected)
-            for obj in intersected:
-                if self.speed.y < 0:
-                    self.rect.top = obj.rect.bottom
-                else:
-                    self.rect.bottom = obj.rect.top
-                self.cur_real_pos[1] = self.rect.centery
+            all_intersected = self.apply_step(self.speed.x, self.speed.y)
         # If unit got stuck.
         if self.rect.center == previous_pos:
-            self.action_while_stuck(all_intersected)
+            # Remove duplicates (objects intersected on both axes) keeping order.
+            self.action_while_stuck(list(dict.fromkeys(all_intersected)))
+
+    def apply_step(self, speed_x: float, speed_y: float) -> List[base_object.GameObject]:
+        """ Moves unit by (`speed_x`, `speed_y`) axis by axis pushing it out of collided objects.
+        Returns collided objects. """
+
+        all_intersected = []
+        self.cur_real_pos[0] += speed_x
+        self.rect.centerx = self.cur_real_pos[0]
+        intersected = self._get_intersected_objects()
+        all_intersected += intersected
+        for obj in intersected:
+            if speed_x < 0:
+                self.rect.left = obj.rect.right
+            else:
+                self.rect.right = obj.rect.left
+            self.cur_real_pos[0] = self.rect.centerx
+
+        self.cur_real_pos[1] += speed_y
+        self.rect.centery = self.cur_real_pos[1]
+        intersected = self._get_intersected_objects()
+        all_intersected += intersected
+        for obj in intersected:
+            if speed_y < 0:
+                self.rect.top = obj.rect.bottom
+            else:
+                self.rect.bottom = obj.rect.top
+            self.cur_real_pos[1] = self.rect.centery
+        self._all_objects.reindex(self)
+        return all_intersected
 
     def stop_move(self):
         """ If object has destination, it stops following last. """
@@ -96,15 +130,40 @@ class Unit(base_object.GameObject, ABC):
         return result
 
     def action_while_update(self):
-        if self.speed.length() != 0:
+        if self._movement is not None:
+            self.move()
+        elif self.speed.length() != 0:
             self._update_speed()
             self.move()
 
+    def kill(self):
+        if self._movement is not None:
+            self._movement.unregister(self)
+        self.empire.army.remove_unit(self)
+        base_object.GameObject.kill(self)
+
     # Empty methods.
-    def action_while_stuck(self, intersected: pygame.sprite.Group):
+    def action_while_stuck(self, intersected: List[base_object.GameObject]):
         """ Is called when object gets stuck (i.e. if it should move but can't). """
 
+    def _get_intersected_objects(self) -> List[base_object.GameObject]:
+        """ Returns objects the unit collides with.
+        Only objects from nearby spatial index cells are checked. """
+        return [obj for obj in self._all_objects.sprites_in_rect(self.rect) if obj is not self]
+
+    def _steering_point(self) -> Tuple[int, int]:
+        """ Returns point unit should head to now: the next navigation waypoint on the way
+        to destination or destination itself. """
+        if self._navigation is None or not self._navigate:
+            return self.destination
+        # Do not compute paths for units which have already come.
+        if (abs(self.rect.centerx - self.destination[0]) < self.max_speed and
+                abs(self.rect.centery - self.destination[1]) < self.max_speed):
+            return self.destination
+        waypoint = self._navigation.flow_field(self.destination).waypoint(self.rect.center)
+        return waypoint if waypoint is not None else self.destination
+
     def _update_speed(self):
-        self.speed = pygame.math.Vector2(self.destination) - pygame.math.Vector2(self.rect.center)
+        self.speed = pygame.math.Vector2(self._steering_point()) - pygame.math.Vector2(self.rect.center)
         if self.speed.length() > 0:
             self.speed.scale_to_length(self.max_speed)
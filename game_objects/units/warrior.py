@@ -3,7 +3,6 @@
 
 from abc import ABC
 # project modules #
-import image as img
 from game_objects import game_objects_configs as configs
 from game_objects.units.attack_unit import AttackUnit
 
@@ -24,7 +23,7 @@ class Warrior(AttackUnit, ABC):
                             damage=damage,
                             fight_distance=180,
                             size=configs.WARRIOR_SIZE,
-                            image=img.get_image(empire).WARRIOR,
+                            kind='WARRIOR',
                             cost=configs.WARRIOR_COST)
 
 
@@ -0,0 +1,100 @@
+""" This module runs the game without rendering.
+Simulation is advanced at a fixed tick rate as fast as CPU allows.
+To start one, put `python3 headless.py` in terminal (see `--help` for options). """
+
+
+import os
+import time
+import argparse
+from typing import Dict
+# Headless mode does not need a real display, however images are loaded with
+# `convert_alpha` which requires a video mode to be set.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+# project modules #
+import game_configs as configs
+import engine
+from profiler import Profiler
+
+
+def init_pygame():
+    """ Initializes pygame with a minimal (invisible) display surface. """
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    if not pygame.font.get_init():
+        raise SystemExit("Fonts are out-of-service")
+
+
+def run(max_ticks: int = None, report_every: int = 0) -> Dict:
+    """ Advances the game (which must be initialized before) until it is finished
+    or `max_ticks` ticks have passed.
+    If `report_every` is positive, prints ticks/second every `report_every` ticks.
+    Returns run statistics. """
+
+    ticks = 0
+    finished = False
+    start_time = time.perf_counter()
+    last_report_time, last_report_tick = start_time, 0
+
+    profiler = Profiler()
+    while max_ticks is None or ticks < max_ticks:
+        # Every tick is a profiler frame.
+        profiler.begin_frame()
+        if not engine.tick():
+            finished = True
+            break
+        profiler.end_frame()
+        ticks += 1
+
+        if report_every > 0 and ticks % report_every == 0:
+            now = time.perf_counter()
+            print(f'tick {ticks}: '
+                  f'{(ticks - last_report_tick) / (now - last_report_time):.1f} ticks/s')
+            last_report_time, last_report_tick = now, ticks
+
+    elapsed = time.perf_counter() - start_time
+    return {'ticks': ticks,
+            'seconds': elapsed,
+            'ticks_per_second': ticks / elapsed if elapsed > 0 else 0.0,
+            'game_seconds': ticks / configs.TICK_RATE,
+            'finished': finished}
+
+
+def play_headless(max_ticks: int = None, report_every: int = 0,
+                  trace: str = None, trace_frames: int = configs.PROFILER_TRACE_FRAMES) -> Dict:
+    """ Initializes pygame and the game and runs it without rendering.
+    If `trace` is given, profiles ticks and writes last `trace_frames` of them to `trace` file
+    in Chrome trace format. """
+    init_pygame()
+    player_empire, enemy_empire = engine.init_game()
+    if trace is not None:
+        Profiler().enable()
+    result = run(max_ticks, report_every)
+    if trace is not None:
+        Profiler().disable()
+        Profiler().export_trace(trace, trace_frames)
+    result['player_alive'] = player_empire.alive()
+    result['enemy_alive'] = enemy_empire.alive()
+    return result
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Run the game without rendering.')
+    parser.add_argument('--ticks', type=int, default=None,
+                        help='stop after this number of ticks (default: play until the end)')
+    parser.add_argument('--report-every', type=int, default=configs.TICK_RATE * 10,
+                        help='print ticks/second every N ticks (0 disables reports)')
+    parser.add_argument('--trace', default=None,
+                        help='write Chrome trace of last ticks phases to this file')
+    parser.add_argument('--trace-frames', type=int, default=configs.PROFILER_TRACE_FRAMES,
+                        help='number of last ticks written to the trace')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    ARGS = _parse_args()
+    RESULT = play_headless(ARGS.ticks, ARGS.report_every, ARGS.trace, ARGS.trace_frames)
+    print(f"Finished: {RESULT['finished']}, ticks: {RESULT['ticks']}, "
+          f"game time: {RESULT['game_seconds']:.1f}s, "
+          f"real time: {RESULT['seconds']:.2f}s, "
+          f"{RESULT['ticks_per_second']:.1f} ticks/s")
@@ -5,29 +5,127 @@ warrior = OrcWarrior(...)
 
 img = image.get_image(warrior.empire).WARRIOR
 
-Now `img` is `pygame.Surface` which represents orc warrior image. """
+Now `img` is `pygame.Surface` which represents orc warrior image.
 
+Game objects use images scaled to their sizes. These are shared (see `get_sprite`):
 
+img = image.get_sprite(races.ORCS, 'WARRIOR', (50, 50))
+"""
+
+
+from typing import Dict, Text, Tuple
+import weakref
 import pygame
 # project modules #
 import singleton
 from game_objects import races
 
 
-# TODO: why it takes `empire` instead of race?
+# Sprite variants (see `SpriteAtlas`).
+DEFAULT = 'default'
+
+
 def get_image(empire=None):
     """ Returns appropriate race image class. """
 
     # If no empire is specified, returns race-independent images.
     if empire is None:
         return ImageProxy()
-    if empire.race == races.ELVES:
+    if not hasattr(empire, 'race'):
+        raise ImageError(f'{empire} object is not empire instance.')
+    return get_race_images(empire.race)
+
+
+def get_race_images(race):
+    """ Returns `race` image class. """
+    if race == races.ELVES:
         return ElvesImages()
-    if empire.race == races.ORCS:
+    if race == races.ORCS:
         return OrcsImages()
-    if empire.race == races.DWARFS:
+    if race == races.DWARFS:
         return DwarfsImages()
-    raise ImageError(f'{empire} object is not empire instance.')
+    raise ImageError(f'{race} is not a race.')
+
+
+def get_sprite(race, kind: Text, size: Tuple[int, int], variant: Text = DEFAULT) -> pygame.Surface:
+    """ Returns shared `race` `kind` image (e.g. 'WARRIOR') of `size` size. See `SpriteAtlas`. """
+    return SpriteAtlas().get(race, kind, size, variant)
+
+
+# Flyweight.
+class SpriteAtlas(metaclass=singleton.Singleton):
+    """ Keeps images scaled to object sizes, so identical objects share them
+    instead of scaling and keeping their own copies. Also keeps image variants
+    which windows switch to often: bordered images (selection) and
+    filled ones (damage flash).
+    Returned images are shared, so they must not be changed. Windows copy them
+    before drawing on them (see `Window._own_image`). """
+
+    def __init__(self):
+        self._sprites: Dict[Tuple, pygame.Surface] = {}
+        self._filled: Dict[Tuple, pygame.Surface] = {}
+        # Image -> {(borders color, borders size): bordered image}.
+        self._bordered = weakref.WeakKeyDictionary()
+        # Bordered image -> (borders color, borders size) it has been drawn with.
+        self._borders_of = weakref.WeakKeyDictionary()
+        # All images returned by atlas.
+        self._shared = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def is_shared(self, image: pygame.Surface) -> bool:
+        """ Returns true if `image` is returned by atlas (so it must not be changed). """
+        return image in self._shared
+
+    def filled(self, size: Tuple[int, int], color: pygame.Color) -> pygame.Surface:
+        """ Returns image of `size` size filled with `color`. """
+
+        key = (tuple(size), tuple(pygame.Color(color)))
+        image = self._filled.get(key)
+        if image is None:
+            image = pygame.Surface(size)
+            image.fill(color)
+            self._filled[key] = image
+            self._shared.add(image)
+        return image
+
+    def bordered(self, image: pygame.Surface, color: pygame.Color, borders_size: int) -> pygame.Surface:
+        """ Returns copy of `image` with `borders_size` borders of `color` color.
+        If `image` already has such borders, returns `image` itself. """
+
+        key = (tuple(pygame.Color(color)), borders_size)
+        if self._borders_of.get(image) == key:
+            return image
+        variants = self._bordered.setdefault(image, {})
+        bordered = variants.get(key)
+        if bordered is None:
+            bordered = image.copy()
+            pygame.draw.rect(bordered, color, bordered.get_rect(), borders_size)
+            variants[key] = bordered
+            self._borders_of[bordered] = key
+            self._shared.add(bordered)
+        return bordered
+
+    def get(self, race, kind: Text, size: Tuple[int, int], variant: Text = DEFAULT) -> pygame.Surface:
+        """ Returns `variant` of `race` `kind` image of `size` size. """
+
+        key = (race, kind, tuple(size), variant)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._create(race, kind, tuple(size), variant)
+            self._sprites[key] = sprite
+            self._shared.add(sprite)
+        return sprite
+
+    def _create(self, race, kind: Text, size: Tuple[int, int], variant: Text) -> pygame.Surface:
+        images = get_race_images(race) if race is not None else ImageProxy()
+        image = getattr(images, kind, None)
+        if not isinstance(image, pygame.Surface):
+            raise ImageError(f'There is no {kind} image of {race} race.')
+        if variant == DEFAULT:
+            return pygame.transform.scale(image, size)
+        raise ImageError(f'Unknown sprite variant {variant}.')
 
 
 # TODO: Make Proxy classes enumerations.
@@ -6,6 +6,7 @@ from typing import Tuple, Callable, Text
 import pygame
 # project modules #
 import exceptions
+import orders
 from interface import message
 from interface import click_handler
 from interface import interface_configs as configs
@@ -16,9 +17,14 @@ class Button(window.Window, ABC):
     """ A window which represents one of the commands selected object has.
     Located in the middle bottom of the screen. """
 
-    def __init__(self, image: pygame.Surface, action: Callable, text: Text):
+    def __init__(self, image: pygame.Surface, action: Callable, text: Text, owner=None, index: int = None):
+        """ `owner` is the object command belongs to and `index` is command position among
+        `owner` commands (see `orders.commands_of`). If `owner` is given, command is executed
+        through an order (see `orders`), otherwise `action` is called directly. """
         window.Window.__init__(self, image, size=configs.COMMAND_SIZE)
         self._action: Callable = action
+        self._owner = owner
+        self._index = index
         # Shows if command is ready to react impact (i.e. if command is selected).
         self._activated = False
         self._hint_message = text
@@ -46,7 +52,10 @@ class Button(window.Window, ABC):
         if not self._activated:
             return
         try:
-            self._action(*args)
+            if self._owner is not None:
+                orders.command(self._owner, self._index, *args)
+            else:
+                self._action(*args)
         # If command cannot be executed, shows error message.
         except exceptions.CreationError as error:
             msg = message.Message(str(error), lifetime=2)
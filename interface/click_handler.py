@@ -18,11 +18,14 @@ def handle_click(mouse_pos: Tuple[int, int]):
     # tell interface to handle click
     if Interface().handle_interface_click(mouse_pos):
         handled = True
-    #     if interface couldn't handle click, tell objects to handle one
+    #     if interface couldn't handle click, tell the topmost object under cursor to handle one
     else:
-        for obj in Game().objects:
-            if obj.handle_click(get_global_mouse_pos(mouse_pos)):
+        global_mouse_pos = get_global_mouse_pos(mouse_pos)
+        # Objects are returned in drawing order, so the last one is on top.
+        for obj in reversed(Game().objects.sprites_at_point(global_mouse_pos)):
+            if obj.handle_click(global_mouse_pos):
                 handled = True
+                break
     if not handled:
         Interface().handle_empty_click(mouse_pos)
 
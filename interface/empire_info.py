@@ -1,10 +1,12 @@
 """ This module contains `EmpireInfo` - a window that shows empire info. """
 
 
+from typing import List
 import pygame
 # project modules #
 from windows import window
 from interface import interface_configs as configs
+from interface.fonts import Fonts
 
 
 class EmpireInfo:
@@ -22,12 +24,23 @@ class EmpireInfo:
         else:
             self.empire_icon.rect.topleft = 0, 0
             self.resources.rect.topleft = 0, 120
+        # Resources value which is currently shown.
+        self._shown_resources = None
 
     def update(self):
-        font = pygame.font.SysFont(name='Ani', size=30)
+        """ Redraws resources text if resources value has changed. """
+        if self.empire.resources == self._shown_resources:
+            return
         self.resources.clear()
         self.resources.image.blit(
-            font.render(f'Resources: {self.empire.resources}', True, pygame.Color('black')), (0, 0))
+            Fonts().render(f'Resources: {self.empire.resources}', pygame.Color('black'),
+                           configs.EMPIRE_INFO_FONT_STYLE, configs.EMPIRE_INFO_FONT_SIZE), (0, 0))
+        self._shown_resources = self.empire.resources
+
+    @property
+    def windows(self) -> List[window.Window]:
+        """ Returns empire info windows in drawing order. """
+        return [self.empire_icon, self.resources]
 
     def draw(self, screen: pygame.Surface):
         """ Draws empire info-window onto the screen. """
@@ -0,0 +1,64 @@
+""" This module contains `Fonts` - shared registry of fonts and cache of rendered text.
+Usage example:
+
+surface = fonts.Fonts().render('Resources: 100', pygame.Color('black'))
+
+`surface` is shared between all callers which render the same text,
+so it must be only blitted and never drawn onto. """
+
+
+from collections import OrderedDict
+from typing import Dict, Text, Tuple
+import pygame
+# project modules #
+import singleton
+from interface import interface_configs as configs
+
+
+class Fonts(metaclass=singleton.Singleton):
+    """ Creates every (name, size) font only once
+    (`pygame.font.SysFont` looks fonts up in the system and is slow)
+    and keeps last `capacity` rendered text surfaces in LRU cache. """
+
+    def __init__(self, capacity: int = configs.TEXT_CACHE_SIZE):
+        if capacity <= 0:
+            raise FontsError(f'Text cache capacity must be positive, got {capacity}.')
+        self.capacity = capacity
+        self._fonts: Dict[Tuple[Text, int], pygame.font.Font] = {}
+        self._rendered: 'OrderedDict[Tuple, pygame.Surface]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._rendered)
+
+    def font(self, name: Text = configs.FONT_STYLE, size: int = configs.FONT_SIZE) -> pygame.font.Font:
+        """ Returns `name` system font of `size` size. """
+        key = (name, size)
+        if key not in self._fonts:
+            self._fonts[key] = pygame.font.SysFont(name=name, size=size)
+        return self._fonts[key]
+
+    def render(self, text: Text, color: pygame.Color,
+               name: Text = configs.FONT_STYLE, size: int = configs.FONT_SIZE) -> pygame.Surface:
+        """ Returns antialiased `text` rendered with `color` by `name` font of `size` size.
+        Renders it only if the same text has not been rendered recently. """
+
+        key = (name, size, text, tuple(pygame.Color(color)))
+        surface = self._rendered.get(key)
+        if surface is not None:
+            self._rendered.move_to_end(key)
+            return surface
+
+        surface = self.font(name, size).render(text, True, color)
+        self._rendered[key] = surface
+        if len(self._rendered) > self.capacity:
+            # Drop the least recently used text.
+            self._rendered.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """ Drops all rendered text. """
+        self._rendered.clear()
+
+
+class FontsError(Exception):
+    pass
@@ -1,13 +1,16 @@
 """ This module contains `Interface` - a facade which manages interface windows work. """
 
 
-from typing import Tuple
+from typing import Tuple, List
 import pygame
 # project modules #
+from windows import window
 from interface import camera, minimap, button
 from interface import empire_info, selected_object_info, selected_object, selected_command
+from interface import profiler_overlay
 from interface import interface_configs as configs
 import singleton
+import orders
 
 
 def get_global_mouse_pos(mouse_pos: Tuple[int, int]) -> Tuple[int, int]:
@@ -22,7 +25,7 @@ class Interface(metaclass=singleton.Singleton):
         self.player_empire = player_empire
         self.camera = camera.Camera()
         self.selected_info = selected_object_info.SelectedInfo()
-        self.minimap = minimap.Minimap()
+        self.minimap = minimap.Minimap(player_empire)
         self.commands = pygame.sprite.Group()
         self.messages = pygame.sprite.Group()
         self.player_empire_info = empire_info.EmpireInfo(
@@ -32,6 +35,7 @@ class Interface(metaclass=singleton.Singleton):
         # The most recent chosen (selected) game object and command respectively.
         self.selected_object = selected_object.SelectedObject()
         self.selected_command = selected_command.SelectedCommand()
+        self.profiler_overlay = profiler_overlay.ProfilerOverlay()
 
     def move_view(self, key, mouse_pos: Tuple[int, int]):
         """ Moves camera and minimap frame. """
@@ -65,7 +69,7 @@ class Interface(metaclass=singleton.Singleton):
 
         obj = self.selected_object.get()
         if obj is not None and obj.empire is self.player_empire:
-            obj.handle_empty_click(get_global_mouse_pos(mouse_pos))
+            orders.empty_click(obj, get_global_mouse_pos(mouse_pos))
         command = self.selected_command.get()
         if command is not None:
             command.handle_empty_click(get_global_mouse_pos(mouse_pos))
@@ -76,7 +80,7 @@ class Interface(metaclass=singleton.Singleton):
 
         selected_obj = self.selected_object.get()
         if selected_obj is not None and selected_obj.empire is self.player_empire:
-            selected_obj.interact_with(obj)
+            orders.interact(selected_obj, obj)
         command = self.selected_command.get()
         if command is not None:
             command.handle_object_click(obj)
@@ -89,20 +93,53 @@ class Interface(metaclass=singleton.Singleton):
         if obj.empire is self.player_empire:
             self._place_commands(obj)
 
-    def draw_interface(self, screen: pygame.Surface):
-        """ Draws interface windows onto `screen`. """
+    def restore_selection(self, obj, command_index: int = None):
+        """ Selects `obj` and its `command_index` command (see `selected_command_index`)
+        without interaction with previously selected object (used to restore saved games).
+        The command is not selected if `obj` has no such command. """
+
+        self.remove_all_info()
+        if obj is None:
+            return
+        self.selected_info.replace(obj)
+        self.selected_object.replace(obj)
+        if obj.empire is self.player_empire:
+            self._place_commands(obj)
+            commands = list(self.commands)
+            if command_index is not None and 0 <= command_index < len(commands):
+                self.selected_command.replace(commands[command_index])
+
+    def selected_command_index(self) -> int or None:
+        """ Returns position of selected command among shown commands or `None` if there is no one. """
+        command = self.selected_command.get()
+        if command is None:
+            return None
+        return list(self.commands).index(command)
+
+    def update_interface(self):
+        """ Updates interface windows. """
 
         self.selected_info.update()
-        screen.blit(self.selected_info.image, self.selected_info.rect)
         self.minimap.update()
-        screen.blit(self.minimap.image, self.minimap.rect)
         self.messages.update()
-        self.messages.draw(screen)
-        self.commands.draw(screen)
         self.player_empire_info.update()
-        self.player_empire_info.draw(screen)
         self.enemy_empire_info.update()
-        self.enemy_empire_info.draw(screen)
+        self.profiler_overlay.update()
+
+    def windows(self) -> List[window.Window]:
+        """ Returns interface windows in drawing order. """
+        windows = [self.selected_info, self.minimap, *self.messages, *self.commands,
+                   *self.player_empire_info.windows, *self.enemy_empire_info.windows]
+        if not self.profiler_overlay.is_hidden():
+            windows.append(self.profiler_overlay)
+        return windows
+
+    def draw_interface(self, screen: pygame.Surface):
+        """ Updates interface windows and draws them onto `screen`. """
+
+        self.update_interface()
+        for win in self.windows():
+            screen.blit(win.image, win.rect)
 
     def _place_commands(self, obj):
         """ Fills `self.commands` with commands of `obj`. """
@@ -110,20 +147,11 @@ class Interface(metaclass=singleton.Singleton):
         pos = [self.selected_info.rect.right + configs.SELECTED_TO_COMMAND_INDENT,
                configs.SCR_HEIGHT - configs.COMMAND_HEIGHT - 10]
 
-        for command in obj.mouse_interaction_commands:
-            command_window = button.MouseInteractionButton(*command)
-            command_window.rect.topleft = pos
-            self.commands.add(command_window)
-            pos[0] += configs.COMMANDS_INDENT
-
-        for command in obj.no_interaction_commands:
-            command_window = button.NoInteractionButton(*command)
-            command_window.rect.topleft = pos
-            self.commands.add(command_window)
-            pos[0] += configs.COMMANDS_INDENT
-
-        for command in obj.object_interaction_commands:
-            command_window = button.ObjectInteractionButton(*command)
+        button_classes = ([button.MouseInteractionButton] * len(obj.mouse_interaction_commands) +
+                          [button.NoInteractionButton] * len(obj.no_interaction_commands) +
+                          [button.ObjectInteractionButton] * len(obj.object_interaction_commands))
+        for index, (button_class, command) in enumerate(zip(button_classes, orders.commands_of(obj))):
+            command_window = button_class(*command, owner=obj, index=index)
             command_window.rect.topleft = pos
             self.commands.add(command_window)
             pos[0] += configs.COMMANDS_INDENT
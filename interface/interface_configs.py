@@ -14,6 +14,11 @@ CAMERA_SPEED = 30
 MINIMAP_WIDTH = 400
 MINIMAP_HEIGHT = MINIMAP_WIDTH * game_configs.MAP_HEIGHT // game_configs.MAP_WIDTH
 MINIMAP_SIZE = MINIMAP_WIDTH, MINIMAP_HEIGHT
+# How many times per second units on the minimap are redrawn.
+MINIMAP_REFRESH_RATE = 10
+MINIMAP_UNIT_POINT_SIZE = 4
+MINIMAP_PLAYER_UNITS_COLOR = 0, 0, 255
+MINIMAP_ENEMY_UNITS_COLOR = 255, 0, 0
 
 COMMAND_SIZE = COMMAND_WIDTH, COMMAND_HEIGHT = 80, 80
 # Indent between commands.
@@ -31,3 +36,19 @@ FONT_STYLE = 'AnjaliOldLipi'
 FONT_SIZE = 20
 # Vertical indent between lines.
 VERTICAL_LINES_INDENT = 20
+# Font and size of empire resources text.
+EMPIRE_INFO_FONT_STYLE = 'Ani'
+EMPIRE_INFO_FONT_SIZE = 30
+# Font and size of messages shown when game is finished.
+FINAL_MESSAGE_FONT_STYLE = 'Ani'
+FINAL_MESSAGE_FONT_SIZE = 100
+# How many rendered text surfaces are kept to be reused (see `fonts.Fonts`).
+TEXT_CACHE_SIZE = 256
+# Frame profiler overlay size, position and how many times per second it is redrawn.
+PROFILER_OVERLAY_SIZE = 420, 440
+PROFILER_OVERLAY_POS = 0, 180
+PROFILER_OVERLAY_REFRESH_RATE = 4
+PROFILER_OVERLAY_FONT_SIZE = 20
+PROFILER_OVERLAY_TEXT_COLOR = 255, 255, 255
+PROFILER_OVERLAY_BACKGROUND_COLOR = 0, 0, 0, 180
+PROFILER_OVERLAY_BARS_COLOR = 255, 200, 0
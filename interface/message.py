@@ -1,12 +1,13 @@
 """ This module contains `Message` - game info-window. """
 
 
-import time
 from typing import Text
 import pygame
 # project modules #
+import game
 from windows.window import Window
 from interface import interface_configs as configs
+from interface.fonts import Fonts
 
 
 class Message(Window):
@@ -24,18 +25,17 @@ class Message(Window):
         self._borders_size = 1
         self.set_constant_bordered()
 
-        font = pygame.font.SysFont(name=configs.FONT_STYLE, size=configs.FONT_SIZE)
         line_pos = [gap, gap]
         for line in text.split('\n'):
-            line_surface = font.render(line, True, pygame.Color('red'))
+            line_surface = Fonts().render(line, pygame.Color('red'))
             self.image.blit(line_surface, line_pos)
             line_pos[1] += configs.VERTICAL_LINES_INDENT
 
-        self._creation_time = time.time()
+        self._creation_time = game.Game().clock.time()
         self.lifetime = lifetime
 
     def update(self, *args):
-        if time.time() - self._creation_time > self.lifetime:
+        if game.Game().clock.time() - self._creation_time > self.lifetime:
             self.kill()
 
 
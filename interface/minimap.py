@@ -1,8 +1,12 @@
 """ This module contains `Minimap` - window which is a brief version of the map. """
 
 
-from typing import Tuple
+from typing import Tuple, List
 import pygame
+try:
+    import numpy
+except ImportError:
+    numpy = None
 # project modules #
 from interface import interface_configs as configs
 from windows.window import Window
@@ -12,17 +16,34 @@ import game
 
 class Minimap(Window):
     """ A window which is a brief version of the map.
-    Located in the right bottom of the screen. """
+    Located in the right bottom of the screen.
+    Minimap image consists of a static layer (terrain and buildings), which is rebuilt
+    only when buildings change, and units layer drawn as points above it.
+    Both are refreshed `MINIMAP_REFRESH_RATE` times per second independently of frame rate
+    unless `auto_refresh` is false: then they are refreshed only by `refresh` calls. """
 
-    def __init__(self):
+    def __init__(self, player_empire=None):
+        """ Units of `player_empire` (`Game().player_emp` by default) are drawn in player color. """
         Window.__init__(self, Map().image, configs.MINIMAP_SIZE)
+        self._player_empire = player_empire
 
         self.borders_size = 3
         self.rect.bottomright = configs.SCR_SIZE
         self.set_constant_bordered()
+        self._map_size = Map().rect.size
         # `frame` on the minimap is a camera position on the map.
         self._frame = pygame.Rect(
             (0, 0), self._convert_to_minimap_coordinates(configs.SCR_SIZE))
+        self._drawn_frame_pos = None
+
+        # Terrain and buildings. 32-bit surfaces let to draw units via pixel arrays.
+        self._static_layer = pygame.Surface(self.rect.size, 0, 32)
+        self._buildings_signature = None
+        # Static layer and units.
+        self._layer = None
+        self._refresh_period = 1000 // configs.MINIMAP_REFRESH_RATE
+        self._last_refresh_time = 0
+        self.auto_refresh = True
 
     def move_frame(self, pos: Tuple[int, int]):
         """ Moves frame at `pos` position.
@@ -30,22 +51,83 @@ class Minimap(Window):
         self._frame.topleft = self._convert_to_minimap_coordinates(pos)
 
     def action_while_update(self):
-        """ Blits all game objects' minimap icons onto minimap. """
-        self.reset_image(self._default_image.copy())
-        for obj in game.Game().objects:
-            self.image.blit(
-                obj.minimap_image, self._convert_to_minimap_coordinates(obj.rect.topleft))
-        # Draw frame.
-        pygame.draw.rect(self.image, self.borders_color, self._frame, 1)
+        """ Refreshes minimap layers if it is time to and redraws image if layers or frame have changed. """
+
+        now = pygame.time.get_ticks()
+        if self._layer is None or self.auto_refresh and now - self._last_refresh_time >= self._refresh_period:
+            self.refresh()
+
+        if self._frame.topleft != self._drawn_frame_pos:
+            image = self._layer.copy()
+            # Draw frame.
+            pygame.draw.rect(image, self.borders_color, self._frame, 1)
+            self.reset_image(image)
+            self._drawn_frame_pos = self._frame.topleft
+
+    def refresh(self):
+        """ Refreshes layers. The image is redrawn at the next update. """
+        self._refresh_layers()
+        self._last_refresh_time = pygame.time.get_ticks()
+        # Forces redrawing.
+        self._drawn_frame_pos = None
+
+    def _refresh_layers(self):
+        """ Rebuilds static layer if buildings have changed and draws units above it. """
+
+        buildings, units = [], []
+        for obj in game.Game().registry:
+            if obj.movable:
+                units.append(obj)
+            else:
+                buildings.append(obj)
+
+        signature = [(obj.entity_id, obj.rect.topleft) for obj in buildings]
+        if signature != self._buildings_signature:
+            self._static_layer.blit(self._default_image, (0, 0))
+            for obj in buildings:
+                self._static_layer.blit(
+                    obj.minimap_image, self._convert_to_minimap_coordinates(obj.rect.topleft))
+            self._buildings_signature = signature
+
+        self._layer = self._static_layer.copy()
+        player_empire = self._player_empire if self._player_empire is not None else game.Game().player_emp
+        self._draw_units([unit for unit in units if unit.empire is player_empire],
+                         configs.MINIMAP_PLAYER_UNITS_COLOR)
+        self._draw_units([unit for unit in units if unit.empire is not player_empire],
+                         configs.MINIMAP_ENEMY_UNITS_COLOR)
+
+    def _draw_units(self, units: List, color: Tuple[int, int, int]):
+        """ Draws `units` as `color` squares onto units layer. """
+
+        if not units:
+            return
+        size = configs.MINIMAP_UNIT_POINT_SIZE
+        if numpy is None:
+            for unit in units:
+                self._layer.fill(color, (self._convert_to_minimap_coordinates(unit.rect.topleft),
+                                         (size, size)))
+            return
+
+        positions = numpy.array([unit.rect.topleft for unit in units])
+        xs = positions[:, 0] * self.rect.width // self._map_size[0]
+        ys = positions[:, 1] * self.rect.height // self._map_size[1]
+        # Every unit is a `size` x `size` square, so broadcast offsets over all points.
+        offsets = numpy.arange(size)
+        xs = (xs[:, None, None] + offsets[None, :, None]).clip(0, self.rect.width - 1)
+        ys = (ys[:, None, None] + offsets[None, None, :]).clip(0, self.rect.height - 1)
+        pixels = pygame.surfarray.pixels2d(self._layer)
+        pixels[xs, ys] = self._layer.map_rgb(color)
+        # Unlock the surface.
+        del pixels
 
     def _convert_to_minimap_coordinates(self, pos: Tuple[int, int]) -> Tuple[int, int]:
         """ Converts global map position (`pos`) to minimap position. """
-        x = pos[0] * self.rect.width // Map().rect.width
-        y = pos[1] * self.rect.height // Map().rect.height
+        x = pos[0] * self.rect.width // self._map_size[0]
+        y = pos[1] * self.rect.height // self._map_size[1]
         return (x, y)
 
     def _convert_to_minimap_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
         """ Converts real object size to its minimap size. """
-        width = size[0] * self.rect.width // Map().rect.width
-        height = size[1] * self.rect.height // Map().rect.height
+        width = size[0] * self.rect.width // self._map_size[0]
+        height = size[1] * self.rect.height // self._map_size[1]
         return (width, height)
@@ -0,0 +1,93 @@
+""" This module contains `ProfilerOverlay` - window which shows frame profiler statistics. """
+
+
+from typing import Text
+import pygame
+# project modules #
+import game_configs
+from profiler import Profiler
+from windows.window import Window
+from interface import interface_configs as configs
+from interface.fonts import Fonts
+
+
+class ProfilerOverlay(Window):
+    """ A window which shows mean, median and 99th percentile durations of every frame phase
+    and histogram of frame durations over profiler window.
+    It is hidden by default. Showing the overlay enables profiler, hiding disables it.
+    The overlay is redrawn `PROFILER_OVERLAY_REFRESH_RATE` times per second. """
+
+    # Columns x positions.
+    _NAME_X, _MEAN_X, _P50_X, _P99_X = 10, 220, 290, 360
+    _HISTOGRAM_HEIGHT = 100
+    _GAP = 10
+
+    def __init__(self):
+        Window.__init__(self, pygame.Surface(configs.PROFILER_OVERLAY_SIZE, pygame.SRCALPHA))
+        self.rect.topleft = configs.PROFILER_OVERLAY_POS
+        self._refresh_period = 1000 // configs.PROFILER_OVERLAY_REFRESH_RATE
+        self._last_refresh_time = None
+        self.hide()
+
+    def toggle(self):
+        """ Shows the overlay if it is hidden and hides it otherwise. """
+        if self.is_hidden():
+            self.passive()
+            Profiler().enable()
+            self._last_refresh_time = None
+        else:
+            self.hide()
+            Profiler().disable()
+
+    def action_while_update(self):
+        if self.is_hidden():
+            return
+        now = pygame.time.get_ticks()
+        if self._last_refresh_time is not None and now - self._last_refresh_time < self._refresh_period:
+            return
+        self._redraw()
+        self._last_refresh_time = now
+
+    def _redraw(self):
+        """ Draws statistics table and frame durations histogram. """
+
+        self._own_image()
+        self.image.fill(configs.PROFILER_OVERLAY_BACKGROUND_COLOR)
+        font = Fonts().font(configs.FONT_STYLE, configs.PROFILER_OVERLAY_FONT_SIZE)
+        line_height = font.get_linesize()
+
+        y = self._GAP
+        self._draw_row(font, y, f'{len(Profiler())} frames, ms', 'mean', 'p50', 'p99')
+        for name in [None] + Profiler().phase_names():
+            y += line_height
+            if y + line_height > self.rect.height - self._HISTOGRAM_HEIGHT - self._GAP:
+                break
+            statistics = Profiler().statistics(name)
+            self._draw_row(font, y, name or 'frame', f"{statistics['mean']:.2f}",
+                           f"{statistics['p50']:.2f}", f"{statistics['p99']:.2f}")
+        self._draw_histogram(font)
+        self.dirty = True
+
+    def _draw_row(self, font: pygame.font.Font, y: int, name: Text, mean: Text, p50: Text, p99: Text):
+        for text, x in ((name, self._NAME_X), (mean, self._MEAN_X), (p50, self._P50_X), (p99, self._P99_X)):
+            # Text changes every redraw, so it is not put into the text cache.
+            self.image.blit(font.render(text, True, configs.PROFILER_OVERLAY_TEXT_COLOR), (x, y))
+
+    def _draw_histogram(self, font: pygame.font.Font):
+        """ Draws frame durations histogram at the bottom of the overlay. """
+
+        counts = Profiler().histogram()
+        bins = len(counts)
+        bottom = self.rect.height - self._GAP
+        top = bottom - self._HISTOGRAM_HEIGHT
+        label = f'frame time, 0-{bins * game_configs.PROFILER_HISTOGRAM_BIN_WIDTH} ms'
+        self.image.blit(font.render(label, True, configs.PROFILER_OVERLAY_TEXT_COLOR),
+                        (self._NAME_X, top - font.get_linesize()))
+
+        highest = max(counts) if any(counts) else 1
+        bar_width = (self.rect.width - 2 * self._GAP) // bins
+        for i, count in enumerate(counts):
+            height = count * self._HISTOGRAM_HEIGHT // highest
+            if height > 0:
+                pygame.draw.rect(self.image, configs.PROFILER_OVERLAY_BARS_COLOR,
+                                 (self._GAP + i * bar_width, bottom - height, bar_width - 1, height))
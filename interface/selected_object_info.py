@@ -1,26 +1,32 @@
 """ This module contains `SelectedInfo` which shows selected object information. """
 
 
-from typing import Text
+from typing import Text, Tuple
+import weakref
 import pygame
 # project modules #
 from windows import window
 from interface import interface_configs as configs
+from interface.fonts import Fonts
 
 
 class SelectedInfo(window.Window):
     """ A window which is responsible for showing selected object information.
-    Located in the left bottom corner of the screen. """
+    Located in the left bottom corner of the screen.
+    Information is redrawn only when selected object or its displayed fields change. """
 
     def __init__(self):
         window.Window.__init__(self, pygame.Surface(
             configs.SELECTED_SIZE, pygame.SRCALPHA))
 
         self.selected_object = pygame.sprite.GroupSingle()
-        self._font = pygame.font.SysFont(
-            name=configs.FONT_STYLE, size=configs.FONT_SIZE)
+        # Fingerprint of information which is currently shown (see `_fingerprint`).
+        self._shown_fingerprint = None
+        # Object image -> its scaled copy. Images of died objects are dropped automatically.
+        self._portraits = weakref.WeakKeyDictionary()
 
         self.background_color = (200, 200, 100)
+        self._background = pygame.Surface(self.rect.size)
         self.rect.bottomleft = (0, configs.SCR_HEIGHT)
         self.borders_size = 3
         self.set_constant_bordered()
@@ -33,30 +39,49 @@ class SelectedInfo(window.Window):
 
     def action_after_hide(self):
         self.clear()
+        self._shown_fingerprint = None
 
     def action_after_active(self):
-        self._place_object_info()
+        self._refresh_object_info()
+
+    def _refresh_object_info(self):
+        """ Redraws object info if it differs from shown one. """
+        obj = self.selected_object.sprite
+        if obj is None:
+            return
+        fingerprint = _fingerprint(obj)
+        if fingerprint != self._shown_fingerprint:
+            self._place_object_info()
+            self._shown_fingerprint = fingerprint
 
     def _place_object_info(self):
-        background = pygame.Surface(self.rect.size)
-        background.fill(self.background_color)
-        self.reset_image(background)
+        self._background.fill(self.background_color)
+        self.reset_image(self._background)
         self._place_image(self.selected_object.sprite._default_image)
         self._place_text(self.selected_object.sprite.info())
 
     def _place_image(self, image: pygame.Surface):
-        selected_img_side_size = min(self.rect.width // 2, self.rect.height // 2)
-        self.image.blit(
-            pygame.transform.scale(
-                image, (selected_img_side_size, selected_img_side_size)),
-            (self.rect.width // 2 - 5, self.rect.height // 2 - 5))
+        portrait = self._portraits.get(image)
+        if portrait is None:
+            selected_img_side_size = min(self.rect.width // 2, self.rect.height // 2)
+            portrait = pygame.transform.scale(
+                image, (selected_img_side_size, selected_img_side_size))
+            self._portraits[image] = portrait
+        self.image.blit(portrait, (self.rect.width // 2 - 5, self.rect.height // 2 - 5))
 
     def _place_text(self, text: Text):
         line_pos = [5, 5]
         for line in text.split('\n'):
-            self.image.blit(self._font.render(line, True, pygame.Color('black')), line_pos)
+            self.image.blit(Fonts().render(line, pygame.Color('black')), line_pos)
             line_pos[1] += configs.VERTICAL_LINES_INDENT
 
     def action_while_update(self):
         if self.is_active():
-            self._place_object_info()
+            self._refresh_object_info()
+
+
+def _fingerprint(obj) -> Tuple:
+    """ Returns values which are shown in `obj` info (health, speed, damage, name etc.).
+    They are taken directly, so the info text is built only when it is redrawn. """
+    return (obj, obj._default_image, obj.empire.race, obj.empire.name, obj.health,
+            getattr(obj, 'name', None), getattr(obj, 'max_speed', None), getattr(obj, 'damage', None))
@@ -0,0 +1,519 @@
+""" This module contains lockstep multiplayer: two players play on their computers connected over TCP.
+
+Only orders (see `orders`) are sent: every player sends a batch of its orders for every tick
+and a tick is played only when batches of both players for it have come, so the game goes
+identically on both computers. Orders issued during tick T are executed at tick T + `input_delay`.
+Batches of `send_interval` ticks are sent together, so a player sends a TCP segment every
+`send_interval` ticks instead of every tick. Network latency is hidden unless it is longer than
+`input_delay - send_interval + 1` ticks.
+Every `checksum_interval` ticks players exchange checksums of the game state to detect desynchronization.
+
+Host plays for `Game().player_emp`, guest plays for `Game().enemy_emp`. To play, put
+`python3 play_game.py --host 5000` in terminal of one computer and
+`python3 play_game.py --join host-address:5000` in terminal of another one.
+Headless peers (e.g. for soak tests) are started by `python3 lockstep.py` (see `--help`). """
+
+
+import sys
+import json
+import time
+import zlib
+import random
+import select
+import socket
+import struct
+import argparse
+from array import array
+from typing import Dict, List, NamedTuple, Text, Tuple
+# project modules #
+import game_configs as configs
+import user_configs
+import engine
+import exceptions
+import orders
+from game import Game
+from interface.interface_class import Interface
+from interface import click_handler
+from interface import message
+
+
+PROTOCOL_VERSION = 2
+
+# Message kind, payload length.
+_MESSAGE = struct.Struct('<BH')
+HELLO, START, BATCH, CHECKSUM, BYE = range(5)
+# Protocol version (the race text follows).
+_HELLO = struct.Struct('<H')
+# Protocol version, seed, tick rate, input delay, checksum interval, settings flags (races texts follow).
+_START = struct.Struct('<HIHHHB')
+# The first tick, number of ticks (batches of consecutive ticks follow).
+_BATCHES = struct.Struct('<IB')
+# Number of orders of a tick (orders follow).
+_ORDERS_NUMBER = struct.Struct('<B')
+_MAX_ORDERS = 255
+_MAX_TICKS = 255
+_MAX_PAYLOAD = 2 ** 16 - 1
+# Kind, object id, command index, position flag, position, target id.
+_ORDER = struct.Struct('<BIB?iiI')
+# Tick, state checksum.
+_CHECKSUM = struct.Struct('<II')
+_TEXT_LENGTH = struct.Struct('<H')
+# IPv4 and TCP headers (with timestamps option) of a segment. Used to estimate traffic.
+TCP_IP_HEADERS_SIZE = 52
+
+# Settings flags.
+_VECTORIZED_MOVEMENT = 1
+_FLOW_FIELD_NAVIGATION = 2
+
+HOST, GUEST = 0, 1
+
+
+class Settings(NamedTuple):
+    """ Game settings host sends to guest. """
+    seed: int
+    tick_rate: int
+    input_delay: int
+    checksum_interval: int
+    vectorized_movement: bool
+    flow_field_navigation: bool
+    host_race: Text
+    guest_race: Text
+
+
+class Connection:
+    """ Sends and receives framed messages over TCP socket without blocking. """
+
+    def __init__(self, sock: socket.socket):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        self._socket = sock
+        self._incoming = bytearray()
+        # Messages which are sent as soon as the socket takes them and ones which wait for `send` call.
+        self._outgoing = bytearray()
+        self._queued = bytearray()
+        self.bytes_sent = 0
+        # Number of successful socket writes. Nagle's algorithm is off, so every one is a TCP segment at least.
+        self.packets_sent = 0
+        self.bytes_received = 0
+        # True if the other side has closed connection.
+        self.closed = False
+
+    def queue(self, kind: int, payload: bytes = b''):
+        """ Queues message till the next `send` call, so messages share TCP segments. """
+        self._queued += _MESSAGE.pack(kind, len(payload)) + payload
+
+    def send(self, kind: int = None, payload: bytes = b''):
+        """ Sends queued messages and `kind` message (if it is given). """
+        if kind is not None:
+            self.queue(kind, payload)
+        self._outgoing += self._queued
+        self._queued.clear()
+        self.flush()
+
+    def flush(self):
+        """ Sends as much of sent messages data as the socket takes now. """
+        if not self._outgoing:
+            return
+        try:
+            sent = self._socket.send(self._outgoing)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as error:
+            raise LockstepError(f'Connection is lost: {error}') from error
+        self.bytes_sent += sent
+        self.packets_sent += 1
+        del self._outgoing[:sent]
+
+    def receive(self) -> List[Tuple[int, bytes]]:
+        """ Returns messages which have come completely. """
+        while not self.closed:
+            try:
+                data = self._socket.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as error:
+                raise LockstepError(f'Connection is lost: {error}') from error
+            if not data:
+                self.closed = True
+                break
+            self.bytes_received += len(data)
+            self._incoming += data
+
+        messages = []
+        while len(self._incoming) >= _MESSAGE.size:
+            kind, length = _MESSAGE.unpack_from(self._incoming)
+            end = _MESSAGE.size + length
+            if len(self._incoming) < end:
+                break
+            messages.append((kind, bytes(self._incoming[_MESSAGE.size:end])))
+            del self._incoming[:end]
+        return messages
+
+    def wait(self, timeout: float):
+        """ Waits until data comes (or can be sent) or `timeout` seconds pass. """
+        select.select([self._socket], [self._socket] if self._outgoing else [], [], timeout)
+
+    def close(self, timeout: float = 1.0):
+        """ Sends all messages and closes connection. Waits up to `timeout` seconds for the other side
+        to close it too, since unread incoming data makes the socket drop data it has not sent yet. """
+        self._outgoing += self._queued
+        self._queued.clear()
+        try:
+            self._socket.settimeout(timeout)
+            if self._outgoing:
+                self._socket.sendall(self._outgoing)
+                self.bytes_sent += len(self._outgoing)
+                self.packets_sent += 1
+            self._socket.shutdown(socket.SHUT_WR)
+            while self._socket.recv(65536):
+                pass
+        except OSError:
+            pass
+        finally:
+            self._socket.close()
+
+
+class Lockstep:
+    """ Plays the game in lockstep with the other player (see the module docstring).
+    Orders issued while the session is started are sent to both players (see `orders.set_sink`). """
+
+    def __init__(self, connection: Connection, settings: Settings, local: int,
+                 send_interval: int = configs.LOCKSTEP_SEND_INTERVAL):
+        self.connection = connection
+        self.settings = settings
+        # Batches must be sent before the other player needs them, otherwise both players wait forever.
+        self.send_interval = max(1, min(send_interval, settings.input_delay))
+        # Index of the local player: `HOST` or `GUEST`.
+        self.local = local
+        self.remote = GUEST if local == HOST else HOST
+        # Orders of players by tick they must be executed at.
+        self._batches: Tuple[Dict[int, List[orders.Order]], Dict[int, List[orders.Order]]] = ({}, {})
+        # Orders issued since the last batch has been made.
+        self._pending: List[orders.Order] = []
+        # Local batches which have not been sent yet: `(tick, orders)` of consecutive ticks.
+        self._unsent: List[Tuple[int, List[orders.Order]]] = []
+        self._checksums: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        self._remote_left = False
+        self.finished = False
+
+    def start(self):
+        """ Starts to send local orders. Must be called after the game is initialized (see `host` and `join`). """
+        orders.set_sink(self.submit)
+        for tick in range(Game().clock.ticks, Game().clock.ticks + self.settings.input_delay):
+            self._add_batch(tick, [])
+        self._send_batches()
+
+    def submit(self, order: orders.Order):
+        """ Sends `order` to both players with the next batch. """
+        self._pending.append(order)
+
+    def close(self):
+        """ Tells the other player the game is left and closes connection. """
+        orders.set_sink(None)
+        try:
+            self._send_batches()
+            self.connection.send(BYE)
+        except LockstepError:
+            pass
+        self.connection.close()
+
+    def update(self) -> bool:
+        """ Receives messages and plays the current tick if orders of both players for it have come.
+        Returns true if the tick has been played. Never waits for the other player.
+        Raises `LockstepError` if the game states of players differ or connection is lost. """
+
+        self.connection.flush()
+        for kind, payload in self.connection.receive():
+            self._handle(kind, payload)
+        if self.finished:
+            return False
+        tick = Game().clock.ticks
+        if tick not in self._batches[self.remote]:
+            if self._remote_left:
+                raise LockstepError('The other player has left the game.')
+            if self.connection.closed:
+                raise LockstepError('Connection is closed by the other player.')
+            return False
+
+        self._play_orders(tick)
+        if not engine.tick(ai=False):
+            self.finished = True
+            return True
+        if Game().clock.ticks % self.settings.checksum_interval == 0:
+            checksum = state_checksum()
+            self._checksums[self.local][Game().clock.ticks] = checksum
+            # Checksum is sent with the next batches.
+            self.connection.queue(CHECKSUM, _CHECKSUM.pack(Game().clock.ticks, checksum))
+        # Orders which do not fit the batch are left for the next one.
+        batch, self._pending = self._pending[:_MAX_ORDERS], self._pending[_MAX_ORDERS:]
+        self._add_batch(tick + self.settings.input_delay, batch)
+        if len(self._unsent) >= self.send_interval:
+            self._send_batches()
+        self._compare_checksums()
+        return True
+
+    def wait(self, timeout: float):
+        """ Waits until messages come or `timeout` seconds pass. """
+        self.connection.wait(timeout)
+
+    def _add_batch(self, tick: int, batch: List[orders.Order]):
+        self._batches[self.local][tick] = batch
+        self._unsent.append((tick, batch))
+
+    def _send_batches(self):
+        """ Sends unsent batches (and queued messages) in as few messages as their sizes allow. """
+        first_tick, number, body = 0, 0, bytearray()
+        for tick, batch in self._unsent:
+            data = _ORDERS_NUMBER.pack(len(batch)) + b''.join(_pack_order(order) for order in batch)
+            if number == _MAX_TICKS or _BATCHES.size + len(body) + len(data) > _MAX_PAYLOAD:
+                self.connection.queue(BATCH, _BATCHES.pack(first_tick, number) + body)
+                number, body = 0, bytearray()
+            if number == 0:
+                first_tick = tick
+            number += 1
+            body += data
+        if number:
+            self.connection.queue(BATCH, _BATCHES.pack(first_tick, number) + body)
+        self._unsent = []
+        self.connection.send()
+
+    def _handle(self, kind: int, payload: bytes):
+        if kind == BATCH:
+            first_tick, number = _BATCHES.unpack_from(payload)
+            offset = _BATCHES.size
+            for tick in range(first_tick, first_tick + number):
+                orders_number, = _ORDERS_NUMBER.unpack_from(payload, offset)
+                offset += _ORDERS_NUMBER.size
+                self._batches[self.remote][tick] = [_unpack_order(payload, offset + i * _ORDER.size)
+                                                    for i in range(orders_number)]
+                offset += orders_number * _ORDER.size
+        elif kind == CHECKSUM:
+            tick, checksum = _CHECKSUM.unpack(payload)
+            self._checksums[self.remote][tick] = checksum
+            self._compare_checksums()
+        elif kind == BYE:
+            # Orders the other player has sent before leaving are still played.
+            self._remote_left = True
+        else:
+            raise LockstepError(f'Unexpected message {kind}.')
+
+    def _play_orders(self, tick: int):
+        """ Executes orders of both players for `tick` (host ones first). """
+        empires = (Game().player_emp, Game().enemy_emp)
+        for player in (HOST, GUEST):
+            for order in self._batches[player].pop(tick, []):
+                try:
+                    orders.execute(order, empires[player])
+                except exceptions.CreationError as error:
+                    if player == self.local:
+                        msg = message.Message(str(error), lifetime=2)
+                        msg.rect.bottomleft = Interface().selected_info.rect.topleft
+                        click_handler.ClickHandler().handle_command_bad_execution(msg)
+
+    def _compare_checksums(self):
+        local, remote = self._checksums[self.local], self._checksums[self.remote]
+        for tick in [tick for tick in remote if tick in local]:
+            if local.pop(tick) != remote.pop(tick):
+                raise DesyncError(f'Game states of players differ at tick {tick}.')
+
+
+def state_checksum() -> int:
+    """ Returns CRC32 of the game state: clock, resources and ids, positions and health of objects.
+    Interface state (camera, selection) differs between players, so it is not included. """
+    game_ = Game()
+    values = array('d', [game_.clock.ticks, game_.player_emp.resources, game_.enemy_emp.resources])
+    for obj in sorted(game_.registry, key=lambda obj_: obj_.entity_id):
+        values.extend((obj.entity_id, *obj.rect, obj.health))
+    return zlib.crc32(values.tobytes())
+
+
+def listen(port: int, address: Text = '') -> socket.socket:
+    """ Returns a socket which listens on `port` (any free port if it is 0) for a guest. """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind((address, port))
+    server.listen(1)
+    return server
+
+
+def host(server: socket.socket, race: Text = user_configs.EMPIRE_RACE, seed: int = None,
+         input_delay: int = configs.LOCKSTEP_INPUT_DELAY,
+         checksum_interval: int = configs.LOCKSTEP_CHECKSUM_INTERVAL,
+         timeout: float = configs.LOCKSTEP_CONNECT_TIMEOUT) -> Lockstep:
+    """ Waits for a guest on `server` socket (see `listen`), sends it game settings
+    and initializes the game. Returns the session (see `Lockstep.start`). """
+
+    server.settimeout(timeout)
+    try:
+        sock, _ = server.accept()
+    except socket.timeout as error:
+        raise LockstepError('Nobody has joined the game.') from error
+    finally:
+        server.close()
+    connection = Connection(sock)
+    payload = _receive(connection, HELLO, timeout)
+    version, = _HELLO.unpack_from(payload)
+    if version != PROTOCOL_VERSION:
+        connection.close()
+        raise LockstepError(f'Guest protocol version {version} differs from {PROTOCOL_VERSION}.')
+    guest_race, _ = _unpack_text(payload, _HELLO.size)
+
+    settings = Settings(random.randrange(2 ** 32) if seed is None else seed, configs.TICK_RATE,
+                        input_delay, checksum_interval, configs.VECTORIZED_MOVEMENT,
+                        configs.FLOW_FIELD_NAVIGATION, race, guest_race)
+    flags = ((_VECTORIZED_MOVEMENT if settings.vectorized_movement else 0) |
+             (_FLOW_FIELD_NAVIGATION if settings.flow_field_navigation else 0))
+    connection.send(START, _START.pack(PROTOCOL_VERSION, settings.seed, settings.tick_rate, input_delay,
+                                       checksum_interval, flags) +
+                    _pack_text(settings.host_race) + _pack_text(settings.guest_race))
+    init_game(settings, HOST)
+    return Lockstep(connection, settings, HOST)
+
+
+def join(address: Text, port: int, race: Text = user_configs.EMPIRE_RACE,
+         timeout: float = configs.LOCKSTEP_CONNECT_TIMEOUT) -> Lockstep:
+    """ Joins the game hosted at `address`:`port` and initializes it with host settings.
+    Returns the session (see `Lockstep.start`). """
+
+    try:
+        sock = socket.create_connection((address, port), timeout=timeout)
+    except OSError as error:
+        raise LockstepError(f'Can not join the game: {error}') from error
+    connection = Connection(sock)
+    connection.send(HELLO, _HELLO.pack(PROTOCOL_VERSION) + _pack_text(race))
+    payload = _receive(connection, START, timeout)
+    version, seed, tick_rate, input_delay, checksum_interval, flags = _START.unpack_from(payload)
+    if version != PROTOCOL_VERSION:
+        connection.close()
+        raise LockstepError(f'Host protocol version {version} differs from {PROTOCOL_VERSION}.')
+    if tick_rate != configs.TICK_RATE:
+        connection.close()
+        raise LockstepError(f'Host tick rate {tick_rate} differs from {configs.TICK_RATE}.')
+    host_race, offset = _unpack_text(payload, _START.size)
+    guest_race, _ = _unpack_text(payload, offset)
+    settings = Settings(seed, tick_rate, input_delay, checksum_interval, bool(flags & _VECTORIZED_MOVEMENT),
+                        bool(flags & _FLOW_FIELD_NAVIGATION), host_race, guest_race)
+    init_game(settings, GUEST)
+    return Lockstep(connection, settings, GUEST)
+
+
+def init_game(settings: Settings, local: int):
+    """ Initializes the game with `settings` for `local` player. Pygame must be initialized before. """
+    configs.VECTORIZED_MOVEMENT = settings.vectorized_movement
+    configs.FLOW_FIELD_NAVIGATION = settings.flow_field_navigation
+    random.seed(settings.seed)
+    engine.init_game(settings.host_race, 'Host', user_configs.CITY_NAME, settings.guest_race,
+                     enemy_name='Guest', enemy_ai=False, local_enemy=local == GUEST)
+
+
+def play_headless(session: Lockstep, max_ticks: int, scheduled_orders: Dict[int, List[orders.Order]] = None,
+                  timeout: float = configs.LOCKSTEP_CONNECT_TIMEOUT) -> Dict:
+    """ Plays `max_ticks` ticks of `session` without rendering as fast as both players can.
+    Orders of `scheduled_orders` are issued at their ticks. Returns run statistics. """
+
+    scheduled_orders = scheduled_orders or {}
+    session.start()
+    start_time = time.perf_counter()
+    last_progress = start_time
+    while Game().clock.ticks < max_ticks and not session.finished:
+        tick = Game().clock.ticks
+        for order in scheduled_orders.pop(tick, []):
+            orders.issue(order)
+        if session.update():
+            last_progress = time.perf_counter()
+        else:
+            if time.perf_counter() - last_progress > timeout:
+                raise LockstepError(f'The other player has not sent orders for {timeout}s.')
+            session.wait(0.1)
+    elapsed = time.perf_counter() - start_time
+    game_seconds = Game().clock.ticks / configs.TICK_RATE
+    return {'ticks': Game().clock.ticks,
+            'finished': session.finished,
+            'checksum': state_checksum(),
+            'seconds': elapsed,
+            'bytes_sent': session.connection.bytes_sent,
+            'bytes_received': session.connection.bytes_received,
+            'packets_sent': session.connection.packets_sent,
+            'bytes_sent_per_game_second': _per_second(session.connection.bytes_sent, game_seconds),
+            'packets_sent_per_game_second': _per_second(session.connection.packets_sent, game_seconds),
+            # Payload and estimated TCP/IP headers.
+            'wire_bytes_sent_per_game_second': _per_second(
+                session.connection.bytes_sent + session.connection.packets_sent * TCP_IP_HEADERS_SIZE,
+                game_seconds)}
+
+
+def _per_second(value: float, seconds: float) -> float:
+    return value / seconds if seconds else 0.0
+
+
+def _receive(connection: Connection, kind: int, timeout: float) -> bytes:
+    """ Waits for `kind` message and returns its payload. """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        for message_kind, payload in connection.receive():
+            if message_kind != kind:
+                raise LockstepError(f'Unexpected message {message_kind}.')
+            return payload
+        if connection.closed:
+            raise LockstepError('Connection is closed by the other player.')
+        connection.wait(deadline - time.perf_counter())
+    raise LockstepError('The other player does not answer.')
+
+
+def _pack_order(order: orders.Order) -> bytes:
+    x, y = order.pos if order.pos is not None else (0, 0)
+    return _ORDER.pack(order.kind, order.object_id, order.command, order.pos is not None, x, y, order.target_id)
+
+
+def _unpack_order(payload: bytes, offset: int) -> orders.Order:
+    kind, object_id, command, has_pos, x, y, target_id = _ORDER.unpack_from(payload, offset)
+    return orders.Order(kind, object_id, command, (x, y) if has_pos else None, target_id)
+
+
+def _pack_text(text: Text) -> bytes:
+    encoded = text.encode()
+    return _TEXT_LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_text(payload: bytes, offset: int) -> Tuple[Text, int]:
+    """ Returns text at `offset` and offset of the next value. """
+    length, = _TEXT_LENGTH.unpack_from(payload, offset)
+    start = offset + _TEXT_LENGTH.size
+    return payload[start:start + length].decode(), start + length
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Play multiplayer game without rendering and without orders '
+                                                 '(e.g. to check connection and synchronization).')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--host', type=int, metavar='PORT', help='host the game on this port')
+    group.add_argument('--join', metavar='ADDRESS:PORT', help='join the game hosted at this address')
+    parser.add_argument('--race', default=user_configs.EMPIRE_RACE, help='race of the local player')
+    parser.add_argument('--ticks', type=int, default=configs.TICK_RATE * 60, help='number of ticks to play')
+    return parser.parse_args()
+
+
+class LockstepError(Exception):
+    pass
+
+
+class DesyncError(LockstepError):
+    pass
+
+
+if __name__ == '__main__':
+    ARGS = _parse_args()
+    # The module is imported by `play_game`, so headless display is set only here.
+    import headless
+    headless.init_pygame()
+    try:
+        if ARGS.host is not None:
+            SESSION = host(listen(ARGS.host), ARGS.race)
+        else:
+            ADDRESS, PORT = ARGS.join.rsplit(':', 1)
+            SESSION = join(ADDRESS, int(PORT), ARGS.race)
+        RESULT = play_headless(SESSION, ARGS.ticks)
+        SESSION.close()
+    except LockstepError as error:
+        sys.exit(str(error))
+    print(json.dumps(RESULT))
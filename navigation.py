@@ -0,0 +1,177 @@
+""" This module contains `NavigationGrid` which lets units walk around buildings.
+The map is divided into square cells. Cells covered by buildings are blocked.
+For every goal cell a flow field is computed: each free cell points to its neighbour
+which is one step closer to the goal. Units heading to the same goal share the field,
+so a big army costs a single field computation. """
+
+
+from collections import OrderedDict
+import heapq
+from typing import List, Optional, Tuple
+# project modules #
+import game
+
+
+# Neighbour cells offsets and step costs (diagonal step is about sqrt(2) times longer).
+_NEIGHBOURS = ((1, 0, 10), (-1, 0, 10), (0, 1, 10), (0, -1, 10),
+               (1, 1, 14), (1, -1, 14), (-1, 1, 14), (-1, -1, 14))
+
+
+class NavigationGrid:
+    """ Grid of `cell_size` square cells over `map_size` map.
+    Cells whose centers are closer than `clearance` to a building are blocked,
+    so a unit walking through free cells centers does not touch buildings.
+    Last `capacity` flow fields are kept in LRU cache. The grid and the cache
+    are rebuilt lazily after buildings change (see `invalidate`). """
+
+    def __init__(self, map_size: Tuple[int, int], cell_size: int, clearance: int, capacity: int):
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.capacity = capacity
+        self.cols = -(-map_size[0] // cell_size)
+        self.rows = -(-map_size[1] // cell_size)
+        self._blocked: Optional[bytearray] = None
+        self._fields: 'OrderedDict[int, FlowField]' = OrderedDict()
+        # Number of computed fields. Used to check cache efficiency.
+        self.computed_fields = 0
+
+    def invalidate(self):
+        """ Must be called after a building is placed or removed. """
+        self._blocked = None
+        self._fields.clear()
+
+    def cell_of(self, pos: Tuple[float, float]) -> int:
+        """ Returns index of cell `pos` is located in (positions out of map are clamped). """
+        col = min(max(int(pos[0] // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(pos[1] // self.cell_size), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def cell_center(self, cell: int) -> Tuple[int, int]:
+        """ Returns position of `cell` center. """
+        row, col = divmod(cell, self.cols)
+        return (col * self.cell_size + self.cell_size // 2, row * self.cell_size + self.cell_size // 2)
+
+    def is_blocked(self, cell: int) -> bool:
+        """ Returns true if `cell` is covered by a building. """
+        return bool(self._get_blocked()[cell])
+
+    def flow_field(self, goal: Tuple[float, float]) -> 'FlowField':
+        """ Returns flow field toward `goal` cell. Computes it if it is not cached. """
+
+        goal_cell = self.cell_of(goal)
+        field = self._fields.get(goal_cell)
+        if field is not None:
+            self._fields.move_to_end(goal_cell)
+            return field
+
+        field = FlowField(self, goal_cell, self._compute_next_cells(goal_cell))
+        self.computed_fields += 1
+        self._fields[goal_cell] = field
+        if len(self._fields) > self.capacity:
+            # Drop the least recently used field.
+            self._fields.popitem(last=False)
+        return field
+
+    def _get_blocked(self) -> bytearray:
+        if self._blocked is None:
+            self._blocked = self._build_blocked()
+        return self._blocked
+
+    def _build_blocked(self) -> bytearray:
+        """ Marks cells covered by buildings (i.e. not movable objects) as blocked. """
+
+        blocked = bytearray(self.cols * self.rows)
+        half = self.cell_size // 2
+        for obj in game.Game().registry:
+            if obj.movable:
+                continue
+            area = obj.rect.inflate(2 * self.clearance, 2 * self.clearance)
+            # Cells which centers are inside the area.
+            left = max((area.left - half + self.cell_size - 1) // self.cell_size, 0)
+            right = min((area.right - 1 - half) // self.cell_size, self.cols - 1)
+            top = max((area.top - half + self.cell_size - 1) // self.cell_size, 0)
+            bottom = min((area.bottom - 1 - half) // self.cell_size, self.rows - 1)
+            for row in range(top, bottom + 1):
+                for col in range(left, right + 1):
+                    blocked[row * self.cols + col] = 1
+        return blocked
+
+    def _compute_next_cells(self, goal_cell: int) -> List[int]:
+        """ Runs Dijkstra search from `goal_cell` over free cells.
+        Returns list which maps every cell to the next cell on the way to the goal
+        (-1 for goal and unreachable cells). """
+
+        blocked = self._get_blocked()
+        cols, rows = self.cols, self.rows
+        costs = [None] * (cols * rows)
+        next_cells = [-1] * (cols * rows)
+
+        # If goal is a building, units should come to it from any side,
+        # so the whole blocked area around the goal is the goal.
+        goals = self._blocked_area(goal_cell) if blocked[goal_cell] else [goal_cell]
+        queue = []
+        for cell in goals:
+            costs[cell] = 0
+            queue.append((0, cell))
+
+        while queue:
+            cost, cell = heapq.heappop(queue)
+            if cost > costs[cell]:
+                continue
+            row, col = divmod(cell, cols)
+            for d_col, d_row, step_cost in _NEIGHBOURS:
+                n_col, n_row = col + d_col, row + d_row
+                if not (0 <= n_col < cols and 0 <= n_row < rows):
+                    continue
+                neighbour = n_row * cols + n_col
+                if blocked[neighbour]:
+                    continue
+                # Do not cut corners of buildings.
+                if d_col and d_row and (blocked[row * cols + n_col] or blocked[n_row * cols + col]):
+                    continue
+                new_cost = cost + step_cost
+                if costs[neighbour] is None or new_cost < costs[neighbour]:
+                    costs[neighbour] = new_cost
+                    next_cells[neighbour] = cell
+                    heapq.heappush(queue, (new_cost, neighbour))
+        return next_cells
+
+    def _blocked_area(self, cell: int) -> List[int]:
+        """ Returns blocked cells connected to blocked `cell`. """
+
+        blocked = self._get_blocked()
+        area = {cell}
+        stack = [cell]
+        while stack:
+            row, col = divmod(stack.pop(), self.cols)
+            for d_col, d_row, _ in _NEIGHBOURS[:4]:
+                n_col, n_row = col + d_col, row + d_row
+                if 0 <= n_col < self.cols and 0 <= n_row < self.rows:
+                    neighbour = n_row * self.cols + n_col
+                    if blocked[neighbour] and neighbour not in area:
+                        area.add(neighbour)
+                        stack.append(neighbour)
+        return list(area)
+
+
+class FlowField:
+    """ Directions toward `goal_cell` from every cell of `grid`. """
+
+    def __init__(self, grid: NavigationGrid, goal_cell: int, next_cells: List[int]):
+        self.grid = grid
+        self.goal_cell = goal_cell
+        self._next_cells = next_cells
+
+    @property
+    def next_cells(self) -> List[int]:
+        """ Next cell on the way to the goal for every cell (-1 for goal and unreachable cells). """
+        return self._next_cells
+
+    def waypoint(self, pos: Tuple[float, float]) -> Optional[Tuple[int, int]]:
+        """ Returns center of the next cell on the way from `pos` to the goal.
+        Returns `None` if `pos` is in the goal or the goal is unreachable from `pos`
+        (unit should go straight to its destination then). """
+        next_cell = self._next_cells[self.grid.cell_of(pos)]
+        if next_cell == -1:
+            return None
+        return self.grid.cell_center(next_cell)
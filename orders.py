@@ -0,0 +1,107 @@
+""" This module contains orders - player actions which change the game: moving units,
+interaction with other objects (e.g. attack) and execution of object commands
+(e.g. build a wall or create a warrior).
+
+Interface issues orders instead of calling objects directly. Orders are executed at once
+unless a sink is set (see `set_sink`): e.g. in multiplayer games orders are sent to both
+players and executed by both at the same tick (see `lockstep`).
+Orders refer to objects by ids, so they can be sent over network. """
+
+
+from typing import Callable, List, NamedTuple, Optional, Tuple
+# project modules #
+import game
+
+
+# Kinds of orders: empty click of selected object, interaction of selected object
+# with another one, execution of object command.
+EMPTY_CLICK, INTERACT, COMMAND = range(3)
+
+
+class Order(NamedTuple):
+    kind: int
+    # Id of the ordered object.
+    object_id: int
+    # Index of executed command among object commands (see `commands_of`).
+    command: int = 0
+    # Map position of empty click or of mouse interaction command.
+    pos: Optional[Tuple[int, int]] = None
+    # Id of the object to interact with (0 if there is no one).
+    target_id: int = 0
+
+
+_sink: Optional[Callable[[Order], None]] = None
+
+
+def set_sink(sink: Optional[Callable[[Order], None]]):
+    """ Makes `sink` receive issued orders instead of executing them. `None` restores execution. """
+    global _sink
+    _sink = sink
+
+
+def empty_click(obj, pos: Tuple[int, int]):
+    """ Orders `obj` to react to empty click at `pos` map position (e.g. a unit goes there). """
+    issue(Order(EMPTY_CLICK, obj.entity_id, pos=tuple(pos)))
+
+
+def interact(obj, target):
+    """ Orders `obj` to interact with `target` (e.g. a warrior attacks it). """
+    issue(Order(INTERACT, obj.entity_id, target_id=target.entity_id))
+
+
+def command(obj, index: int, *args):
+    """ Orders `obj` to execute its `index` command (see `commands_of`) with `args`:
+    nothing, map position or object. """
+    pos, target_id = None, 0
+    if args and isinstance(args[0], (tuple, list)):
+        pos = tuple(args[0])
+    elif args:
+        target_id = args[0].entity_id
+    issue(Order(COMMAND, obj.entity_id, index, pos, target_id))
+
+
+def issue(order: Order):
+    if _sink is not None:
+        _sink(order)
+    else:
+        execute(order)
+
+
+def execute(order: Order, empire=None) -> bool:
+    """ Executes `order`. If `empire` is given, only objects of `empire` can be ordered.
+    Returns false if the order is not executed since its objects do not exist anymore.
+    Raises `exceptions.CreationError` if a command can not be executed (e.g. there are not enough resources). """
+
+    registry = game.Game().registry
+    obj = registry.get(order.object_id)
+    if obj is None or registry.is_pending_kill(obj) or empire is not None and obj.empire is not empire:
+        return False
+    target = None
+    if order.target_id:
+        target = registry.get(order.target_id)
+        if target is None or registry.is_pending_kill(target):
+            return False
+
+    if order.kind == EMPTY_CLICK:
+        obj.handle_empty_click(order.pos)
+    elif order.kind == INTERACT:
+        obj.interact_with(target)
+    elif order.kind == COMMAND:
+        commands = commands_of(obj)
+        if not 0 <= order.command < len(commands):
+            return False
+        action = commands[order.command][1]
+        if order.pos is not None:
+            action(order.pos)
+        elif target is not None:
+            action(target)
+        else:
+            action()
+    else:
+        return False
+    return True
+
+
+def commands_of(obj) -> List[Tuple]:
+    """ Returns commands of `obj` in order they are shown by interface. """
+    return obj.mouse_interaction_commands + obj.no_interaction_commands + obj.object_interaction_commands
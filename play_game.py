@@ -2,43 +2,55 @@
 To start one, put `python3 play_game.py` in terminal. """
 
 
-import os
-import sys
+import math
+import json
+import random
+import asyncio
+import argparse
 import pygame
 # project modules #
-import user_configs
 import game_configs as configs
+import user_configs
+import engine
+import renderer
+import replay
+import snapshot
+import lockstep
 from game import Game
-from game_objects import races
-from game_objects.empire import Empire
-from world_map import Map
-from ai import AI
 from interface.interface_class import Interface
 from interface import click_handler
+from interface import interface_configs
+from interface import message
+from interface.fonts import Fonts
 from display import Display
+from profiler import Profiler
+from frame_scheduler import FrameScheduler
+from ai import AI
 import image as img
 
 
-def place_objects_on_display():
-    """ Finds what objects can be displayed onto the screen and displays them. """
-    for obj in pygame.sprite.spritecollide(Display(), Game().objects, False):
-        Display().image.blit(obj.image, (obj.rect.x -
-                                         Interface().camera.x, obj.rect.y - Interface().camera.y))
+SPEED_UP_KEYS = pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS
+SLOW_DOWN_KEYS = pygame.K_MINUS, pygame.K_KP_MINUS
+PROFILER_OVERLAY_KEY = pygame.K_F3
+EXPORT_TRACE_KEY = pygame.K_F4
+SAVE_KEY = pygame.K_F5
+LOAD_KEY = pygame.K_F9
 
 
-def _wait_for_command():
-    """ Is called when game has finished. """
+def _wait_for_command() -> bool:
+    """ Is called when game has finished. Returns true if the game must be restarted. """
 
     while True:
         for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+            if event.type == pygame.QUIT or \
+                    event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                return False
             if event.type == pygame.KEYDOWN:
-                os.execl(sys.executable, sys.executable, *sys.argv)
+                return True
 
 
-def finish_game(win: bool, screen: pygame.Surface):
-    """ Is called when game is finished. """
+def finish_game(win: bool, screen: pygame.Surface, can_restart: bool = True) -> bool:
+    """ Is called when game is finished. Returns true if player wants to restart the game. """
 
     if win:
         pygame.draw.rect(screen, pygame.Color('yellow'), screen.get_rect())
@@ -46,96 +58,311 @@ def finish_game(win: bool, screen: pygame.Surface):
     else:
         pygame.draw.rect(screen, pygame.Color('red'), screen.get_rect())
         final_message = 'You lost...'
-    # Set font.
-    font = pygame.font.SysFont(name='Ani', size=100)
     # Place messages.
-    screen.blit(font.render(final_message, True, pygame.Color('black')),
+    screen.blit(_render_final_text(final_message),
                 (screen.get_width() // 3 + 80, screen.get_height() // 5))
-    screen.blit(font.render('To exit, press ESC.', True, pygame.Color('black')),
+    screen.blit(_render_final_text('To exit, press ESC.'),
                 (screen.get_width() // 6, screen.get_height() // 4 + 150))
-    screen.blit(font.render('To restart the game, press any other button.', True, pygame.Color('black')),
-                (screen.get_width() // 4 + 30, screen.get_height() // 4 + 300))
+    if can_restart:
+        screen.blit(_render_final_text('To restart the game, press any other button.'),
+                    (screen.get_width() // 4 + 30, screen.get_height() // 4 + 300))
     # Display changes.
     pygame.display.update()
 
-    _wait_for_command()
+    return _wait_for_command()
 
 
-def play_game():
-    """ Starts the game. """
+def _render_final_text(text: str) -> pygame.Surface:
+    return Fonts().render(text, pygame.Color('black'), interface_configs.FINAL_MESSAGE_FONT_STYLE,
+                          interface_configs.FINAL_MESSAGE_FONT_SIZE)
 
-    # Game objects initialization starts.
-    player_empire = Empire(user_configs.EMPIRE_RACE,
-                           name=user_configs.EMPIRE_NAME)
-    enemy_empire = Empire(races.DWARFS, name='Durden')
 
-    # Initialize game singletons.
-    Game(player_empire, enemy_empire)
-    Interface(player_empire, enemy_empire)
-    Display(SCREEN)
+def _show_message(text: str):
+    msg = message.Message(text, lifetime=2)
+    msg.rect.topleft = Interface().profiler_overlay.rect.bottomleft
+    Interface().messages.add(msg)
+
+
+def _export_trace():
+    """ Writes last frames recorded by frame profiler to Chrome trace file. """
+    if not len(Profiler()):
+        return
+    Profiler().export_trace(configs.PROFILER_TRACE_FILE, configs.PROFILER_TRACE_FRAMES)
+    _show_message(f'Frames trace is written to {configs.PROFILER_TRACE_FILE}')
+
+
+def _save_game():
+    try:
+        snapshot.save(configs.SAVE_FILE)
+    except OSError as error:
+        _show_message(f'The game is not saved: {error}')
+        return
+    _show_message(f'The game is saved to {configs.SAVE_FILE}')
+
+
+def _load_game(recorder: replay.Recorder = None, session: lockstep.Lockstep = None):
+    """ Restores the game saved by `_save_game`. """
+    if recorder is not None:
+        # Replay can not reproduce a jump to another state.
+        _show_message('The game can not be loaded while it is recorded')
+        return
+    if session is not None:
+        # The other player's game would not be loaded.
+        _show_message('Multiplayer games can not be loaded')
+        return
+    try:
+        snapshot.load(configs.SAVE_FILE)
+    except (OSError, snapshot.SnapshotError) as error:
+        _show_message(f'The game is not loaded: {error}')
+        return
+    # Messages lifetime is counted by game clock which has been changed.
+    Interface().messages.empty()
+    _show_message(f'The game is loaded from {configs.SAVE_FILE}')
+
+
+def _handle_events(recorder: replay.Recorder = None, session: lockstep.Lockstep = None) -> bool:
+    """ Handles pygame events. Returns true if mouse has been pressed. """
 
-    player_empire.set_city(user_configs.CITY_NAME)
-    player_default_city = player_empire.get_city(user_configs.CITY_NAME)
-    player_default_city.rect.x = 500
-    player_default_city.rect.centery = Map().rect.centery
+    mouse_pressed = False
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT or \
+                event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            if recorder is not None:
+                recorder.close(Game().clock.ticks)
+            if session is not None:
+                session.close()
+            pygame.quit()
+            quit()
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pressed = True
+        if event.type == pygame.KEYDOWN and event.key in SPEED_UP_KEYS:
+            Game().clock.speed_up()
+        if event.type == pygame.KEYDOWN and event.key in SLOW_DOWN_KEYS:
+            Game().clock.slow_down()
+        if event.type == pygame.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+            Interface().profiler_overlay.toggle()
+        if event.type == pygame.KEYDOWN and event.key == EXPORT_TRACE_KEY:
+            _export_trace()
+        if event.type == pygame.KEYDOWN and event.key == SAVE_KEY:
+            _save_game()
+        if event.type == pygame.KEYDOWN and event.key == LOAD_KEY:
+            _load_game(recorder, session)
+    return mouse_pressed
 
-    enemy_empire.set_city("Nuhen")
-    enemy_default_city = enemy_empire.get_city("Nuhen")
-    enemy_default_city.rect.right = Map().rect.right - 700
-    enemy_default_city.rect.centery = Map().rect.centery
 
-    AI(enemy_empire)
+def play_game(recorder: replay.Recorder = None):
+    """ Starts the game. If `recorder` is given, player input is recorded. """
+
+    # Game objects initialization starts.
+    # Recorded games must be deterministic, so AI plans inline then.
+    player_empire, _ = engine.init_game(background_ai=configs.BACKGROUND_AI_PLANNING and recorder is None)
+    Display(SCREEN)
+    frame_renderer = renderer.create_renderer(SCREEN, configs.DIRTY_RECT_RENDERING)
+    # The game is restarted by restoring its initial state.
+    initial_state = snapshot.dumps()
     # Game objects initialization ends.
 
     while True:
-        mouse_pressed = False
+        profiler = Profiler()
+        profiler.begin_frame()
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or \
-                    event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                pygame.quit()
-                quit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pressed = True
+        with profiler.phase('events'):
+            mouse_pressed = _handle_events(recorder)
+            key = pygame.key.get_pressed()
+            mouse_pos = pygame.mouse.get_pos()
+
+        if mouse_pressed:
+            if recorder is not None:
+                recorder.record_click(Game().clock.ticks, mouse_pos)
+            with profiler.phase('handle_click'):
+                click_handler.handle_click(mouse_pos)
+
+        # Advance the game. If any of empires is out of cities, the game is finished.
+        if not engine.tick():
+            if recorder is not None:
+                # Only the first game is recorded.
+                recorder.close(Game().clock.ticks)
+                recorder = None
+            if not finish_game(win=player_empire.alive(), screen=SCREEN):
+                return
+            snapshot.loads(initial_state)
+            Interface().messages.empty()
+            continue
+        if recorder is not None and recorder.is_keyframe_due(Game().clock.ticks):
+            recorder.record_keyframe(Game().clock.ticks)
+
+        Interface().move_view(key, mouse_pos)
+        if recorder is not None:
+            recorder.record_camera(Game().clock.ticks, Interface().camera.topleft)
+        # Draw map, objects and interface.
+        changed_areas = frame_renderer.render()
+
+        # Show screen.
+        with profiler.phase('display_update'):
+            pygame.display.update(changed_areas)
+        profiler.end_frame()
+        # Cap the framerate according to game speed.
+        CLOCK.tick(Game().clock.frame_rate())
 
-        key = pygame.key.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
 
+def play_game_async():
+    """ Starts the game driven by asyncio frame scheduler (see `frame_scheduler`):
+    input polling, ticks, AI, rendering, minimap refresh and telemetry writes are
+    separate tasks with their own rates. Input is not recorded in this mode. """
+
+    player_empire, _ = engine.init_game(background_ai=configs.BACKGROUND_AI_PLANNING)
+    Display(SCREEN)
+    frame_renderer = renderer.create_renderer(SCREEN, configs.DIRTY_RECT_RENDERING)
+    # Minimap is refreshed by a low priority task.
+    Interface().minimap.auto_refresh = False
+    initial_state = snapshot.dumps()
+
+    while True:
+        # Scheduler is stopped when the game is finished.
+        asyncio.run(create_scheduler(frame_renderer).run())
+        if not finish_game(win=player_empire.alive(), screen=SCREEN):
+            return
+        snapshot.loads(initial_state)
+        Interface().messages.empty()
+
+
+def create_scheduler(frame_renderer: renderer.Renderer) -> FrameScheduler:
+    """ Returns frame scheduler with the game loop tasks. A frame lasts from one rendering to the next one.
+    Other periodic work (e.g. network clients) can be added to the scheduler as tasks. """
+
+    scheduler = FrameScheduler()
+    profiler = Profiler()
+
+    def poll_input():
+        with profiler.phase('events'):
+            mouse_pressed = _handle_events()
+        mouse_pos = pygame.mouse.get_pos()
         if mouse_pressed:
-            click_handler.handle_click(mouse_pos)
+            with profiler.phase('handle_click'):
+                click_handler.handle_click(mouse_pos)
+        Interface().move_view(pygame.key.get_pressed(), mouse_pos)
+
+    def tick():
+        # AI is played by its own task.
+        if not engine.tick(ai=False):
+            scheduler.stop()
+
+    def play_ai():
+        with profiler.phase('ai'):
+            AI().play_step()
 
-        # AI is singleton, which has been initialized before.
-        AI().play_step()
+    def render():
+        changed_areas = frame_renderer.render()
+        with profiler.phase('display_update'):
+            pygame.display.update(changed_areas)
+        profiler.end_frame()
+        profiler.begin_frame()
 
-        # If any of empires is out of cities, the game is finished.
-        if not player_empire.alive() or not enemy_empire.alive():
-            finish_game(win=player_empire.alive(), screen=SCREEN)
+    def refresh_minimap():
+        with profiler.phase('minimap'):
+            Interface().minimap.refresh()
+
+    async def write_telemetry():
+        if not profiler.enabled:
             return
+        line = json.dumps({'ticks': Game().clock.ticks,
+                           'frame': profiler.statistics(),
+                           'tasks': scheduler.statistics()})
+        # File is written by a thread, so the loop goes on meanwhile.
+        await asyncio.get_running_loop().run_in_executor(None, _append_line, configs.TELEMETRY_FILE, line)
+
+    def tick_rate():
+        # 0 means there is no limit.
+        return Game().clock.frame_rate() or math.inf
+
+    scheduler.add('input', poll_input, tick_rate)
+    scheduler.add('tick', tick, tick_rate)
+    scheduler.add('ai', play_ai, configs.ASYNC_AI_RATE)
+    scheduler.add('render', render, configs.ASYNC_RENDER_RATE)
+    scheduler.add('minimap', refresh_minimap, interface_configs.MINIMAP_REFRESH_RATE, low_priority=True)
+    scheduler.add('telemetry', write_telemetry, 1 / configs.TELEMETRY_INTERVAL, low_priority=True)
+    return scheduler
+
+
+def play_game_lockstep(session: lockstep.Lockstep):
+    """ Plays multiplayer game `session` (see `lockstep`). Orders of both players are executed
+    by `session`, so a tick is played only when the other player's orders for it have come. """
+
+    Display(SCREEN)
+    frame_renderer = renderer.create_renderer(SCREEN, configs.DIRTY_RECT_RENDERING)
+    session.start()
+
+    while not session.finished:
+        profiler = Profiler()
+        profiler.begin_frame()
+
+        with profiler.phase('events'):
+            mouse_pressed = _handle_events(session=session)
+            key = pygame.key.get_pressed()
+            mouse_pos = pygame.mouse.get_pos()
+        if mouse_pressed:
+            with profiler.phase('handle_click'):
+                click_handler.handle_click(mouse_pos)
+
+        with profiler.phase('lockstep'):
+            try:
+                session.update()
+            except lockstep.LockstepError as error:
+                session.close()
+                pygame.quit()
+                raise SystemExit(str(error))
 
         Interface().move_view(key, mouse_pos)
-        # Update objects.
-        # It looks weird, but use Game().objects.update() causes an error in
-        # specific case: if one of objects is killed during `update`, its `update`
-        # method is still called. It happens because Game().objects.update() updates
-        # ALL sprites which are contained in Game().objects at the moment of
-        # Game().objects.update() is called.
-        for obj in Game().objects:
-            if obj in Game().objects:
-                obj.update()
-        # Make place of camera location visible.
-        SCREEN.blit(Map().image, (-Interface().camera.x, -Interface().camera.y))
-
-        place_objects_on_display()
-
-        Interface().draw_interface(SCREEN)
+        changed_areas = frame_renderer.render()
+        with profiler.phase('display_update'):
+            pygame.display.update(changed_areas)
+        profiler.end_frame()
+        CLOCK.tick(Game().clock.frame_rate())
+
+    session.close()
+    finish_game(win=Interface().player_empire.alive(), screen=SCREEN, can_restart=False)
+
+
+def _start_lockstep(args: argparse.Namespace) -> lockstep.Lockstep:
+    """ Hosts or joins multiplayer game according to command line `args`. """
+    try:
+        if args.host is not None:
+            print(f'Waiting for the other player on port {args.host}...')
+            return lockstep.host(lockstep.listen(args.host), args.race)
+        address, port = args.join.rsplit(':', 1)
+        return lockstep.join(address, int(port), args.race)
+    except lockstep.LockstepError as error:
+        raise SystemExit(str(error))
 
-        # Show screen.
-        pygame.display.update()
-        # Cap the framerate.
-        CLOCK.tick(50)
+
+def _append_line(path: str, line: str):
+    with open(path, 'a') as file:
+        file.write(line + '\n')
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Play the game.')
+    parser.add_argument('--record', default=None,
+                        help='record player input to this file (replay it with `replay.py`)')
+    parser.add_argument('--asyncio', action='store_true',
+                        help='run the game loop as asyncio tasks with their own rates')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--host', type=int, metavar='PORT', default=None,
+                       help='host multiplayer game on this port (see `lockstep`)')
+    group.add_argument('--join', metavar='ADDRESS:PORT', default=None,
+                       help='join multiplayer game hosted at this address')
+    parser.add_argument('--race', default=user_configs.EMPIRE_RACE,
+                        help='race of the player in multiplayer game')
+    args = parser.parse_args()
+    if args.record is not None and args.asyncio:
+        parser.error('games played with --asyncio can not be recorded')
+    if (args.host is not None or args.join is not None) and (args.record is not None or args.asyncio):
+        parser.error('multiplayer games can not be recorded or played with --asyncio')
+    return args
 
 
 if __name__ == '__main__':
+    ARGS = _parse_args()
     # pygame initialization.
     pygame.init()
     tmp = pygame.display.set_mode(configs.SCR_SIZE)
@@ -147,4 +374,13 @@ if __name__ == '__main__':
     SCREEN = tmp
     CLOCK = pygame.time.Clock()
 
-    play_game()
+    # The game does not use random numbers now, but the seed is recorded for ones which will.
+    SEED = random.randrange(2 ** 32)
+    random.seed(SEED)
+    if ARGS.host is not None or ARGS.join is not None:
+        # Multiplayer game is seeded by host.
+        play_game_lockstep(_start_lockstep(ARGS))
+    elif ARGS.asyncio:
+        play_game_async()
+    else:
+        play_game(replay.Recorder(ARGS.record, SEED) if ARGS.record is not None else None)
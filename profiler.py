@@ -0,0 +1,212 @@
+""" This module contains `Profiler` which measures how long every phase of a frame takes.
+Usage example:
+
+Profiler().begin_frame()
+with Profiler().phase('update_objects'):
+    engine.update_objects()
+Profiler().end_frame()
+
+Profiler is disabled by default. While it is disabled, `phase` returns a shared
+do-nothing context manager and frames are not recorded, so instrumented code
+costs a few attribute lookups per phase. """
+
+
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional, Text, Tuple
+# project modules #
+import game_configs as configs
+import singleton
+
+
+class Profiler(metaclass=singleton.Singleton):
+    """ Keeps phases timings of last `window` frames (rolling window).
+    Statistics and histograms are computed over the window.
+    Phases started outside of a frame (between `end_frame` and `begin_frame`) are not recorded. """
+
+    def __init__(self, window: int = configs.PROFILER_WINDOW):
+        if window <= 0:
+            raise ProfilerError(f'Profiler window must be positive, got {window}.')
+        self.enabled = False
+        self.window = window
+        # Recorded frames: (number, start, duration, [(phase, start, duration), ...]).
+        self._frames: deque = deque(maxlen=window)
+        self._frame_number = 0
+        self._frame_start: Optional[float] = None
+        self._phases: List[Tuple[Text, float, float]] = []
+
+    def __len__(self) -> int:
+        """ Returns number of recorded frames. """
+        return len(self._frames)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        """ Stops recording. Recorded frames are kept. """
+        self.enabled = False
+        self._frame_start = None
+
+    def toggle(self) -> bool:
+        """ Enables profiler if it is disabled and vice versa. Returns true if it is enabled now. """
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def clear(self):
+        """ Drops recorded frames and restarts frames numbering. """
+        self._frames.clear()
+        self._frame_number = 0
+        self._frame_start = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self._phases = []
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        end = time.perf_counter()
+        self._frames.append((self._frame_number, self._frame_start, end - self._frame_start, self._phases))
+        self._frame_number += 1
+        self._frame_start = None
+
+    def phase(self, name: Text):
+        """ Returns context manager which measures `name` phase of the current frame. """
+        if not self.enabled:
+            return _DISABLED_PHASE
+        return _Phase(self, name)
+
+    def phase_names(self) -> List[Text]:
+        """ Returns names of recorded phases in order of their first appearance. """
+        names = {}
+        for _, _, _, phases in self._frames:
+            for name, _, _ in phases:
+                names.setdefault(name)
+        return list(names)
+
+    def durations(self, name: Text = None) -> List[float]:
+        """ Returns durations (in seconds) of `name` phase in recorded frames which have it.
+        If a phase happens several times during a frame, its durations are summed.
+        If `name` is `None`, returns durations of frames. """
+
+        if name is None:
+            return [duration for _, _, duration, _ in self._frames]
+        durations = []
+        for _, _, _, phases in self._frames:
+            total, found = 0.0, False
+            for phase_name, _, duration in phases:
+                if phase_name == name:
+                    total += duration
+                    found = True
+            if found:
+                durations.append(total)
+        return durations
+
+    def statistics(self, name: Text = None) -> Dict[Text, float]:
+        """ Returns mean, median, 99th percentile and max durations (in milliseconds)
+        of `name` phase (or of frames if `name` is `None`). """
+
+        return timing_statistics(self.durations(name))
+
+    def histogram(self, name: Text = None, bins: int = configs.PROFILER_HISTOGRAM_BINS,
+                  bin_width: float = configs.PROFILER_HISTOGRAM_BIN_WIDTH) -> List[int]:
+        """ Returns numbers of `name` phase (or frame) durations which fall into `bins` bins
+        of `bin_width` milliseconds. The last bin also counts all longer durations. """
+
+        counts = [0] * bins
+        for duration in self.durations(name):
+            counts[min(int(duration * 1000 / bin_width), bins - 1)] += 1
+        return counts
+
+    def trace_events(self, frames: int = None) -> List[Dict]:
+        """ Returns last `frames` recorded frames (all if `frames` is `None`)
+        as Chrome trace events (complete events with microseconds timestamps). """
+
+        recorded = list(self._frames)
+        if frames is not None:
+            recorded = recorded[-frames:] if frames > 0 else []
+        events = []
+        for number, start, duration, phases in recorded:
+            events.append(_trace_event('frame', 'frame', start, duration, {'frame': number}))
+            for name, phase_start, phase_duration in phases:
+                events.append(_trace_event(name, 'phase', phase_start, phase_duration))
+        return events
+
+    def export_trace(self, path: Text, frames: int = None):
+        """ Writes last `frames` recorded frames to `path` in Chrome trace event format
+        (open it with chrome://tracing or Perfetto). """
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': self.trace_events(frames), 'displayTimeUnit': 'ms'}, file)
+
+    def _record(self, name: Text, start: float, duration: float):
+        if self._frame_start is not None:
+            self._phases.append((name, start, duration))
+
+
+class _Phase:
+    """ Measures one phase and records it on exit. """
+
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler: Profiler, name: Text):
+        self._profiler = profiler
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler._record(self._name, self._start, time.perf_counter() - self._start)
+        return False
+
+
+class _DisabledPhase:
+    """ Context manager which does nothing. """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_DISABLED_PHASE = _DisabledPhase()
+
+
+def _trace_event(name: Text, category: Text, start: float, duration: float, args: Dict = None) -> Dict:
+    event = {'name': name, 'cat': category, 'ph': 'X', 'pid': 1, 'tid': 1,
+             'ts': start * 1e6, 'dur': duration * 1e6}
+    if args is not None:
+        event['args'] = args
+    return event
+
+
+def timing_statistics(times: List[float]) -> Dict[Text, float]:
+    """ Returns mean, median, 99th percentile and max of `times` (in seconds) in milliseconds. """
+    if not times:
+        return {'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+    ordered = sorted(times)
+    return {'mean': sum(ordered) / len(ordered) * 1000,
+            'p50': _percentile(ordered, 50) * 1000,
+            'p99': _percentile(ordered, 99) * 1000,
+            'max': ordered[-1] * 1000}
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """ Returns `percent` percentile of sorted `ordered` values (nearest rank). """
+    rank = max(int(len(ordered) * percent / 100 + 0.5), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class ProfilerError(Exception):
+    pass
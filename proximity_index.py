@@ -0,0 +1,84 @@
+""" This module contains `ProximityIndex` which answers "which enemies are near this point" queries. """
+
+
+import math
+from typing import Dict, Iterable, List, Tuple
+# project modules #
+import game
+
+
+class ProximityIndex:
+    """ Keeps centers of game objects in a uniform grid of `cell_size` square cells per empire.
+    The grids are rebuilt in bulk at most once per game tick (on the first query of the tick),
+    so units which look for enemies every tick do not scan all objects.
+    Objects which die during the tick are not returned. """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        # Empire -> cell coordinates -> (x, y, object) of objects which centers are in the cell.
+        self._grids: Dict[object, Dict[Tuple[int, int], List[Tuple[int, int, object]]]] = {}
+        # Game tick the grids have been built at.
+        self._built_at = None
+
+    def invalidate(self):
+        """ Makes index rebuild its grids on the next query. """
+        self._built_at = None
+
+    def nearest_enemy(self, empire, pos: Tuple[int, int], radius: float):
+        """ Returns object of other than `empire` empire which center is the nearest
+        to `pos` and closer than `radius`. Returns `None` if there is no such object. """
+
+        x, y = pos
+        nearest, nearest_distance = None, radius
+        for enemy_x, enemy_y, obj in self._candidates(empire, pos, radius):
+            distance = math.hypot(enemy_x - x, enemy_y - y)
+            if distance < nearest_distance and self._is_alive(obj):
+                nearest, nearest_distance = obj, distance
+        return nearest
+
+    def enemies_within(self, empire, pos: Tuple[int, int], radius: float) -> List:
+        """ Returns objects of other than `empire` empires which centers are closer than `radius` to `pos`. """
+        x, y = pos
+        return [obj for enemy_x, enemy_y, obj in self._candidates(empire, pos, radius)
+                if math.hypot(enemy_x - x, enemy_y - y) < radius and self._is_alive(obj)]
+
+    def enemies_within_many(self, empire, points: Iterable[Tuple[int, int]], radius: float) -> List[List]:
+        """ Batch version of `enemies_within`: returns enemies near every point of `points`. """
+        return [self.enemies_within(empire, pos, radius) for pos in points]
+
+    def _candidates(self, empire, pos: Tuple[int, int], radius: float) -> Iterable[Tuple[int, int, object]]:
+        """ Yields enemy objects located in cells which intersect `radius` square around `pos`. """
+
+        self._build_if_outdated()
+        left = int((pos[0] - radius) // self.cell_size)
+        right = int((pos[0] + radius) // self.cell_size)
+        top = int((pos[1] - radius) // self.cell_size)
+        bottom = int((pos[1] + radius) // self.cell_size)
+        for other_empire, grid in self._grids.items():
+            if other_empire is empire:
+                continue
+            for col in range(left, right + 1):
+                for row in range(top, bottom + 1):
+                    yield from grid.get((col, row), ())
+
+    def _build_if_outdated(self):
+        """ Rebuilds grids if they have been built during another tick. """
+
+        tick = game.Game().clock.ticks
+        if self._built_at == tick:
+            return
+        registry = game.Game().registry
+        self._grids = {}
+        for obj in registry:
+            if registry.is_pending_kill(obj):
+                continue
+            x, y = obj.rect.center
+            grid = self._grids.setdefault(obj.empire, {})
+            grid.setdefault((x // self.cell_size, y // self.cell_size), []).append((x, y, obj))
+        self._built_at = tick
+
+    @staticmethod
+    def _is_alive(obj) -> bool:
+        """ Returns true if `obj` has neither been killed nor scheduled to be killed since grids were built. """
+        registry = game.Game().registry
+        return obj in registry and not registry.is_pending_kill(obj)
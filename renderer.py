@@ -0,0 +1,139 @@
+""" This module contains renderers which draw game world and interface onto the screen.
+`FullRenderer` redraws the whole screen every frame.
+`DirtyRenderer` redraws only screen areas which have changed since the previous frame. """
+
+
+from abc import ABC, abstractmethod
+from typing import Dict, List
+import pygame
+# project modules #
+from game import Game
+from world_map import Map
+from interface.interface_class import Interface
+from display import Display
+from profiler import Profiler
+
+
+def place_objects_on_display():
+    """ Finds what objects can be displayed onto the screen and displays them. """
+    for obj in Game().objects.sprites_in_rect(Display().rect):
+        Display().image.blit(obj.image, (obj.rect.x -
+                                         Interface().camera.x, obj.rect.y - Interface().camera.y))
+
+
+def create_renderer(screen: pygame.Surface, dirty_rects: bool) -> 'Renderer':
+    """ Returns dirty-rect renderer if `dirty_rects` is true and full renderer otherwise. """
+    if dirty_rects:
+        return DirtyRenderer(screen)
+    return FullRenderer(screen)
+
+
+# Strategy.
+class Renderer(ABC):
+    """ Base class of renderers. """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+
+    @abstractmethod
+    def render(self) -> List[pygame.Rect]:
+        """ Draws the frame onto the screen.
+        Returns screen areas which must be passed to `pygame.display.update`. """
+
+
+class FullRenderer(Renderer):
+    """ Redraws map, all visible objects and all interface windows every frame. """
+
+    def render(self) -> List[pygame.Rect]:
+        profiler = Profiler()
+        with profiler.phase('map_blit'):
+            # Make place of camera location visible.
+            self.screen.blit(Map().image, (-Interface().camera.x, -Interface().camera.y))
+        with profiler.phase('place_objects'):
+            place_objects_on_display()
+        with profiler.phase('draw_interface'):
+            Interface().draw_interface(self.screen)
+        return [self.screen.get_rect()]
+
+
+class DirtyRenderer(Renderer):
+    """ Keeps track of screen positions of visible objects and interface windows
+    and redraws only areas which have changed: moved, appeared, disappeared or
+    marked dirty (see `Window.dirty`) sprites.
+    Camera scroll shifts every pixel of the world, so it leads to full redraw. """
+
+    def __init__(self, screen: pygame.Surface):
+        Renderer.__init__(self, screen)
+        self._camera_pos = None
+        # Screen rects sprites were drawn at during the previous frame.
+        self._objects: Dict[pygame.sprite.Sprite, pygame.Rect] = {}
+        self._windows: Dict[pygame.sprite.Sprite, pygame.Rect] = {}
+
+    def render(self) -> List[pygame.Rect]:
+        profiler = Profiler()
+        camera = Interface().camera
+        with profiler.phase('draw_interface'):
+            Interface().update_interface()
+            windows = {win: win.rect.copy() for win in Interface().windows()}
+        with profiler.phase('place_objects'):
+            objects = {obj: obj.rect.move(-camera.x, -camera.y)
+                       for obj in Game().objects.sprites_in_rect(camera)}
+
+        screen_rect = self.screen.get_rect()
+        if camera.topleft != self._camera_pos:
+            areas = [screen_rect]
+        else:
+            areas = _changed_areas(self._objects, objects) + _changed_areas(self._windows, windows)
+            areas = [area.clip(screen_rect) for area in areas]
+            areas = [area for area in areas if area.width > 0 and area.height > 0]
+            # There is no sense to draw many small areas if they cover the whole screen.
+            if sum(area.width * area.height for area in areas) >= screen_rect.width * screen_rect.height:
+                areas = [screen_rect]
+
+        # Map, objects and windows are blitted area by area, so they are measured together.
+        with profiler.phase('map_blit'):
+            self._redraw(areas, objects, windows)
+
+        for sprite in objects:
+            sprite.dirty = False
+        for sprite in windows:
+            sprite.dirty = False
+        self._camera_pos = camera.topleft
+        self._objects = objects
+        self._windows = windows
+        return areas
+
+    def _redraw(self, areas: List[pygame.Rect],
+                objects: Dict[pygame.sprite.Sprite, pygame.Rect],
+                windows: Dict[pygame.sprite.Sprite, pygame.Rect]):
+        """ Redraws map, objects and interface windows within `areas`. """
+
+        camera = Interface().camera
+        # Lists keep drawing order, so overlapped sprites are drawn the same way as in full redraw.
+        sprites = list(objects) + list(windows)
+        rects = list(objects.values()) + list(windows.values())
+        for area in areas:
+            self.screen.set_clip(area)
+            self.screen.blit(Map().image, area, area.move(camera.topleft))
+            for i in area.collidelistall(rects):
+                self.screen.blit(sprites[i].image, rects[i])
+        self.screen.set_clip(None)
+
+
+def _changed_areas(previous: Dict[pygame.sprite.Sprite, pygame.Rect],
+                   current: Dict[pygame.sprite.Sprite, pygame.Rect]) -> List[pygame.Rect]:
+    """ Returns screen areas which have changed between `previous` and `current` frames. """
+    areas = []
+    for sprite, rect in current.items():
+        old_rect = previous.get(sprite)
+        if old_rect is None:
+            areas.append(rect)
+        elif old_rect != rect:
+            areas.append(old_rect)
+            areas.append(rect)
+        elif sprite.dirty:
+            areas.append(rect)
+    for sprite, old_rect in previous.items():
+        if sprite not in current:
+            areas.append(old_rect)
+    return areas
@@ -0,0 +1,273 @@
+""" This module records player input into a compact binary file and replays it without rendering.
+To replay a recording, put `python3 replay.py recording.rpl` in terminal (see `--help` for options).
+
+The game is deterministic: it depends only on game clock and input, so a recording
+consists of game settings, a random seed and input of every tick:
+clicks (screen positions) and camera positions (keyboard and mouse scrolling result).
+Every `keyframe_interval` ticks the whole game state is saved (see `snapshot`),
+so replay can start from the nearest keyframe instead of the first tick.
+
+File layout: header, then records `(kind, tick, x, y)`. A keyframe record
+is followed by snapshot length and snapshot itself. The last record is `END`. """
+
+
+import os
+import sys
+import time
+import bisect
+import random
+import struct
+import argparse
+from typing import Dict, List, NamedTuple, Optional, Text, Tuple
+import pygame
+# project modules #
+import game_configs as configs
+import user_configs
+import engine
+import snapshot
+from game import Game
+from game_objects import races
+from interface.interface_class import Interface
+from interface import click_handler
+
+
+MAGIC = b'LOTSRPL\0'
+VERSION = 1
+
+# Version, seed, tick rate, keyframe interval, settings flags.
+_HEADER = struct.Struct('<HIHIB')
+# Kind, tick, x, y.
+_RECORD = struct.Struct('<BIhh')
+_LENGTH = struct.Struct('<I')
+
+END, CLICK, CAMERA, KEYFRAME = range(4)
+
+# Settings flags.
+_VECTORIZED_MOVEMENT = 1
+_FLOW_FIELD_NAVIGATION = 2
+
+
+class Event(NamedTuple):
+    kind: int
+    tick: int
+    pos: Tuple[int, int]
+
+
+class Keyframe(NamedTuple):
+    tick: int
+    # Position and length of snapshot in recording file.
+    offset: int
+    length: int
+
+
+class Recorder:
+    """ Writes input of the game which is played now to `path` file.
+    Input must be recorded before the tick it is handled at (see `play_game`),
+    keyframes are taken after ticks (see `record_keyframe`). """
+
+    def __init__(self, path: Text, seed: int, keyframe_interval: int = configs.REPLAY_KEYFRAME_INTERVAL,
+                 player_race: Text = user_configs.EMPIRE_RACE, player_name: Text = user_configs.EMPIRE_NAME,
+                 city_name: Text = user_configs.CITY_NAME, enemy_race: Text = races.DWARFS):
+        if keyframe_interval <= 0:
+            raise ReplayError(f'Keyframe interval must be positive, got {keyframe_interval}.')
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self._camera_pos = None
+        self._file = open(path, 'wb')
+        flags = ((_VECTORIZED_MOVEMENT if configs.VECTORIZED_MOVEMENT else 0) |
+                 (_FLOW_FIELD_NAVIGATION if configs.FLOW_FIELD_NAVIGATION else 0))
+        self._file.write(MAGIC)
+        self._file.write(_HEADER.pack(VERSION, seed, configs.TICK_RATE, keyframe_interval, flags))
+        for text in (player_race, player_name, city_name, enemy_race):
+            encoded = text.encode()
+            self._file.write(struct.pack('<H', len(encoded)) + encoded)
+
+    def record_click(self, tick: int, pos: Tuple[int, int]):
+        """ Records click at `pos` screen position. """
+        self._file.write(_RECORD.pack(CLICK, tick, *pos))
+
+    def record_camera(self, tick: int, pos: Tuple[int, int]):
+        """ Records camera position. Only changes of position are written. """
+        if pos != self._camera_pos:
+            self._file.write(_RECORD.pack(CAMERA, tick, *pos))
+            self._camera_pos = tuple(pos)
+
+    def is_keyframe_due(self, tick: int) -> bool:
+        """ Returns true if game state should be recorded after `tick` tick. """
+        return tick % self.keyframe_interval == 0
+
+    def record_keyframe(self, tick: int, state: bytes = None):
+        """ Records game state (current one if `state` is not given) as `tick` keyframe. """
+        if state is None:
+            state = snapshot.dumps()
+        self._file.write(_RECORD.pack(KEYFRAME, tick, 0, 0))
+        self._file.write(_LENGTH.pack(len(state)))
+        self._file.write(state)
+
+    def close(self, tick: int):
+        """ Finishes recording at `tick` tick. """
+        if self._file.closed:
+            return
+        self._file.write(_RECORD.pack(END, tick, 0, 0))
+        self._file.close()
+
+
+class Recording:
+    """ Reads recording from `path` file. Snapshots of keyframes are read only when they are needed. """
+
+    def __init__(self, path: Text):
+        self.path = path
+        self.events: List[Event] = []
+        self.keyframes: List[Keyframe] = []
+        # Recording may be unfinished (e.g. if the game has crashed), then it ends at the last record.
+        self.last_tick = 0
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ReplayError(f'{path} is not a recording.')
+            version, self.seed, self.tick_rate, self.keyframe_interval, flags = _read(file, _HEADER)
+            if version != VERSION:
+                raise ReplayError(f'Recording version {version} is not supported (expected {VERSION}).')
+            self.vectorized_movement = bool(flags & _VECTORIZED_MOVEMENT)
+            self.flow_field_navigation = bool(flags & _FLOW_FIELD_NAVIGATION)
+            texts = []
+            for _ in range(4):
+                length, = struct.unpack('<H', file.read(2))
+                texts.append(file.read(length).decode())
+            self.player_race, self.player_name, self.city_name, self.enemy_race = texts
+
+            while True:
+                record = file.read(_RECORD.size)
+                if len(record) < _RECORD.size:
+                    break
+                kind, tick, x, y = _RECORD.unpack(record)
+                self.last_tick = tick
+                if kind == END:
+                    break
+                if kind == KEYFRAME:
+                    length, = _read(file, _LENGTH)
+                    if file.tell() + length > size:
+                        break
+                    self.keyframes.append(Keyframe(tick, file.tell(), length))
+                    # Skip the snapshot.
+                    file.seek(length, os.SEEK_CUR)
+                else:
+                    self.events.append(Event(kind, tick, (x, y)))
+        self._event_ticks = [event.tick for event in self.events]
+
+    def keyframe_before(self, tick: int) -> Optional[Keyframe]:
+        """ Returns the latest keyframe which is not later than `tick` (`None` if there is no one). """
+        index = bisect.bisect_right([keyframe.tick for keyframe in self.keyframes], tick)
+        return self.keyframes[index - 1] if index > 0 else None
+
+    def read_keyframe(self, keyframe: Keyframe) -> bytes:
+        with open(self.path, 'rb') as file:
+            file.seek(keyframe.offset)
+            return file.read(keyframe.length)
+
+    def events_from(self, tick: int) -> List[Event]:
+        """ Returns events which happened at `tick` tick or later. """
+        return self.events[bisect.bisect_left(self._event_ticks, tick):]
+
+
+def _read(file, record: struct.Struct) -> tuple:
+    data = file.read(record.size)
+    if len(data) < record.size:
+        raise ReplayError('Recording is truncated.')
+    return record.unpack(data)
+
+
+def init_game(recording: Recording):
+    """ Initializes pygame and the game with `recording` settings and seed.
+    The game is replayed without rendering, so pygame gets a minimal (invisible) display. """
+    configs.VECTORIZED_MOVEMENT = recording.vectorized_movement
+    configs.FLOW_FIELD_NAVIGATION = recording.flow_field_navigation
+    random.seed(recording.seed)
+    # The module is imported by `play_game`, so dummy video driver is set only here.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    engine.init_game(recording.player_race, recording.player_name, recording.city_name, recording.enemy_race)
+
+
+def run(recording: Recording, until: int = None, use_keyframes: bool = True, report_every: int = 0) -> Dict:
+    """ Replays `recording` in the initialized game (see `init_game`) as fast as CPU allows
+    until `until` tick (i.e. before the tick input is handled) or the end of recording
+    (input of the last tick is handled then).
+    If `use_keyframes` is true, the game starts from the latest keyframe before `until`.
+    Returns run statistics. """
+
+    if recording.tick_rate != Game().clock.tick_rate:
+        raise ReplayError(f'Recording tick rate {recording.tick_rate} differs from game one.')
+    last_tick = recording.last_tick if until is None else min(until, recording.last_tick)
+    if use_keyframes:
+        keyframe = recording.keyframe_before(last_tick)
+        if keyframe is not None:
+            snapshot.loads(recording.read_keyframe(keyframe))
+    start_tick = Game().clock.ticks
+
+    events = recording.events_from(start_tick)
+    index = 0
+    finished = False
+    start_time = time.perf_counter()
+    while Game().clock.ticks < last_tick:
+        tick = Game().clock.ticks
+        while index < len(events) and events[index].tick == tick:
+            _apply(events[index])
+            index += 1
+        if not engine.tick():
+            finished = True
+            break
+        if report_every > 0 and Game().clock.ticks % report_every == 0:
+            print(f'tick {Game().clock.ticks}')
+    if until is None:
+        # Input of the last tick (e.g. camera moved after the last tick) is applied too.
+        while index < len(events) and events[index].tick == Game().clock.ticks:
+            _apply(events[index])
+            index += 1
+
+    elapsed = time.perf_counter() - start_time
+    ticks = Game().clock.ticks - start_tick
+    return {'start_tick': start_tick,
+            'ticks': ticks,
+            'last_tick': Game().clock.ticks,
+            'seconds': elapsed,
+            'ticks_per_second': ticks / elapsed if elapsed > 0 else 0.0,
+            'finished': finished}
+
+
+def _apply(event: Event):
+    if event.kind == CLICK:
+        click_handler.handle_click(event.pos)
+    elif event.kind == CAMERA:
+        Interface().camera.topleft = event.pos
+        Interface().minimap.move_frame(Interface().camera.topleft)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Replay recorded game without rendering.')
+    parser.add_argument('recording', help='recording file (see `play_game.py --record`)')
+    parser.add_argument('--until', type=int, default=None,
+                        help='stop before this tick (default: replay the whole recording)')
+    parser.add_argument('--no-keyframes', action='store_true',
+                        help='simulate from the first tick instead of the nearest keyframe')
+    parser.add_argument('--report-every', type=int, default=0,
+                        help='print current tick every N ticks (0 disables reports)')
+    return parser.parse_args()
+
+
+class ReplayError(Exception):
+    pass
+
+
+if __name__ == '__main__':
+    ARGS = _parse_args()
+    try:
+        RECORDING = Recording(ARGS.recording)
+    except (OSError, ReplayError) as error:
+        sys.exit(str(error))
+    init_game(RECORDING)
+    RESULT = run(RECORDING, ARGS.until, not ARGS.no_keyframes, ARGS.report_every)
+    print(f"Replayed ticks {RESULT['start_tick']}-{RESULT['last_tick']} "
+          f"({RESULT['ticks']} ticks) in {RESULT['seconds']:.2f}s, "
+          f"{RESULT['ticks_per_second']:.1f} ticks/s, game finished: {RESULT['finished']}")
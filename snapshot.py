@@ -0,0 +1,522 @@
+""" This module saves game state to bytes or files and restores it
+(see `dumps`/`loads` and `save`/`load`).
+Usage example:
+
+snapshot.save('game.lots')
+...
+snapshot.load('game.lots')
+
+State consists of game clock, empires (resources, army), objects (positions, health,
+movement, attack targets and cooldowns), AI and player's selection and camera.
+Objects images are not saved: restored objects get shared images from `image.SpriteAtlas`.
+The game must be initialized (see `engine.init_game`) before state is restored.
+
+Format: magic, version, header, names table (classes and kinds of objects),
+empires, then fixed-size records of all objects, followed by blocks of records
+of cities, mines, units and attack units (in objects order), AI, movement system
+and interface, then CRC32 of all previous bytes. Fixed-size records are stored contiguously,
+so a block is unpacked at once. All numbers are little-endian. """
+
+
+import os
+import sys
+import math
+import mmap
+import zlib
+import struct
+from array import array
+from typing import Dict, List, Text
+import pygame
+# project modules #
+import singleton
+import image as img
+import game_configs as configs
+from game import Game
+from ai import AI
+from game_objects import base_object, city
+from game_objects.buildings import mine
+from game_objects.units import unit, attack_unit
+from interface.interface_class import Interface
+
+
+MAGIC = b'LOTSSNAP'
+VERSION = 2
+
+_PREFIX = struct.Struct(f'<{len(MAGIC)}sH')
+# Clock ticks, next entity id, number of objects.
+_HEADER = struct.Struct('<III')
+# Empire resources.
+_EMPIRE = struct.Struct('<q')
+# Entity id, empire index, class name index, kind index, rect (x, y, width, height), health, cost.
+_OBJECT = struct.Struct('<IBHHiiiiii')
+# Reload, last mining time.
+_MINE = struct.Struct('<id')
+# Speed, real position, destination, navigation flag.
+_UNIT = struct.Struct('<dddddd?')
+# Damage, fight distance, attack delay, last attack time, target id (0 if there is no target).
+_ATTACK_UNIT = struct.Struct('<iiddI')
+# Main city id, units creation delay, last unit creation time, last targets planning time.
+_AI = struct.Struct('<Iddd')
+# Movement system capacity.
+_MOVEMENT = struct.Struct('<I')
+# Camera position, selected object id (0 if there is no one), selected command index (-1 if there is no one).
+_INTERFACE = struct.Struct('<iiIi')
+# Length of a list of ids or numbers.
+_COUNT = struct.Struct('<I')
+_TEXT_LENGTH = struct.Struct('<H')
+_FLAG = struct.Struct('<?')
+# CRC32 of the snapshot.
+_CHECKSUM = struct.Struct('<I')
+
+
+def dumps() -> bytes:
+    """ Returns current game state. """
+
+    game = Game()
+    writer = _Writer()
+    objects = sorted(game.registry, key=lambda obj: obj.entity_id)
+    writer.pack(_PREFIX, MAGIC, VERSION)
+    writer.pack(_HEADER, game.clock.ticks, game.registry.next_id, len(objects))
+
+    names: Dict[Text, int] = {}
+    for obj in objects:
+        names.setdefault(type(obj).__name__, len(names))
+        names.setdefault(obj.kind, len(names))
+    writer.texts(list(names))
+
+    empires = _empires()
+    for empire in empires:
+        writer.pack(_EMPIRE, empire.resources)
+        writer.ids(empire.army.units())
+
+    empire_indexes = {empire: i for i, empire in enumerate(empires)}
+    for obj in objects:
+        writer.pack(_OBJECT, obj.entity_id, empire_indexes[obj.empire], names[type(obj).__name__],
+                    names[obj.kind], *obj.rect, obj.health, obj.cost)
+    for obj in objects:
+        if isinstance(obj, city.City):
+            writer.text(obj.name)
+            writer.ids(obj.buildings)
+    for obj in objects:
+        if isinstance(obj, mine.Mine):
+            writer.pack(_MINE, obj.reload, obj.last_call_time)
+    for obj in objects:
+        if isinstance(obj, unit.Unit):
+            writer.pack(_UNIT, obj.speed.x, obj.speed.y, *obj.cur_real_pos, *obj.destination, obj._navigate)
+    for obj in objects:
+        if isinstance(obj, attack_unit.AttackUnit):
+            target = obj.attack_target.sprite
+            writer.pack(_ATTACK_UNIT, obj.damage, obj.fight_distance, obj.attack_delay,
+                        obj._last_attack_time, target.entity_id if target is not None else 0)
+
+    ai = _get_ai()
+    writer.flag(ai is not None)
+    if ai is not None:
+        previous_plan_time = ai.planner._previous_plan_time
+        writer.pack(_AI, ai.main_city.entity_id, ai._create_delay, ai._previous_unit_creation,
+                    math.nan if previous_plan_time is None else previous_plan_time)
+        for group in (ai.barracks, ai.mines, ai.scouts, ai.warriors):
+            writer.ids(group)
+
+    movement = game.movement
+    writer.flag(movement is not None)
+    if movement is not None:
+        capacity, units, free_slots = movement.layout()
+        writer.pack(_MOVEMENT, capacity)
+        writer.ids([unit_ for _, unit_ in units])
+        writer.integers([slot for slot, _ in units])
+        writer.integers(free_slots)
+
+    selected = Interface().selected_object.get()
+    command_index = Interface().selected_command_index()
+    writer.pack(_INTERFACE, *Interface().camera.topleft,
+                selected.entity_id if selected is not None else 0,
+                command_index if command_index is not None else -1)
+    data = writer.getvalue()
+    return data + _CHECKSUM.pack(zlib.crc32(data))
+
+
+def loads(data):
+    """ Replaces current game state with `data` state (bytes-like object returned by `dumps`).
+    Raises `SnapshotError` if `data` is not a snapshot of supported version or is damaged;
+    the current state is kept then. """
+
+    with _Reader(data) as reader:
+        try:
+            state = _read_state(reader)
+        except (struct.error, UnicodeDecodeError) as error:
+            raise SnapshotError(f'Snapshot is damaged: {error}.') from error
+    _validate(state)
+    _restore_state(state)
+
+
+def save(path: Text):
+    """ Writes current game state to `path` file. The file is replaced at once,
+    so an interrupted save does not spoil the previous one. """
+    data = dumps()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def load(path: Text):
+    """ Restores game state from `path` file (written by `save`).
+    The file is mapped into memory instead of being read into a buffer. """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise SnapshotError(f'{path} is empty.')
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            loads(data)
+
+
+def _empires() -> List:
+    return [Game().player_emp, Game().enemy_emp]
+
+
+def _get_ai():
+    """ Returns AI if it has been initialized. """
+    return singleton.Singleton._instance.get(AI)
+
+
+def _object_classes() -> Dict[Text, type]:
+    """ Returns all game objects classes by their names. """
+    classes = {}
+    stack = [base_object.GameObject]
+    while stack:
+        cls = stack.pop()
+        classes[cls.__name__] = cls
+        stack += cls.__subclasses__()
+    return classes
+
+
+def _read_state(reader: '_Reader') -> Dict:
+    """ Reads the whole `reader` snapshot. Objects are not created here, so a damaged snapshot
+    is detected before the current state is changed. """
+
+    magic, version = reader.unpack(_PREFIX)
+    if magic != MAGIC:
+        raise SnapshotError('Data is not a game snapshot.')
+    if version != VERSION:
+        raise SnapshotError(f'Snapshot version {version} is not supported (expected {VERSION}).')
+    if not reader.check_crc():
+        raise SnapshotError('Snapshot is damaged: checksum does not match.')
+    state = {}
+    state['ticks'], state['next_id'], objects_number = reader.unpack(_HEADER)
+    names = reader.texts()
+    state['empires'] = [(reader.unpack(_EMPIRE)[0], reader.ids()) for _ in _empires()]
+
+    classes = _object_classes()
+    records = []
+    for entity_id, empire, class_index, kind_index, x, y, width, height, health, cost \
+            in reader.records(_OBJECT, objects_number):
+        if class_index >= len(names) or kind_index >= len(names):
+            raise SnapshotError(f'Object {entity_id} refers to a missing name.')
+        if empire >= len(state['empires']):
+            raise SnapshotError(f'Object {entity_id} refers to a missing empire.')
+        cls = classes.get(names[class_index])
+        if cls is None:
+            raise SnapshotError(f'Unknown object class {names[class_index]}.')
+        records.append({'id': entity_id, 'empire': empire, 'class': cls, 'kind': names[kind_index],
+                        'rect': (x, y, width, height), 'health': health, 'cost': cost})
+
+    for record in _of_class(records, city.City):
+        record['name'] = reader.text()
+        record['buildings'] = reader.ids()
+    mines = _of_class(records, mine.Mine)
+    for record, values in zip(mines, reader.records(_MINE, len(mines))):
+        record['reload'], record['last_call_time'] = values
+    units = _of_class(records, unit.Unit)
+    for record, values in zip(units, reader.records(_UNIT, len(units))):
+        record['speed'], record['pos'] = values[0:2], list(_as_point(values[2:4]))
+        record['destination'], record['navigate'] = _as_point(values[4:6]), values[6]
+    attack_units = _of_class(records, attack_unit.AttackUnit)
+    for record, values in zip(attack_units, reader.records(_ATTACK_UNIT, len(attack_units))):
+        (record['damage'], record['fight_distance'], record['attack_delay'],
+         record['last_attack_time'], record['target']) = values
+    state['objects'] = records
+
+    state['ai'] = None
+    if reader.flag():
+        state['ai'] = (reader.unpack(_AI), [reader.ids() for _ in range(4)])
+    state['movement'] = None
+    if reader.flag():
+        state['movement'] = (reader.unpack(_MOVEMENT)[0], reader.ids(), reader.integers(), reader.integers())
+    state['interface'] = reader.unpack(_INTERFACE)
+    return state
+
+
+def _validate(state: Dict):
+    """ Checks that objects of `state` can be created and references between them are consistent,
+    so `_restore_state` does not fail after the current state has been cleared.
+    Raises `SnapshotError` otherwise. """
+
+    records = {}
+    for record in state['objects']:
+        if record['id'] == 0 or record['id'] in records:
+            raise SnapshotError(f"Object id {record['id']} is not unique.")
+        records[record['id']] = record
+    if records and state['next_id'] <= max(records):
+        raise SnapshotError(f"Next object id {state['next_id']} is already used.")
+    units = {entity_id for entity_id, record in records.items() if issubclass(record['class'], unit.Unit)}
+    empires = _empires()
+
+    def check(ids, allowed, what: Text):
+        for entity_id in ids:
+            if entity_id not in allowed:
+                raise SnapshotError(f'{what} refers to a missing object {entity_id}.')
+
+    for record in records.values():
+        width, height = record['rect'][2:]
+        if not (0 < width <= configs.MAP_WIDTH and 0 < height <= configs.MAP_HEIGHT):
+            raise SnapshotError(f"Object {record['id']} has wrong size {width}x{height}.")
+        if not hasattr(img.get_image(empires[record['empire']]), record['kind']):
+            raise SnapshotError(f"Object {record['id']} has unknown kind {record['kind']}.")
+        if record.get('reload', 1) <= 0:
+            raise SnapshotError(f"Mine {record['id']} has wrong reload {record['reload']}.")
+        check(record.get('buildings', ()), records.keys() - units, f"City {record['id']}")
+        if record.get('target'):
+            check([record['target']], records, f"Unit {record['id']}")
+    for _, army in state['empires']:
+        check(army, units, 'Army')
+
+    if state['ai'] is not None:
+        if _get_ai() is None:
+            raise SnapshotError('Snapshot has AI state, but the game has no AI.')
+        (main_city_id, *_), (barracks, mines, scouts, warriors) = state['ai']
+        main_city = records.get(main_city_id)
+        if main_city is None or not issubclass(main_city['class'], city.City):
+            raise SnapshotError(f'AI main city {main_city_id} is missing.')
+        check(barracks + mines, records.keys() - units, 'AI')
+        check(scouts + warriors, units, 'AI')
+    if state['movement'] is not None:
+        capacity, ids, slots, free_slots = state['movement']
+        check(ids, units, 'Movement system')
+        if len(ids) != len(slots) or any(slot >= capacity for slot in slots + free_slots):
+            raise SnapshotError('Movement system slots are damaged.')
+    _, _, selected_id, command_index = state['interface']
+    if selected_id:
+        check([selected_id], records, 'Selection')
+    # Only commands of player's objects are shown.
+    if command_index < -1 or command_index >= 0 and (not selected_id or records[selected_id]['empire'] != 0):
+        raise SnapshotError(f'Selected command {command_index} is not shown.')
+
+
+def _of_class(records: List[Dict], cls: type) -> List[Dict]:
+    return [record for record in records if issubclass(record['class'], cls)]
+
+
+def _restore_state(state: Dict):
+    game = Game()
+    registry = game.registry
+    empires = _empires()
+    records = state['objects']
+
+    _clear()
+    # Temporary ids of created objects must not collide with saved ones.
+    registry.next_id = max([record['id'] for record in records], default=0) + 1
+    for empire in empires:
+        # Objects cost is paid back below.
+        empire.resources = math.inf
+    for record in records:
+        _create_object(empires[record['empire']], record)
+
+    for record in records:
+        obj = registry.get(record['id'])
+        if 'buildings' in record:
+            obj.buildings.add(*[registry.get(entity_id) for entity_id in record['buildings']])
+        if record.get('target'):
+            obj.attack_target.add(registry.get(record['target']))
+    for empire, (resources, army) in zip(empires, state['empires']):
+        empire.resources = resources
+        for entity_id in army:
+            empire.army.recruit_unit(registry.get(entity_id))
+
+    if state['ai'] is not None:
+        _restore_ai(*state['ai'])
+    if state['movement'] is not None and game.movement is not None:
+        capacity, ids, slots, free_slots = state['movement']
+        game.movement.restore_layout(capacity, [(slot, registry.get(entity_id))
+                                                for slot, entity_id in zip(slots, ids)], free_slots)
+    registry.next_id = state['next_id']
+    game.clock.set_ticks(state['ticks'])
+    game.proximity.invalidate()
+    if game.navigation is not None:
+        game.navigation.invalidate()
+
+    camera_x, camera_y, selected_id, command_index = state['interface']
+    Interface().camera.topleft = (camera_x, camera_y)
+    Interface().minimap.move_frame(Interface().camera.topleft)
+    Interface().restore_selection(registry.get(selected_id) if selected_id else None,
+                                  command_index if command_index >= 0 else None)
+
+
+def _create_object(empire, record: Dict):
+    """ Creates object of `record` class and sets its state from `record`. """
+
+    cls = record['class']
+    size = record['rect'][2:]
+    if issubclass(cls, unit.Unit):
+        obj = cls(empire)
+    elif issubclass(cls, city.City):
+        obj = cls(name=record['name'], health=record['health'], cost=record['cost'],
+                  kind=record['kind'], size=size, empire=empire)
+    elif issubclass(cls, mine.Mine):
+        obj = cls(empire=empire, health=record['health'], cost=record['cost'],
+                  kind=record['kind'], size=size, reload=record['reload'])
+    else:
+        obj = cls(empire=empire, health=record['health'], cost=record['cost'], kind=record['kind'], size=size)
+
+    Game().registry.reassign(obj, record['id'])
+    obj.rect = pygame.Rect(record['rect'])
+    obj.update_position()
+    obj.health = record['health']
+    obj.cost = record['cost']
+    if isinstance(obj, mine.Mine):
+        obj.last_call_time = record['last_call_time']
+    if isinstance(obj, unit.Unit):
+        obj.speed = pygame.math.Vector2(record['speed'])
+        obj.cur_real_pos = record['pos']
+        obj.destination = record['destination']
+        obj._navigate = record['navigate']
+    if isinstance(obj, attack_unit.AttackUnit):
+        obj.damage = record['damage']
+        obj.fight_distance = record['fight_distance']
+        obj.attack_delay = record['attack_delay']
+        obj._last_attack_time = record['last_attack_time']
+    return obj
+
+
+def _restore_ai(state, groups: List[List[int]]):
+    main_city_id, create_delay, previous_unit_creation, previous_plan_time = state
+    registry = Game().registry
+    ai = _get_ai()
+    ai.main_city = registry.get(main_city_id)
+    ai._create_delay = create_delay
+    ai._previous_unit_creation = previous_unit_creation
+    # Plans made for the replaced state must not be applied.
+    ai.planner.reset()
+    ai.planner._previous_plan_time = None if math.isnan(previous_plan_time) else previous_plan_time
+    for group, ids in zip((ai.barracks, ai.mines, ai.scouts, ai.warriors), groups):
+        group.empty()
+        group.add(*[registry.get(entity_id) for entity_id in ids])
+
+
+def _clear():
+    """ Removes all objects from the game. """
+    Interface().remove_all_info()
+    for obj in Game().registry:
+        obj.kill()
+
+
+def _as_point(values):
+    """ Converts whole coordinates back to integers, so restored points equal saved ones. """
+    return tuple(int(value) if value.is_integer() else value for value in values)
+
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class _Writer:
+    def __init__(self):
+        self._parts = []
+
+    def pack(self, record: struct.Struct, *values):
+        self._parts.append(record.pack(*values))
+
+    def text(self, text: Text):
+        encoded = text.encode()
+        self._parts.append(_TEXT_LENGTH.pack(len(encoded)))
+        self._parts.append(encoded)
+
+    def texts(self, texts: List[Text]):
+        self._parts.append(_COUNT.pack(len(texts)))
+        for text in texts:
+            self.text(text)
+
+    def ids(self, objects):
+        self.integers([obj.entity_id for obj in objects])
+
+    def integers(self, values: List[int]):
+        self._parts.append(_COUNT.pack(len(values)))
+        self._parts.append(_to_little_endian(array('I', values)).tobytes())
+
+    def flag(self, value: bool):
+        self._parts.append(_FLAG.pack(value))
+
+    def getvalue(self) -> bytes:
+        return b''.join(self._parts)
+
+
+class _Reader:
+    """ Reads snapshot values one by one. Data is not copied (e.g. a memory-mapped file
+    is read in place), so the reader must be closed before the data is released. """
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        # Data values are read from (without the checksum, once it is checked).
+        self._data = self._view
+        self._offset = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._data.release()
+        self._view.release()
+        return False
+
+    def check_crc(self) -> bool:
+        """ Returns true if the checksum at the end matches all previous data.
+        The checksum is not read as a value then. """
+        end = len(self._view) - _CHECKSUM.size
+        if end < self._offset:
+            return False
+        expected, = _CHECKSUM.unpack_from(self._view, end)
+        self._data = self._view[:end]
+        return zlib.crc32(self._data) == expected
+
+    def unpack(self, record: struct.Struct) -> tuple:
+        values = record.unpack_from(self._data, self._offset)
+        self._offset += record.size
+        return values
+
+    def records(self, record: struct.Struct, number: int) -> List[tuple]:
+        """ Reads `number` contiguous `record` records at once. """
+        with self._chunk(record.size * number) as chunk:
+            return list(record.iter_unpack(chunk))
+
+    def text(self) -> Text:
+        length, = self.unpack(_TEXT_LENGTH)
+        with self._chunk(length) as chunk:
+            return str(chunk, 'utf-8')
+
+    def texts(self) -> List[Text]:
+        return [self.text() for _ in range(self.unpack(_COUNT)[0])]
+
+    def ids(self) -> List[int]:
+        return self.integers()
+
+    def integers(self) -> List[int]:
+        length, = self.unpack(_COUNT)
+        values = array('I')
+        with self._chunk(values.itemsize * length) as chunk:
+            values.frombytes(chunk)
+        return _to_little_endian(values).tolist()
+
+    def flag(self) -> bool:
+        return self.unpack(_FLAG)[0]
+
+    def _chunk(self, size: int) -> memoryview:
+        if self._offset + size > len(self._data):
+            raise struct.error(f'{size} bytes are expected at offset {self._offset}')
+        chunk = self._data[self._offset:self._offset + size]
+        self._offset += size
+        return chunk
+
+
+class SnapshotError(Exception):
+    pass
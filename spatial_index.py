@@ -0,0 +1,138 @@
+""" This module contains `SpatialGroup` - a sprite group with uniform grid spatial index. """
+
+
+from typing import Dict, List, Optional, Set, Tuple
+import pygame
+
+
+class SpatialGroup(pygame.sprite.RenderUpdates):
+    """ A sprite group which keeps its sprites in a uniform grid of `cell_size` square cells.
+    It lets to find sprites located within a rect or under a point in time proportional
+    to number of sprites nearby rather than to the group size.
+    Sprite which has changed its position must be reindexed (see `reindex`). """
+
+    def __init__(self, cell_size: int, *sprites):
+        self.cell_size = cell_size
+        # Cell coordinates -> sprites which intersect the cell.
+        self._cells: Dict[Tuple[int, int], Set[pygame.sprite.Sprite]] = {}
+        # Sprite -> range of cells (left, top, right, bottom) it is indexed in.
+        self._sprite_cells: Dict[pygame.sprite.Sprite, Tuple[int, int, int, int]] = {}
+        # Sprite -> number which shows order sprites have been added in.
+        # It is used to return sprites in group (i.e. drawing) order.
+        self._order: Dict[pygame.sprite.Sprite, int] = {}
+        self._added = 0
+        pygame.sprite.RenderUpdates.__init__(self, *sprites)
+
+    # `pygame.sprite.AbstractGroup` methods. They are called on every add/remove/kill.
+    def add_internal(self, sprite, *args):
+        pygame.sprite.RenderUpdates.add_internal(self, sprite, *args)
+        self._order[sprite] = self._added
+        self._added += 1
+        self._insert(sprite)
+
+    def remove_internal(self, sprite):
+        pygame.sprite.RenderUpdates.remove_internal(self, sprite)
+        self._erase(sprite)
+        del self._order[sprite]
+
+    def reindex(self, sprite: pygame.sprite.Sprite):
+        """ Moves `sprite` to cells which correspond to its current rect.
+        Must be called after sprite position is changed. """
+        if sprite not in self._sprite_cells:
+            return
+        if self._sprite_cells[sprite] != self._cells_range(sprite.rect):
+            self._erase(sprite)
+            self._insert(sprite)
+
+    def reindex_all(self):
+        """ Reindexes all sprites of the group. """
+        for sprite in self._sprite_cells.copy():
+            self.reindex(sprite)
+
+    def sprites_in_rect(self, rect: pygame.Rect) -> List[pygame.sprite.Sprite]:
+        """ Returns sprites which collide with `rect` in group order. """
+        left, top, right, bottom = self._cells_range(rect)
+        candidates = set()
+        for col in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                cell = self._cells.get((col, row))
+                if cell:
+                    candidates.update(cell)
+        result = [sprite for sprite in candidates if rect.colliderect(sprite.rect)]
+        result.sort(key=self._order.__getitem__)
+        return result
+
+    def sprites_at_point(self, pos: Tuple[int, int]) -> List[pygame.sprite.Sprite]:
+        """ Returns sprites which contain `pos` point in group order. """
+        cell = self._cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size), ())
+        result = [sprite for sprite in cell if sprite.rect.collidepoint(pos)]
+        result.sort(key=self._order.__getitem__)
+        return result
+
+    def is_free(self, rect: pygame.Rect) -> bool:
+        """ Returns true if no sprite collides with `rect`. """
+        left, top, right, bottom = self._cells_range(rect)
+        for col in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                for sprite in self._cells.get((col, row), ()):
+                    if rect.colliderect(sprite.rect):
+                        return False
+        return True
+
+    def find_free_rect(self, rect: pygame.Rect, max_distance: int, step: int = None,
+                       bounds: pygame.Rect = None) -> Optional[pygame.Rect]:
+        """ Returns the nearest to `rect` rect of the same size which collides with no sprite
+        (and is inside `bounds` if they are specified).
+        Candidates are checked ring by ring around `rect` with `step` step
+        (half of `rect` smaller side by default) up to `max_distance` distance.
+        Returns `None` if there is no free place. """
+
+        if step is None:
+            step = max(min(rect.size) // 2, 1)
+        candidate = rect.copy()
+        for ring in range(max_distance // step + 1):
+            for d_x, d_y in _ring_offsets(ring):
+                candidate.topleft = (rect.x + d_x * step, rect.y + d_y * step)
+                if bounds is not None and not bounds.contains(candidate):
+                    continue
+                if self.is_free(candidate):
+                    return candidate
+        return None
+
+    def _cells_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """ Returns range of cells (left, top, right, bottom) `rect` intersects. """
+        return (rect.left // self.cell_size,
+                rect.top // self.cell_size,
+                (rect.right - 1) // self.cell_size if rect.width > 0 else rect.left // self.cell_size,
+                (rect.bottom - 1) // self.cell_size if rect.height > 0 else rect.top // self.cell_size)
+
+    def _insert(self, sprite: pygame.sprite.Sprite):
+        cells_range = self._cells_range(sprite.rect)
+        left, top, right, bottom = cells_range
+        for col in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                self._cells.setdefault((col, row), set()).add(sprite)
+        self._sprite_cells[sprite] = cells_range
+
+    def _erase(self, sprite: pygame.sprite.Sprite):
+        left, top, right, bottom = self._sprite_cells.pop(sprite)
+        for col in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                cell = self._cells[(col, row)]
+                cell.discard(sprite)
+                if not cell:
+                    del self._cells[(col, row)]
+
+
+# Ring number -> offsets of its cells.
+_RINGS: Dict[int, List[Tuple[int, int]]] = {}
+
+
+def _ring_offsets(ring: int) -> List[Tuple[int, int]]:
+    """ Returns offsets of `ring` square ring around (0, 0) cell, the nearest to center first. """
+    if ring not in _RINGS:
+        offsets = [(d_x, d_y) for d_x in range(-ring, ring + 1) for d_y in range(-ring, ring + 1)
+                   if max(abs(d_x), abs(d_y)) == ring]
+        offsets.sort(key=lambda offset: offset[0] ** 2 + offset[1] ** 2)
+        _RINGS[ring] = offsets
+    return _RINGS[ring]
@@ -1,3 +1,3 @@
 #!/bin/bash
 
-python -m cProfile -s cumtime tests/stress_tests/stress_test.py
+python -m cProfile -s cumtime -m tests.stress_tests.stress_test
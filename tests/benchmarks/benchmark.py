@@ -0,0 +1,281 @@
+"""This script is executed with 'benchmark.sh', which is located
+in root project directory because it's impossible to import upper level modules.
+
+It runs microbenchmarks of hot paths (unit movement, batched movement step, minimap update,
+objects drawing, click handling) and scenario benchmarks (whole ticks with rendering) at different
+numbers of units under SDL dummy video driver, and writes results as JSON.
+
+Every benchmark runs in a separate process since the game is built on singletons
+and peak memory usage is measured per process.
+Units are smaller than in the game (see `--unit-size`), so 10 000 of them fit the map. """
+
+
+import os
+# Benchmarks do not need a real display.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import multiprocessing
+from typing import Callable, Dict, List
+try:
+    import resource
+except ImportError:
+    resource = None
+import pygame
+
+
+MICROBENCHMARKS = ('unit_move', 'minimap_update', 'place_objects_on_display', 'handle_click')
+# Batched movement step is benchmarked with its own number of units and always with vectorized movement.
+MOVEMENT_STEP = 'movement_step'
+SCENARIO = 'scenario'
+
+
+def run_benchmark(name: str, units: int, samples: int, unit_size: int, seed: int) -> Dict:
+    """ Runs `name` benchmark with `units` units and returns its results. """
+
+    _set_unit_size(unit_size)
+    # Project modules are imported after unit size is set since some settings are computed at import.
+    import game_configs as configs
+    if name == MOVEMENT_STEP:
+        configs.VECTORIZED_MOVEMENT = True
+    import engine
+    from game import Game
+    from display import Display
+    from profiler import timing_statistics
+
+    pygame.init()
+    screen = pygame.display.set_mode(configs.SCR_SIZE)
+    player_empire, enemy_empire = engine.init_game()
+    Display(screen)
+    rng = random.Random(seed)
+    game_units = _spawn_units(units, rng)
+
+    if name == SCENARIO:
+        times, tick_times = _run_scenario(screen, samples)
+        result = {'ticks_per_second': len(tick_times) / sum(tick_times) if sum(tick_times) > 0 else 0.0,
+                  'frames_per_second': len(times) / sum(times) if sum(times) > 0 else 0.0}
+    else:
+        times = _MICROBENCHMARKS[name](game_units, samples, rng)
+        result = {'calls_per_second': len(times) / sum(times) if sum(times) > 0 else 0.0}
+
+    result.update({'name': name,
+                   'units': len(game_units),
+                   'objects': len(Game().objects),
+                   'samples': len(times),
+                   'time_ms': timing_statistics(times),
+                   'peak_rss_mb': _peak_rss_mb()})
+    return result
+
+
+def _set_unit_size(unit_size: int):
+    """ Changes units sizes and settings which depend on them. """
+    from game_objects import game_objects_configs as configs
+    size = (unit_size, unit_size)
+    configs.BUILDER_SIZE = configs.SCOUT_SIZE = configs.WARRIOR_SIZE = size
+    configs.SPATIAL_INDEX_CELL_SIZE = 2 * unit_size
+    configs.NAVIGATION_CLEARANCE = unit_size // 2
+
+
+def _spawn_units(number: int, rng: random.Random) -> List:
+    """ Creates `number` units at random free places: half of them are player warriors
+    which go to enemy city and half are enemy scouts which go to player city. """
+
+    from game import Game
+    from world_map import Map
+    from game_objects.units import scout, warrior
+
+    game = Game()
+    player_city = next(iter(game.player_emp.cities))
+    enemy_city = next(iter(game.enemy_emp.cities))
+    game.player_emp.resources = game.enemy_emp.resources = 10 ** 9
+    units = []
+    for i in range(number):
+        unit = warrior.OrcWarrior(game.player_emp) if i % 2 == 0 else scout.DwarfScout(game.enemy_emp)
+        rect = pygame.Rect((rng.randrange(Map().rect.width), rng.randrange(Map().rect.height)),
+                           unit.rect.size)
+        free_rect = game.objects.find_free_rect(rect, Map().rect.width, bounds=Map().rect)
+        if free_rect is None:
+            unit.kill()
+            break
+        unit.rect = free_rect
+        unit.update_position()
+        unit.empire.army.recruit_unit(unit)
+        unit.set_move_to(enemy_city.rect.center if unit.empire is game.player_emp else player_city.rect.center)
+        units.append(unit)
+    return units
+
+
+def _run_scenario(screen: pygame.Surface, ticks: int):
+    """ Plays `ticks` ticks rendering every one. Returns frame and tick durations. """
+
+    import game_configs as configs
+    import engine
+    import renderer
+
+    frame_renderer = renderer.create_renderer(screen, configs.DIRTY_RECT_RENDERING)
+    frame_times, tick_times = [], []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        if not engine.tick():
+            break
+        tick_end = time.perf_counter()
+        pygame.display.update(frame_renderer.render())
+        end = time.perf_counter()
+        tick_times.append(tick_end - start)
+        frame_times.append(end - start)
+    return frame_times, tick_times
+
+
+def _bench_unit_move(units: List, samples: int, rng: random.Random) -> List[float]:
+    """ Times `Unit.move` of every unit during `samples` ticks. """
+    import engine
+    times = []
+    for _ in range(samples):
+        for unit in units:
+            if not unit.alive():
+                continue
+            start = time.perf_counter()
+            unit.move()
+            times.append(time.perf_counter() - start)
+        engine.tick()
+    return times
+
+
+def _bench_movement_step(units: List, samples: int, rng: random.Random) -> List[float]:
+    """ Times batched movement step of all units (see `movement.MovementSystem`) during `samples` ticks. """
+    import engine
+    from game import Game
+    times = []
+    for _ in range(samples):
+        engine.update_objects()
+        start = time.perf_counter()
+        Game().movement.step(Game().objects, Game().navigation)
+        times.append(time.perf_counter() - start)
+        Game().registry.flush()
+        Game().clock.tick()
+    return times
+
+
+def _bench_minimap_update(units: List, samples: int, rng: random.Random) -> List[float]:
+    """ Times minimap update during `samples` ticks. """
+    import engine
+    from interface.interface_class import Interface
+    minimap = Interface().minimap
+    return _time_between_ticks(minimap.action_while_update, samples, engine.tick)
+
+
+def _bench_place_objects_on_display(units: List, samples: int, rng: random.Random) -> List[float]:
+    """ Times drawing of visible objects while camera looks at the map center. """
+    import engine
+    import renderer
+    from world_map import Map
+    from interface.interface_class import Interface
+    Interface().camera.center = Map().rect.center
+    return _time_between_ticks(renderer.place_objects_on_display, samples, engine.tick)
+
+
+def _bench_handle_click(units: List, samples: int, rng: random.Random) -> List[float]:
+    """ Times clicks at random screen positions while camera looks at the map center. """
+    import engine
+    import game_configs as configs
+    from world_map import Map
+    from interface.interface_class import Interface
+    from interface import click_handler
+    Interface().camera.center = Map().rect.center
+
+    def click():
+        click_handler.handle_click((rng.randrange(configs.SCR_WIDTH), rng.randrange(configs.SCR_HEIGHT)))
+    return _time_between_ticks(click, samples, engine.tick)
+
+
+def _time_between_ticks(function: Callable, samples: int, tick: Callable) -> List[float]:
+    """ Calls `function` `samples` times advancing the game between calls. Returns calls durations. """
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        tick()
+    return times
+
+
+_MICROBENCHMARKS = {'unit_move': _bench_unit_move,
+                    MOVEMENT_STEP: _bench_movement_step,
+                    'minimap_update': _bench_minimap_update,
+                    'place_objects_on_display': _bench_place_objects_on_display,
+                    'handle_click': _bench_handle_click}
+
+
+def _peak_rss_mb() -> float:
+    """ Returns peak resident memory of the process in megabytes (0 if unknown). """
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _environment() -> Dict:
+    import game_configs as configs
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pygame': pygame.version.ver,
+            'numpy': numpy_version,
+            'dirty_rect_rendering': configs.DIRTY_RECT_RENDERING,
+            'vectorized_movement': configs.VECTORIZED_MOVEMENT,
+            'flow_field_navigation': configs.FLOW_FIELD_NAVIGATION}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Run game benchmarks.')
+    parser.add_argument('--only', nargs='+', choices=MICROBENCHMARKS + (MOVEMENT_STEP, SCENARIO),
+                        default=MICROBENCHMARKS + (MOVEMENT_STEP, SCENARIO), help='benchmarks to run')
+    parser.add_argument('--scenario-units', type=int, nargs='+', default=[100, 1000, 5000, 10000],
+                        help='numbers of units scenario benchmark is run with')
+    parser.add_argument('--micro-units', type=int, default=1000,
+                        help='number of units microbenchmarks are run with')
+    parser.add_argument('--movement-units', type=int, default=10000,
+                        help='number of units batched movement step benchmark is run with')
+    parser.add_argument('--samples', type=int, default=100,
+                        help='number of ticks every benchmark is run for')
+    parser.add_argument('--unit-size', type=int, default=30, help='side of units in pixels')
+    parser.add_argument('--seed', type=int, default=0, help='seed of units placement')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file to write results to')
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    runs = [(name, args.micro_units) for name in args.only if name in MICROBENCHMARKS]
+    if MOVEMENT_STEP in args.only:
+        runs.append((MOVEMENT_STEP, args.movement_units))
+    if SCENARIO in args.only:
+        runs += [(SCENARIO, units) for units in args.scenario_units]
+
+    results = []
+    # Every benchmark is run in a new process (see module docstring).
+    context = multiprocessing.get_context('spawn')
+    for name, units in runs:
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            result = pool.apply(run_benchmark, (name, units, args.samples, args.unit_size, args.seed))
+        results.append(result)
+        print(f"{name:<26} units: {result['units']:>6}  "
+              f"p50: {result['time_ms']['p50']:8.3f} ms  p99: {result['time_ms']['p99']:8.3f} ms  "
+              f"peak RSS: {result['peak_rss_mb']:7.1f} MB")
+
+    with open(args.output, 'w') as file:
+        json.dump({'environment': _environment(), 'settings': vars(args), 'results': results}, file, indent=2)
+    print(f'Results are written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
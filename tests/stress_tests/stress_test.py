@@ -1,22 +1,21 @@
-"""This script is executed with 'stress_test_statistic', which is located
-in root project directory because it's impossible to import upper level modules"""
+"""This script is executed with 'stress_test.sh', which is located
+in root project directory because it's impossible to import upper level modules.
+It plays the game against `StressAI` which creates units as fast as it can."""
 
 
 import pygame
 # project modules #
+import game_configs as configs
+import engine
 from game import Game
-from game_objects import empire, races, world_map
 from tests.stress_tests.stress_AI import StressAI
-from interface.interface import Interface, get_global_mouse_pos
-import configs
-import user_configs
+from interface.interface_class import Interface
+from interface import click_handler
+from display import Display
+import renderer
 import image as img
 
 
-def clear_callback(surf, rect):
-    surf.fill(world_map.Map().color, rect)
-
-
 def play_game():
     # pygame initialization start
     pygame.init()
@@ -31,25 +30,14 @@ def play_game():
     # pygame initialization finish
 
     # game objects initialization start
-    player_empire = empire.Empire(user_configs.EMPIRE_RACE, name=user_configs.EMPIRE_NAME, start_resources=1000)
-    enemy_empire = empire.Empire(races.DWARFS, name='Durden', start_resources=1000)
-
-    game = Game(player_empire, enemy_empire)
-    interface = Interface(player_empire, enemy_empire)
-
-    player_empire.set_city("Nevborn")
-    player_default_city = player_empire.get_city("Nevborn")
-    player_default_city.rect.x = 500
-    player_default_city.rect.centery = world_map.Map().rect.centery
-
-    enemy_empire.set_city("Nuhen")
-    enemy_default_city = enemy_empire.get_city("Nuhen")
-    enemy_default_city.rect.right = world_map.Map().rect.right - 700
-    enemy_default_city.rect.centery = world_map.Map().rect.centery
+    # The world is the one `play_game` and `headless` play, but enemy is played by `StressAI`.
+    player_empire, enemy_empire = engine.init_game(enemy_ai=False)
+    player_empire.resources = enemy_empire.resources = 1000
     StressAI(enemy_empire)
-    # game objects initialization start
+    Display(screen)
+    frame_renderer = renderer.create_renderer(screen, configs.DIRTY_RECT_RENDERING)
+    # game objects initialization finish
 
-    rendered = None
     while True:
         mouse_pressed = False
 
@@ -65,36 +53,19 @@ def play_game():
         mouse_pos = pygame.mouse.get_pos()
 
         if mouse_pressed:
-            handled = False
-            # check if any of interface windows can handle click
-            if interface.handle_interface_click(mouse_pos):
-                handled = True
-            else:
-                for obj in game.objects:
-                    # check if any of game objects can handle click
-                    if obj.handle_click(get_global_mouse_pos(mouse_pos)):
-                        handled = True
-            if not handled:
-                interface.handle_empty_click(mouse_pos)
+            click_handler.handle_click(mouse_pos)
 
         # AI is singleton, which has initialized before
         StressAI().play_step()
-
         # If any of empires is out of cities, finish the game
-        if not player_empire.alive() or not enemy_empire.alive():
+        if not engine.tick(ai=False):
             return
 
-        interface.move_view(key, mouse_pos)
-        # place objects on map
-        if rendered is not None:
-            game.objects.clear(world_map.Map().image, clear_callback)
-        game.objects.update()
-        rendered = game.objects.draw(world_map.Map().image)
-        interface.draw_interface(screen)
+        Interface().move_view(key, mouse_pos)
         # show screen
-        pygame.display.flip()
+        pygame.display.update(frame_renderer.render())
         # cap the framerate
-        clock.tick(50)
+        clock.tick(Game().clock.frame_rate())
 
 
 play_game()
@@ -0,0 +1,55 @@
+import os
+import unittest
+import pygame
+from game import Game
+from game_objects import races, empire, army
+from game_objects.units import scout, warrior, unit
+from interface.interface_class import Interface
+
+
+class TestArmyIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.DWARFS, start_resources=1000)
+        self.other_empire = empire.Empire(races.ELVES)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.army = self.empire.army
+        self.scouts = [scout.DwarfScout(self.empire) for _ in range(3)]
+        self.warrior = warrior.DwarfWarrior(self.empire)
+        for unit_ in self.scouts + [self.warrior]:
+            self.army.recruit_unit(unit_)
+
+    def test_counts(self):
+        self.assertEqual(self.army.size(), 4)
+        self.assertEqual(self.army.count(scout.Scout), 3)
+        self.assertEqual(self.army.count(warrior.Warrior), 1)
+        self.assertEqual(self.army.count(unit.Unit), 4)
+
+    def test_get_leaf(self):
+        leaf = self.army.get_leaf(self.warrior.entity_id)
+        self.assertIs(leaf.get_unit(), self.warrior)
+        self.assertIn(self.warrior, self.army)
+
+    def test_remove_group(self):
+        self.army.remove_group(army.ArmyLeaf(self.warrior))
+        self.assertEqual(self.army.size(), 4)
+        self.army.remove_group(self.army.get_leaf(self.warrior.entity_id))
+        self.assertEqual(self.army.size(), 3)
+        self.assertNotIn(self.warrior, self.army)
+        self.assertEqual(self.army.count(warrior.Warrior), 0)
+
+    def test_dead_units_leave_army(self):
+        self.scouts[0].die()
+        self.assertEqual(self.army.size(), 4)
+        Game().registry.flush()
+        self.assertEqual(self.army.size(), 3)
+        self.assertIsNone(self.army.get_leaf(self.scouts[0].entity_id))
+        self.assertEqual(self.army.count(scout.Scout), 2)
+        self.assertEqual(sum(1 for component in self.army._army if not component.is_compound()), 3)
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
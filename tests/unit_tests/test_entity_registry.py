@@ -0,0 +1,56 @@
+import os
+import unittest
+import pygame
+from game import Game
+from game_objects import races, empire
+from game_objects.buildings import mine, wall
+from interface.interface_class import Interface
+
+
+class TestEntityRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ORCS, start_resources=1000)
+        self.other_empire = empire.Empire(races.ELVES, start_resources=1000)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.registry = Game().registry
+        self.city = self.empire.set_city(name='test city')
+        self.wall = self.city.build_wall((500, 500))
+        self.mine = self.city.build_mine((800, 800))
+        self.other_city = self.other_empire.set_city(name='other city')
+
+    def test_ids(self):
+        ids = {self.city.entity_id, self.wall.entity_id, self.mine.entity_id, self.other_city.entity_id}
+        self.assertEqual(len(ids), 4)
+        self.assertIs(self.registry.get(self.wall.entity_id), self.wall)
+        self.assertIn(self.mine, self.registry)
+
+    def test_views(self):
+        self.assertEqual(set(self.registry.of_empire(self.empire)), {self.city, self.wall, self.mine})
+        self.assertEqual(self.registry.of_kind(wall.Wall), [self.wall])
+        self.assertEqual(self.registry.of_kind(mine.Mine, self.other_empire), [])
+        self.assertEqual(len(self.registry.of_kind(type(self.city))), 2)
+
+    def test_deferred_kill(self):
+        self.wall.decrease_health(self.wall.health)
+        self.assertTrue(self.registry.is_pending_kill(self.wall))
+        self.assertIn(self.wall, Game().objects)
+        self.registry.flush()
+        self.assertFalse(self.registry.is_pending_kill(self.wall))
+        self.assertNotIn(self.wall, Game().objects)
+        self.assertNotIn(self.wall, self.registry)
+        self.assertNotIn(self.wall, self.city.buildings)
+        self.assertIsNone(self.registry.get(self.wall.entity_id))
+
+    def test_kill(self):
+        entity_id = self.mine.entity_id
+        self.mine.kill()
+        self.assertIsNone(self.registry.get(entity_id))
+        self.assertEqual(self.registry.of_kind(mine.Mine), [])
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
@@ -0,0 +1,34 @@
+import os
+import unittest
+import pygame
+from interface.fonts import Fonts
+
+
+class TestFonts(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        self.fonts = Fonts()
+        self.fonts.clear()
+
+    def test_font_is_shared(self):
+        self.assertIs(self.fonts.font('Ani', 30), self.fonts.font('Ani', 30))
+        self.assertIsNot(self.fonts.font('Ani', 30), self.fonts.font('Ani', 31))
+
+    def test_rendered_text_is_reused(self):
+        surface = self.fonts.render('text', pygame.Color('black'))
+        self.assertIs(self.fonts.render('text', (0, 0, 0)), surface)
+        self.assertIsNot(self.fonts.render('text', pygame.Color('red')), surface)
+        self.assertEqual(len(self.fonts), 2)
+
+    def test_least_recently_used_is_dropped(self):
+        first = self.fonts.render('0', pygame.Color('black'))
+        second = self.fonts.render('1', pygame.Color('black'))
+        for i in range(2, self.fonts.capacity):
+            self.fonts.render(str(i), pygame.Color('black'))
+        # Use the first text, so the second one becomes the least recently used.
+        self.assertIs(self.fonts.render('0', pygame.Color('black')), first)
+        self.fonts.render('new', pygame.Color('black'))
+        self.assertEqual(len(self.fonts), self.fonts.capacity)
+        self.assertIs(self.fonts.render('0', pygame.Color('black')), first)
+        self.assertIsNot(self.fonts.render('1', pygame.Color('black')), second)
@@ -0,0 +1,58 @@
+import time
+import asyncio
+import unittest
+from frame_scheduler import FrameScheduler, FrameSchedulerError
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = FrameScheduler()
+        self.calls = []
+
+    def _stop_after(self, runs: int, rate: float = 100):
+        def stop():
+            if self.scheduler.statistics()['stop']['runs'] + 1 >= runs:
+                self.scheduler.stop()
+        self.scheduler.add('stop', stop, rate)
+
+    def test_rates(self):
+        self.scheduler.add('fast', lambda: self.calls.append('fast'), 100)
+        self.scheduler.add('slow', lambda: self.calls.append('slow'), lambda: 20)
+        self._stop_after(20)
+        asyncio.run(self.scheduler.run())
+        # 0.2 seconds have passed.
+        self.assertTrue(10 <= self.calls.count('fast') <= 21)
+        self.assertTrue(2 <= self.calls.count('slow') <= 5)
+
+    def test_coroutine_task(self):
+        async def task():
+            await asyncio.sleep(0)
+            self.calls.append('task')
+        self.scheduler.add('task', task, 100)
+        self._stop_after(3)
+        asyncio.run(self.scheduler.run())
+        self.assertGreaterEqual(len(self.calls), 2)
+
+    def test_low_priority_task_is_postponed_but_not_starved(self):
+        def slow_task():
+            self.calls.append('low')
+            time.sleep(0.03)
+        # High priority task is due every 10 ms, so the slow task never fits between its runs.
+        self.scheduler.add('high', lambda: None, 100)
+        self.scheduler.add('low', slow_task, 20, low_priority=True)
+        self._stop_after(30)
+        asyncio.run(self.scheduler.run())
+        statistics = self.scheduler.statistics()['low']
+        self.assertGreaterEqual(statistics['runs'], 2)
+        self.assertGreater(statistics['postponed'], 0)
+
+    def test_exception_stops_scheduler(self):
+        def fail():
+            raise ValueError
+        self.scheduler.add('fail', fail, 100)
+        self.scheduler.add('other', lambda: self.calls.append('other'), 100)
+        self.assertRaises(ValueError, lambda: asyncio.run(self.scheduler.run()))
+
+    def test_names_are_unique(self):
+        self.scheduler.add('task', lambda: None, 1)
+        self.assertRaises(FrameSchedulerError, lambda: self.scheduler.add('task', lambda: None, 1))
@@ -0,0 +1,39 @@
+import unittest
+import game_clock
+
+
+class TestGameClock(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = game_clock.GameClock(tick_rate=50)
+
+    def test_default(self):
+        self.assertEqual(self.clock.ticks, 0)
+        self.assertEqual(self.clock.time(), 0)
+        self.assertEqual(self.clock.speed, 1)
+        self.assertEqual(self.clock.frame_rate(), 50)
+
+    def test_tick(self):
+        for _ in range(100):
+            self.clock.tick()
+        self.assertEqual(self.clock.ticks, 100)
+        self.assertAlmostEqual(self.clock.time(), 2)
+
+    def test_speed(self):
+        self.clock.speed_up()
+        self.assertEqual(self.clock.speed, 2)
+        self.assertEqual(self.clock.frame_rate(), 100)
+        self.clock.set_speed(8)
+        self.clock.speed_up()
+        self.assertEqual(self.clock.speed, None)
+        self.assertEqual(self.clock.frame_rate(), 0)
+        self.clock.speed_up()
+        self.assertEqual(self.clock.speed, None)
+        self.clock.set_speed(1)
+        self.clock.slow_down()
+        self.assertEqual(self.clock.speed, 1)
+        self.assertRaises(game_clock.GameClockError, lambda: self.clock.set_speed(3))
+
+    def test_speed_does_not_change_time_step(self):
+        self.clock.set_speed(None)
+        self.clock.tick()
+        self.assertAlmostEqual(self.clock.time(), 1 / 50)
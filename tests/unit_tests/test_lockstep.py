@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+import unittest
+import game_configs as configs
+import lockstep
+import orders
+
+
+# Peer script: hosts (port 0 means any free port, it is printed) or joins the game
+# and plays scripted orders. Both players build a barrack, recruit a scout and send it
+# to the other player's city, so the game states change through orders of both players.
+_PEER = '''
+import sys, json
+import headless
+headless.init_pygame()
+import lockstep, orders
+from game import Game
+
+role, tick_count = sys.argv[1], int(sys.argv[2])
+if role == 'host':
+    server = lockstep.listen(0, '127.0.0.1')
+    print(server.getsockname()[1], flush=True)
+    session = lockstep.host(server, 'elves', seed=5)
+else:
+    session = lockstep.join('127.0.0.1', int(sys.argv[3]), 'orcs')
+
+# Objects are created in the same order by both players, so their ids are known in advance.
+host_city, guest_city = [next(iter(empire.cities)) for empire in (Game().player_emp, Game().enemy_emp)]
+first_id = Game().registry.next_id
+own_city, other_city = (host_city, guest_city) if role == 'host' else (guest_city, host_city)
+# Host orders are executed first: host barrack and scout get smaller ids.
+own = 0 if role == 'host' else 1
+barrack_id, scout_id = first_id + own, first_id + 2 + own
+scheduled = {
+    5: [orders.Order(orders.COMMAND, own_city.entity_id, 0, own_city.rect.move(0, 300).center)],
+    50: [orders.Order(orders.COMMAND, barrack_id, 0)],
+    100: [orders.Order(orders.EMPTY_CLICK, scout_id, pos=other_city.rect.center)],
+    150: [orders.Order(orders.INTERACT, scout_id, target_id=other_city.entity_id)],
+}
+result = lockstep.play_headless(session, tick_count, scheduled)
+result['objects'] = len(Game().registry)
+session.close()
+print(json.dumps(result), flush=True)
+'''
+
+
+def _order(**kwargs) -> orders.Order:
+    return orders.Order(**kwargs)
+
+
+class TestOrderEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        for order in (_order(kind=orders.EMPTY_CLICK, object_id=7, pos=(-3, 1200)),
+                      _order(kind=orders.INTERACT, object_id=2 ** 32 - 1, target_id=12),
+                      _order(kind=orders.COMMAND, object_id=5, command=3),
+                      _order(kind=orders.COMMAND, object_id=5, command=1, pos=(0, 0))):
+            data = lockstep._pack_order(order)
+            self.assertEqual(len(data), lockstep._ORDER.size)
+            self.assertEqual(lockstep._unpack_order(b'xx' + data, 2), order)
+
+    def test_text(self):
+        data = lockstep._pack_text('elves') + lockstep._pack_text('')
+        text, offset = lockstep._unpack_text(data, 0)
+        self.assertEqual(text, 'elves')
+        self.assertEqual(lockstep._unpack_text(data, offset), ('', len(data)))
+
+
+class TestBatches(unittest.TestCase):
+    def setUp(self) -> None:
+        server = lockstep.listen(0, '127.0.0.1')
+        client = socket.create_connection(server.getsockname())
+        accepted, _ = server.accept()
+        server.close()
+        settings = lockstep.Settings(0, configs.TICK_RATE, 10, configs.TICK_RATE, False, True, 'elves', 'orcs')
+        self.sender = lockstep.Lockstep(lockstep.Connection(client), settings, lockstep.HOST, send_interval=5)
+        self.receiver = lockstep.Lockstep(lockstep.Connection(accepted), settings, lockstep.GUEST)
+
+    def test_batches_of_several_ticks_are_sent_together(self):
+        batches = {tick: [_order(kind=orders.COMMAND, object_id=tick, command=i) for i in range(tick % 3)]
+                   for tick in range(10, 15)}
+        # The biggest batch.
+        batches[15] = [_order(kind=orders.EMPTY_CLICK, object_id=i, pos=(i, i)) for i in range(255)]
+        for tick, batch in batches.items():
+            self.sender._add_batch(tick, batch)
+        self.sender._send_batches()
+        self.assertEqual(self.sender.connection.packets_sent, 1)
+
+        received = {}
+        deadline = time.perf_counter() + 5
+        while len(received) < len(batches) and time.perf_counter() < deadline:
+            self.receiver.connection.wait(0.1)
+            for kind, payload in self.receiver.connection.receive():
+                self.receiver._handle(kind, payload)
+            received = self.receiver._batches[lockstep.HOST]
+        self.assertEqual(received, batches)
+
+    def tearDown(self) -> None:
+        self.sender.connection.close(timeout=0)
+        self.receiver.connection.close(timeout=0)
+
+
+class TestLockstepGame(unittest.TestCase):
+    """ Plays a game of two peer processes over loopback. """
+
+    def test_game(self):
+        tick_count = 300
+        cwd = os.path.dirname(os.path.abspath(lockstep.__file__))
+        host = subprocess.Popen([sys.executable, '-c', _PEER, 'host', str(tick_count)], cwd=cwd,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        try:
+            port = _read_line(host)
+            guest = subprocess.Popen([sys.executable, '-c', _PEER, 'guest', str(tick_count), port], cwd=cwd,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            results = []
+            for peer in (host, guest):
+                out, err = peer.communicate(timeout=120)
+                self.assertEqual(peer.returncode, 0, err)
+                results.append(json.loads(out.splitlines()[-1]))
+        finally:
+            host.kill()
+
+        host_result, guest_result = results
+        self.assertEqual(host_result['ticks'], tick_count)
+        self.assertEqual(guest_result['ticks'], tick_count)
+        # No desynchronization (otherwise `DesyncError` would fail the peers) and the same final state.
+        self.assertEqual(host_result['checksum'], guest_result['checksum'])
+        # Two cities, two barracks and two scouts.
+        self.assertEqual(host_result['objects'], 6)
+        # Only orders are sent, and batches of several ticks share a TCP segment.
+        send_rate = configs.TICK_RATE / configs.LOCKSTEP_SEND_INTERVAL
+        for result in results:
+            self.assertLess(result['bytes_sent_per_game_second'], 200)
+            self.assertLess(result['packets_sent_per_game_second'], send_rate + 2)
+            # Payload with estimated TCP/IP headers.
+            self.assertLess(result['wire_bytes_sent_per_game_second'], 800)
+
+
+def _read_line(process: subprocess.Popen) -> str:
+    line = process.stdout.readline()
+    while line.startswith('pygame') or line.startswith('Hello'):
+        line = process.stdout.readline()
+    return line.strip()
@@ -0,0 +1,103 @@
+import os
+import types
+import unittest
+from unittest import mock
+import pygame
+from game import Game
+from game_objects import races, empire
+from interface.interface_class import Interface
+from interface import interface_configs as configs
+from interface import minimap
+from world_map import Map
+
+
+class TestMinimap(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        player_empire = empire.Empire(races.ELVES)
+        enemy_empire = empire.Empire(races.ORCS)
+        Interface(player_empire, enemy_empire)
+        Game(player_empire, enemy_empire)
+        # Game is a singleton, so it may have been created by other tests with other empires.
+        self.empire = Game().player_emp
+        self.empire.resources = 1000
+        self.city = self.empire.set_city(name='minimap city')
+        self.city.rect.center = (1000, 1000)
+        self.city.update_position()
+        self.warrior = self.city.build_barrack((1000, 600)).create_warrior()
+        self.minimap = minimap.Minimap(self.empire)
+
+    def test_static_layer_is_rebuilt_only_when_buildings_change(self):
+        self.minimap.refresh()
+        signature = self.minimap._buildings_signature
+
+        # Moving units do not change the static layer.
+        self.warrior.rect.move_ip(300, 300)
+        self.minimap.refresh()
+        self.assertIs(self.minimap._buildings_signature, signature)
+
+        wall = self.city.build_wall((2000, 2000))
+        # The wall image is drawn at its top left corner.
+        minimap_pos = self.minimap._convert_to_minimap_coordinates(wall.rect.topleft)
+        terrain_color = self.minimap._default_image.get_at(minimap_pos)
+        self.minimap.refresh()
+        self.assertIsNot(self.minimap._buildings_signature, signature)
+        self.assertNotEqual(self.minimap._static_layer.get_at(minimap_pos), terrain_color)
+
+        signature = self.minimap._buildings_signature
+        wall.kill()
+        Game().registry.flush()
+        self.minimap.refresh()
+        self.assertIsNot(self.minimap._buildings_signature, signature)
+        self.assertEqual(self.minimap._static_layer.get_at(minimap_pos), terrain_color)
+
+    def test_refresh_rate(self):
+        period = 1000 // configs.MINIMAP_REFRESH_RATE
+        with mock.patch('pygame.time.get_ticks', return_value=10_000) as get_ticks:
+            self.minimap.update()
+            self.minimap.refresh = mock.Mock(wraps=self.minimap.refresh)
+
+            get_ticks.return_value += period - 1
+            self.minimap.update()
+            self.minimap.refresh.assert_not_called()
+
+            get_ticks.return_value += 1
+            self.minimap.update()
+            self.minimap.refresh.assert_called_once()
+
+            # Only explicit refreshes happen without auto refresh.
+            self.minimap.auto_refresh = False
+            get_ticks.return_value += 10 * period
+            self.minimap.update()
+            self.minimap.refresh.assert_called_once()
+
+    def test_numpy_units_drawing_matches_fill(self):
+        if minimap.numpy is None:
+            self.skipTest('NumPy is not installed')
+        map_width, map_height = Map().rect.size
+        units = [types.SimpleNamespace(rect=pygame.Rect(pos, (10, 10)))
+                 for pos in ((0, 0), (1234, 567), (map_width - 1, 100),
+                             (200, map_height - 1), (map_width - 1, map_height - 1))]
+        self.minimap.refresh()
+        background = pygame.image.tostring(self.minimap._layer, 'RGB')
+        layer = self.minimap._layer.copy()
+
+        self.minimap._draw_units(units, configs.MINIMAP_ENEMY_UNITS_COLOR)
+        numpy_image = pygame.image.tostring(self.minimap._layer, 'RGB')
+        self.minimap._layer = layer
+        with mock.patch.object(minimap, 'numpy', None):
+            self.minimap._draw_units(units, configs.MINIMAP_ENEMY_UNITS_COLOR)
+        fill_image = pygame.image.tostring(self.minimap._layer, 'RGB')
+
+        self.assertNotEqual(numpy_image, background)
+        self.assertEqual(numpy_image, fill_image)
+        # Clipped points are drawn up to the edges.
+        right, bottom = self.minimap.rect.width - 1, self.minimap.rect.height - 1
+        self.assertEqual(self.minimap._layer.get_at((right, bottom))[:3], configs.MINIMAP_ENEMY_UNITS_COLOR)
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
+        Game().registry.flush()
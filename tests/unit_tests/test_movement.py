@@ -0,0 +1,111 @@
+import os
+import random
+import unittest
+from unittest import mock
+import pygame
+from game import Game
+from game_objects import races, empire
+from game_objects.units import warrior, movement
+from interface.interface_class import Interface
+from navigation import NavigationGrid
+
+
+@unittest.skipIf(movement.numpy is None, 'NumPy is not installed')
+class TestMovementSystem(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.DWARFS)
+        self.other_empire = empire.Empire(races.ELVES)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.movement = movement.MovementSystem(capacity=1)
+        Game().movement = self.movement
+
+    def _create_warrior(self, center):
+        unit = warrior.OrcWarrior(empire=self.empire)
+        unit.rect.center = center
+        unit.update_position()
+        return unit
+
+    def test_register(self):
+        unit1 = self._create_warrior((100, 100))
+        unit2 = self._create_warrior((300, 100))
+        self.assertEqual(len(self.movement), 2)
+        unit1.kill()
+        self.assertEqual(len(self.movement), 1)
+        unit1.kill()
+        self.assertEqual(len(self.movement), 1)
+        unit2.kill()
+        self.assertEqual(len(self.movement), 0)
+
+    def test_step(self):
+        unit = self._create_warrior((100, 100))
+        unit.set_move_to((200, 100))
+        unit.move()
+        # Move is postponed till system step.
+        self.assertEqual(unit.rect.center, (100, 100))
+        self.movement.step(Game().objects)
+        self.assertEqual(unit.rect.center, (103, 100))
+        # Unit does not move without request.
+        self.movement.step(Game().objects)
+        self.assertEqual(unit.rect.center, (103, 100))
+
+    def test_collision(self):
+        unit = self._create_warrior((100, 100))
+        obstacle = self._create_warrior((192, 100))
+        unit.set_move_to((400, 100))
+        unit.move()
+        self.movement.step(Game().objects)
+        self.assertEqual(unit.rect.right, obstacle.rect.left)
+
+    def test_lone_units_are_moved_at_once(self):
+        # The unit enters the next spatial index cell row.
+        lone = self._create_warrior((100, Game().objects.cell_size - 47))
+        unit = self._create_warrior((1000, 100))
+        obstacle = self._create_warrior((1092, 100))
+        lone.set_move_to((100, 400))
+        unit.set_move_to((1400, 100))
+        with mock.patch.object(lone, 'apply_step') as lone_step, \
+                mock.patch.object(unit, 'apply_step', wraps=unit.apply_step) as unit_step:
+            lone.move()
+            unit.move()
+            self.movement.step(Game().objects)
+        lone_step.assert_not_called()
+        unit_step.assert_called_once()
+        self.assertEqual(lone.rect.center, (100, Game().objects.cell_size - 44))
+        self.assertEqual(lone.cur_real_pos, [100, Game().objects.cell_size - 44])
+        self.assertEqual(Game().objects.sprites_at_point((100, lone.rect.bottom - 1)), [lone])
+        self.assertEqual(unit.rect.right, obstacle.rect.left)
+
+    def test_rounding_matches_rect(self):
+        rng = random.Random(0)
+        values = [rng.uniform(-1000, 1000) for _ in range(1000)] + [-2.5, -0.5, 0.5, 2.5, 3.5]
+        rect = pygame.Rect(0, 0, 10, 10)
+        expected = []
+        for value in values:
+            rect.centerx = value
+            expected.append(rect.centerx)
+        self.assertEqual(movement._round(movement.numpy.array(values)).tolist(), expected)
+
+    def test_waypoints(self):
+        navigation = NavigationGrid((3000, 3000), cell_size=50, clearance=45, capacity=2)
+        Game().navigation = navigation
+        try:
+            self.empire.set_city(name='movement city').build_wall((1200, 1000))
+            units = [self._create_warrior(center) for center in ((1000, 1000), (1000, 700), (1800, 1300))]
+            destinations = [(1400, 1000), (1400, 1000), (500, 500)]
+            for unit, destination in zip(units, destinations):
+                unit.set_move_to(destination)
+            centers = movement.numpy.array([unit.rect.center for unit in units], dtype=float)
+            waypoints = self.movement._waypoints(navigation, centers, movement.numpy.array(destinations, dtype=float))
+            self.assertEqual([tuple(waypoint) for waypoint in waypoints.tolist()],
+                             [unit._steering_point() for unit in units])
+        finally:
+            Game().navigation = None
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
+        Game().movement = None
@@ -0,0 +1,67 @@
+import os
+import unittest
+import pygame
+from game import Game
+from game_objects import races, empire
+from game_objects.units import warrior
+from interface.interface_class import Interface
+from navigation import NavigationGrid
+
+
+class TestNavigation(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ORCS, start_resources=1000)
+        self.other_empire = empire.Empire(races.ELVES)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.navigation = NavigationGrid((3000, 3000), cell_size=50, clearance=45, capacity=2)
+        Game().navigation = self.navigation
+        self.city = self.empire.set_city(name='test city')
+        self.wall = self.city.build_wall((1200, 1000))
+
+    def _create_warrior(self, center):
+        unit = warrior.OrcWarrior(empire=self.empire)
+        unit.rect.center = center
+        unit.update_position()
+        return unit
+
+    def test_blocked_cells(self):
+        self.assertTrue(self.navigation.is_blocked(self.navigation.cell_of((1200, 1000))))
+        self.assertFalse(self.navigation.is_blocked(self.navigation.cell_of((1400, 1000))))
+        self.wall.kill()
+        self.assertFalse(self.navigation.is_blocked(self.navigation.cell_of((1200, 1000))))
+
+    def test_unit_walks_around_wall(self):
+        unit = self._create_warrior((1000, 1000))
+        unit.set_move_to((1400, 1000))
+        for _ in range(300):
+            unit.update()
+        self.assertLess(abs(unit.rect.centerx - 1400), unit.max_speed)
+        self.assertLess(abs(unit.rect.centery - 1000), unit.max_speed)
+
+    def test_field_is_shared(self):
+        units = [self._create_warrior((300 + 100 * i, 2000)) for i in range(20)]
+        for unit in units:
+            unit.set_move_to((1400, 1000))
+            unit.update()
+        self.assertEqual(self.navigation.computed_fields, 1)
+
+    def test_cache(self):
+        first = self.navigation.flow_field((100, 100))
+        self.navigation.flow_field((2000, 100))
+        self.assertIs(self.navigation.flow_field((100, 100)), first)
+        self.navigation.flow_field((100, 2000))
+        self.assertEqual(self.navigation.computed_fields, 3)
+        self.assertIsNot(self.navigation.flow_field((2000, 100)), first)
+        self.assertEqual(self.navigation.computed_fields, 4)
+        # Building change drops all fields.
+        self.city.build_wall((2000, 2000))
+        self.assertIsNot(self.navigation.flow_field((100, 100)), first)
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
+        Game().navigation = None
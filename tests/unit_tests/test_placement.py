@@ -0,0 +1,45 @@
+import os
+import unittest
+import pygame
+import exceptions
+from game import Game
+from game_objects import races, empire
+from interface.interface_class import Interface
+
+
+class TestPlacement(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ELVES, start_resources=1000)
+        self.other_empire = empire.Empire(races.ORCS)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.city = self.empire.set_city(name='test city')
+        self.city.rect.center = (2000, 2000)
+        self.city.update_position()
+        self.barrack = self.city.build_barrack((1500, 1500))
+
+    def test_building_on_occupied_place(self):
+        mine = self.city.build_mine((1500, 1500))
+        self.assertFalse(mine.rect.colliderect(self.barrack.rect))
+        self.assertIn(mine, Game().objects)
+
+    def test_create_units(self):
+        scouts = self.barrack.create_scouts(20)
+        self.assertEqual(len(scouts), 20)
+        rects = [scout.rect for scout in scouts]
+        for i, rect in enumerate(rects):
+            self.assertEqual(rect.collidelist(rects[:i] + rects[i + 1:]), -1)
+            self.assertFalse(rect.colliderect(self.barrack.rect))
+
+    def test_create_units_until_resources_are_over(self):
+        self.empire.resources = 20
+        self.assertEqual(len(self.barrack.create_scouts(5)), 2)
+        with self.assertRaises(exceptions.CreationResourcesLimitError):
+            self.barrack.create_scouts(5)
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
@@ -0,0 +1,123 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import profiler
+from profiler import Profiler
+
+
+class FakeClock:
+    """ `time.perf_counter` replacement which is advanced manually. """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiler = Profiler()
+        self.profiler.disable()
+        self.profiler.clear()
+        self.clock = FakeClock()
+        patcher = mock.patch.object(profiler.time, 'perf_counter', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.profiler.disable()
+        self.profiler.clear()
+
+    def _frame(self, **phases):
+        """ Records a frame which consists of `phases` of given durations (in seconds). """
+        self.profiler.begin_frame()
+        for name, duration in phases.items():
+            with self.profiler.phase(name):
+                self.clock.now += duration
+        self.profiler.end_frame()
+
+    def test_disabled(self):
+        self.assertIs(self.profiler.phase('a'), self.profiler.phase('b'))
+        self._frame(a=0.001)
+        self.assertEqual(len(self.profiler), 0)
+        self.assertEqual(self.profiler.statistics()['p99'], 0)
+
+    def test_phases(self):
+        self.profiler.enable()
+        self._frame(events=0.001, ai=0.002)
+        self._frame(events=0.003)
+        self.assertEqual(len(self.profiler), 2)
+        self.assertEqual(self.profiler.phase_names(), ['events', 'ai'])
+        self.assertEqual(self.profiler.durations('ai'), [0.002])
+        self.assertEqual(self.profiler.durations(), [0.003, 0.003])
+        statistics = self.profiler.statistics('events')
+        self.assertAlmostEqual(statistics['mean'], 2)
+        self.assertAlmostEqual(statistics['max'], 3)
+
+    def test_repeated_phase_is_summed(self):
+        self.profiler.enable()
+        self.profiler.begin_frame()
+        for _ in range(3):
+            with self.profiler.phase('draw'):
+                self.clock.now += 0.001
+        self.profiler.end_frame()
+        self.assertAlmostEqual(self.profiler.durations('draw')[0], 0.003)
+
+    def test_phase_outside_frame(self):
+        self.profiler.enable()
+        with self.profiler.phase('a'):
+            self.clock.now += 1
+        self.assertEqual(len(self.profiler), 0)
+        # Frame which has begun while profiler was disabled is not recorded.
+        self.profiler.disable()
+        self.profiler.begin_frame()
+        self.profiler.enable()
+        self.profiler.end_frame()
+        self.assertEqual(len(self.profiler), 0)
+
+    def test_rolling_window(self):
+        self.profiler.enable()
+        for i in range(self.profiler.window + 10):
+            self._frame(a=i / 1000)
+        self.assertEqual(len(self.profiler), self.profiler.window)
+        self.assertAlmostEqual(self.profiler.durations('a')[0], 0.010)
+
+    def test_percentiles(self):
+        self.profiler.enable()
+        for i in range(1, 101):
+            self._frame(a=i / 1000)
+        statistics = self.profiler.statistics('a')
+        self.assertAlmostEqual(statistics['p50'], 50)
+        self.assertAlmostEqual(statistics['p99'], 99)
+
+    def test_histogram(self):
+        self.profiler.enable()
+        self._frame(a=0.0005)
+        self._frame(a=0.0015)
+        self._frame(a=0.0016)
+        self._frame(a=1)
+        self.assertEqual(self.profiler.histogram('a', bins=4, bin_width=1), [1, 2, 0, 1])
+
+    def test_trace(self):
+        self.profiler.enable()
+        for _ in range(5):
+            self._frame(ai=0.001, draw=0.002)
+        events = self.profiler.trace_events(frames=2)
+        self.assertEqual([event['name'] for event in events], ['frame', 'ai', 'draw'] * 2)
+        self.assertEqual(events[0]['args'], {'frame': 3})
+        self.assertAlmostEqual(events[2]['dur'], 2000)
+        self.assertAlmostEqual(events[1]['ts'] + events[1]['dur'], events[2]['ts'])
+
+        path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        self.profiler.export_trace(path)
+        with open(path) as file:
+            trace = json.load(file)
+        self.assertEqual(len(trace['traceEvents']), 15)
+        self.assertTrue(all(event['ph'] == 'X' for event in trace['traceEvents']))
+
+    def test_toggle(self):
+        self.assertTrue(self.profiler.toggle())
+        self.assertFalse(self.profiler.toggle())
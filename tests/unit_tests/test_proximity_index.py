@@ -0,0 +1,58 @@
+import os
+import unittest
+import pygame
+from game import Game
+from game_objects import races, empire
+from game_objects.units import warrior
+from interface.interface_class import Interface
+
+
+class TestProximityIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ORCS)
+        self.enemy = empire.Empire(races.DWARFS)
+        Interface(self.empire, self.enemy)
+        Game(self.empire, self.enemy)
+        self.index = Game().proximity
+        self.unit = self._create_warrior(self.empire, (1000, 1000))
+        self.near = self._create_warrior(self.enemy, (1150, 1000))
+        self.far = self._create_warrior(self.enemy, (1000, 1400))
+        self.index.invalidate()
+
+    def _create_warrior(self, empire_, center):
+        unit = warrior.OrcWarrior(empire=empire_)
+        unit.rect.center = center
+        unit.update_position()
+        return unit
+
+    def test_nearest_enemy(self):
+        self.assertIs(self.index.nearest_enemy(self.empire, (1000, 1000), 500), self.near)
+        self.assertIs(self.index.nearest_enemy(self.empire, (1000, 1500), 500), self.far)
+        self.assertIsNone(self.index.nearest_enemy(self.empire, (1000, 1000), 100))
+        self.assertIs(self.index.nearest_enemy(self.enemy, (1150, 1000), 500), self.unit)
+
+    def test_enemies_within_many(self):
+        result = self.index.enemies_within_many(self.empire, [(1000, 1000), (1000, 1400), (0, 0)], 300)
+        self.assertEqual(result, [[self.near], [self.far], []])
+
+    def test_dead_objects_are_skipped(self):
+        self.index.nearest_enemy(self.empire, (1000, 1000), 500)
+        self.near.die()
+        self.assertIs(self.index.nearest_enemy(self.empire, (1000, 1000), 500), self.far)
+
+    def test_idle_unit_acquires_target(self):
+        self.unit.update()
+        self.assertIs(self.unit.attack_target.sprite, self.near)
+
+    def test_moving_unit_does_not_acquire_target(self):
+        self.unit.set_move_to((3000, 1000))
+        self.unit.update()
+        self.assertIsNone(self.unit.attack_target.sprite)
+
+    def tearDown(self) -> None:
+        Game().registry.flush()
+        for obj in Game().objects:
+            obj.kill()
@@ -0,0 +1,150 @@
+import os
+import sys
+import tempfile
+import subprocess
+import unittest
+import replay
+
+
+# Plays the game headlessly as `play_game` does: clicks are recorded and handled before ticks,
+# keyframes are taken and camera moves are recorded after ticks. Random clicks and camera moves are seeded.
+# Writes game state before input of `until` tick and the final state.
+_RECORD_GAME = '''
+import sys, random
+import headless
+headless.init_pygame()
+import engine, replay, snapshot
+import game_configs as configs
+from game import Game
+from interface.interface_class import Interface
+from interface import click_handler
+
+path, ticks, until = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+rng = random.Random(3)
+recorder = replay.Recorder(path, seed=11, keyframe_interval=100)
+random.seed(recorder.seed)
+engine.init_game()
+for _ in range(ticks):
+    if rng.random() < 0.1:
+        pos = rng.randrange(configs.SCR_SIZE[0]), rng.randrange(configs.SCR_SIZE[1])
+        recorder.record_click(Game().clock.ticks, pos)
+        click_handler.handle_click(pos)
+    if not engine.tick():
+        break
+    if recorder.is_keyframe_due(Game().clock.ticks):
+        recorder.record_keyframe(Game().clock.ticks)
+    if Game().clock.ticks == until:
+        with open(path + '.until', 'wb') as file:
+            file.write(snapshot.dumps())
+    # Camera moves after the last tick too, so its input is the last one.
+    if rng.random() < 0.05 or Game().clock.ticks == ticks:
+        Interface().camera.x += rng.randrange(-300, 300)
+        Interface().camera.y += rng.randrange(-300, 300)
+    recorder.record_camera(Game().clock.ticks, Interface().camera.topleft)
+recorder.close(Game().clock.ticks)
+with open(path + '.final', 'wb') as file:
+    file.write(snapshot.dumps())
+'''
+
+# Replays the recording (from the first tick or from keyframes, till `until` tick if it is given)
+# and writes the game state.
+_REPLAY_GAME = '''
+import sys, json
+import replay, snapshot
+
+path, output, use_keyframes = sys.argv[1], sys.argv[2], sys.argv[3] == 'keyframes'
+until = int(sys.argv[4]) if len(sys.argv) > 4 else None
+recording = replay.Recording(path)
+replay.init_game(recording)
+result = replay.run(recording, until, use_keyframes)
+with open(output, 'wb') as file:
+    file.write(snapshot.dumps())
+print(json.dumps(result))
+'''
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path = os.path.join(tempfile.mkdtemp(), 'game.rpl')
+
+    def test_recording(self):
+        recorder = replay.Recorder(self.path, seed=7, keyframe_interval=10, player_race='orcs',
+                                   player_name='Empire', city_name='City', enemy_race='elves')
+        recorder.record_click(0, (100, 200))
+        recorder.record_camera(1, (30, 0))
+        # Camera position has not changed, so it is not recorded.
+        recorder.record_camera(2, (30, 0))
+        recorder.record_keyframe(10, b'state at 10')
+        recorder.record_click(10, (5, 5))
+        recorder.record_keyframe(20, b'state at 20')
+        recorder.close(25)
+
+        recording = replay.Recording(self.path)
+        self.assertEqual((recording.seed, recording.keyframe_interval), (7, 10))
+        self.assertEqual((recording.player_race, recording.player_name, recording.city_name,
+                          recording.enemy_race), ('orcs', 'Empire', 'City', 'elves'))
+        self.assertEqual(recording.last_tick, 25)
+        self.assertEqual(recording.events, [replay.Event(replay.CLICK, 0, (100, 200)),
+                                            replay.Event(replay.CAMERA, 1, (30, 0)),
+                                            replay.Event(replay.CLICK, 10, (5, 5))])
+        self.assertEqual(recording.events_from(1)[0].kind, replay.CAMERA)
+        self.assertEqual(recording.events_from(10), recording.events[2:])
+
+        self.assertIsNone(recording.keyframe_before(9))
+        keyframe = recording.keyframe_before(19)
+        self.assertEqual(keyframe.tick, 10)
+        self.assertEqual(recording.read_keyframe(keyframe), b'state at 10')
+        self.assertEqual(recording.read_keyframe(recording.keyframe_before(100)), b'state at 20')
+
+    def test_unfinished_recording(self):
+        recorder = replay.Recorder(self.path, seed=0, keyframe_interval=10)
+        recorder.record_click(3, (1, 1))
+        recorder.record_keyframe(10, b'state')
+        recorder._file.close()
+        # Cut the keyframe.
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 2)
+        recording = replay.Recording(self.path)
+        self.assertEqual(len(recording.events), 1)
+        self.assertEqual(recording.keyframes, [])
+
+    def test_not_recording(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'something else')
+        self.assertRaises(replay.ReplayError, lambda: replay.Recording(self.path))
+
+
+class TestReplayGame(unittest.TestCase):
+    """ Records a game and replays it in separate processes since the game state is global. """
+
+    def setUp(self) -> None:
+        self.path = os.path.join(tempfile.mkdtemp(), 'game.rpl')
+        self.cwd = os.path.dirname(os.path.abspath(replay.__file__))
+
+    def _run(self, script: str, *args) -> str:
+        process = subprocess.run([sys.executable, '-c', script, *map(str, args)], cwd=self.cwd,
+                                 capture_output=True, text=True, timeout=120)
+        self.assertEqual(process.returncode, 0, process.stderr)
+        return process.stdout.splitlines()[-1] if process.stdout else ''
+
+    def _read(self, path: str) -> bytes:
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def test_replay_reproduces_game(self):
+        ticks, until = 600, 450
+        self._run(_RECORD_GAME, self.path, ticks, until)
+        recording = replay.Recording(self.path)
+        self.assertEqual(recording.last_tick, ticks)
+        self.assertTrue(any(event.kind == replay.CLICK for event in recording.events))
+        self.assertTrue(any(event.kind == replay.CAMERA for event in recording.events))
+
+        # The whole recording from the first tick.
+        result = self._run(_REPLAY_GAME, self.path, self.path + '.replayed', 'first-tick')
+        self.assertIn('"start_tick": 0', result)
+        self.assertEqual(self._read(self.path + '.replayed'), self._read(self.path + '.final'))
+
+        # Till `until` tick from the nearest keyframe.
+        result = self._run(_REPLAY_GAME, self.path, self.path + '.seeked', 'keyframes', until)
+        self.assertIn('"start_tick": 400', result)
+        self.assertEqual(self._read(self.path + '.seeked'), self._read(self.path + '.until'))
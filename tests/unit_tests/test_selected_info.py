@@ -0,0 +1,63 @@
+import os
+import unittest
+from unittest import mock
+import pygame
+from game import Game
+from game_objects import races, empire
+from interface.interface_class import Interface
+
+
+class TestSelectedInfo(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ORCS, start_resources=1000)
+        self.other_empire = empire.Empire(races.ELVES, start_resources=1000)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.city = self.empire.set_city(name='test city')
+        self.wall = self.city.build_wall((500, 500))
+        self.info = Interface().selected_info
+
+    def test_redraw_only_on_change(self):
+        self.info.replace(self.city)
+        self.info.dirty = False
+        self.info.update()
+        self.assertFalse(self.info.dirty)
+
+        self.city.decrease_health(1)
+        self.info.update()
+        self.assertTrue(self.info.dirty)
+
+        self.info.dirty = False
+        self.info.replace(self.wall)
+        self.assertTrue(self.info.dirty)
+
+    def test_info_is_built_only_on_redraw(self):
+        self.info.replace(self.city)
+        with mock.patch.object(self.city, 'info', wraps=self.city.info) as info:
+            self.info.update()
+            info.assert_not_called()
+            self.city.decrease_health(1)
+            self.info.update()
+            info.assert_called_once()
+
+    def test_portrait_is_cached(self):
+        self.info.replace(self.city)
+        portraits = len(self.info._portraits)
+        self.info.replace(self.wall)
+        self.info.replace(self.city)
+        self.assertEqual(len(self.info._portraits), portraits + 1)
+
+    def test_redraw_after_hide(self):
+        self.info.replace(self.city)
+        self.info.hide()
+        self.info.dirty = False
+        self.info.replace(self.city)
+        self.assertTrue(self.info.dirty)
+
+    def tearDown(self) -> None:
+        self.info.hide()
+        for obj in Game().objects:
+            obj.kill()
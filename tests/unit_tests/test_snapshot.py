@@ -0,0 +1,123 @@
+import os
+import zlib
+import struct
+import tempfile
+import unittest
+import pygame
+import engine
+import snapshot
+from game import Game
+from game_objects import races, empire
+from interface.interface_class import Interface
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        player_empire = empire.Empire(races.ELVES)
+        enemy_empire = empire.Empire(races.ORCS)
+        Interface(player_empire, enemy_empire)
+        Game(player_empire, enemy_empire)
+        # Game is a singleton, so it may have been created by other tests with other empires.
+        self.empire, self.enemy = Game().player_emp, Game().enemy_emp
+        self.empire.resources = self.enemy.resources = 1000
+
+        self.city = self.empire.set_city(name='snapshot city')
+        self.city.rect.center = (1000, 1000)
+        self.city.update_position()
+        enemy_city = self.enemy.set_city(name='snapshot enemy city')
+        enemy_city.rect.center = (2500, 1000)
+        enemy_city.update_position()
+        self.mine = self.city.build_mine((1000, 1400))
+        barrack = self.city.build_barrack((1000, 600))
+        self.warriors = barrack.create_warriors(5)
+        for warrior in self.warriors:
+            warrior.set_move_to(enemy_city.rect.center)
+        self.warriors[0].attack_target.add(enemy_city)
+        enemy_city.build_wall((2000, 1000))
+
+    def _play(self, ticks: int):
+        for _ in range(ticks):
+            engine.update_objects()
+            Game().registry.flush()
+            Game().clock.tick()
+
+    def test_round_trip(self):
+        self._play(20)
+        data = snapshot.dumps()
+        ids = sorted(obj.entity_id for obj in Game().registry)
+        rect, target_id = self.warriors[0].rect.copy(), self.warriors[0].attack_target.sprite.entity_id
+        snapshot.loads(data)
+        self.assertEqual(snapshot.dumps(), data)
+        self.assertEqual(sorted(obj.entity_id for obj in Game().registry), ids)
+        self.assertEqual(self.empire.army.size(), 5)
+        self.assertEqual(self.empire.resources, 1000 - 20 - 10 - 5 * 10)
+
+        warrior = Game().registry.get(self.warriors[0].entity_id)
+        self.assertIsNot(warrior, self.warriors[0])
+        self.assertEqual(warrior.rect, rect)
+        self.assertEqual(warrior.attack_target.sprite.entity_id, target_id)
+        self.assertEqual(len(self.empire.get_city('snapshot city').buildings), 2)
+
+    def test_objects_created_after_snapshot_are_removed(self):
+        data = snapshot.dumps()
+        wall = self.city.build_wall((500, 500))
+        snapshot.loads(data)
+        self.assertNotIn(wall, Game().registry)
+        self.assertEqual(snapshot.dumps(), data)
+
+    def test_game_continues_the_same_way(self):
+        data = snapshot.dumps()
+        self._play(200)
+        expected = snapshot.dumps()
+        snapshot.loads(data)
+        self._play(200)
+        self.assertEqual(snapshot.dumps(), expected)
+
+    def test_selection(self):
+        Interface().handle_object_click(self.city)
+        data = snapshot.dumps()
+        Interface().remove_all_info()
+        snapshot.loads(data)
+        self.assertEqual(Interface().selected_object.get().entity_id, self.city.entity_id)
+        self.assertEqual(len(Interface().commands), 5)
+
+    def test_file(self):
+        path = os.path.join(tempfile.mkdtemp(), 'game.lots')
+        snapshot.save(path)
+        data = snapshot.dumps()
+        self.city.build_wall((500, 500))
+        snapshot.load(path)
+        self.assertEqual(snapshot.dumps(), data)
+
+    def test_damaged_snapshot(self):
+        Interface().handle_object_click(self.city)
+        data = snapshot.dumps()
+        other_version = data[:len(snapshot.MAGIC)] + struct.pack('<H', snapshot.VERSION + 1) + \
+            data[len(snapshot.MAGIC) + 2:]
+        middle = len(data) // 2
+        corrupted = data[:middle] + bytes([data[middle] ^ 0xff]) + data[middle + 1:]
+        # Interface record (camera, selected object id, command) is the last one before the checksum,
+        # the checksum matches, but the selected object does not exist.
+        body = data[:-snapshot._CHECKSUM.size]
+        selected_offset = len(body) - snapshot._INTERFACE.size + 8
+        missing_selection = body[:selected_offset] + struct.pack('<I', 10 ** 6) + body[selected_offset + 4:]
+        missing_selection += snapshot._CHECKSUM.pack(zlib.crc32(missing_selection))
+        for damaged in (b'something else', other_version, data[:len(data) // 2], corrupted, missing_selection):
+            self.assertRaises(snapshot.SnapshotError, lambda: snapshot.loads(damaged))
+            # The current state is kept.
+            self.assertEqual(snapshot.dumps(), data)
+        path = os.path.join(tempfile.mkdtemp(), 'empty.lots')
+        open(path, 'wb').close()
+        self.assertRaises(snapshot.SnapshotError, lambda: snapshot.load(path))
+        # Failed loads do not break later ones.
+        self._play(20)
+        snapshot.loads(data)
+        self.assertEqual(snapshot.dumps(), data)
+
+    def tearDown(self) -> None:
+        Interface().remove_all_info()
+        for obj in Game().objects:
+            obj.kill()
@@ -0,0 +1,67 @@
+import unittest
+import pygame
+import spatial_index
+
+
+def _sprite(x, y, w, h):
+    sprite = pygame.sprite.Sprite()
+    sprite.rect = pygame.Rect(x, y, w, h)
+    return sprite
+
+
+class TestSpatialGroup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.group = spatial_index.SpatialGroup(100)
+        self.sprite1 = _sprite(0, 0, 50, 50)
+        self.sprite2 = _sprite(150, 150, 200, 200)
+        self.sprite3 = _sprite(1000, 1000, 10, 10)
+        self.group.add(self.sprite1, self.sprite2, self.sprite3)
+
+    def test_sprites_in_rect(self):
+        self.assertEqual(self.group.sprites_in_rect(pygame.Rect(0, 0, 400, 400)),
+                         [self.sprite1, self.sprite2])
+        self.assertEqual(self.group.sprites_in_rect(pygame.Rect(300, 300, 10, 10)), [self.sprite2])
+        self.assertEqual(self.group.sprites_in_rect(pygame.Rect(500, 500, 100, 100)), [])
+
+    def test_sprites_at_point(self):
+        self.assertEqual(self.group.sprites_at_point((10, 10)), [self.sprite1])
+        self.assertEqual(self.group.sprites_at_point((349, 349)), [self.sprite2])
+        self.assertEqual(self.group.sprites_at_point((350, 350)), [])
+
+    def test_group_order(self):
+        sprite4 = _sprite(10, 10, 10, 10)
+        self.group.add(sprite4)
+        self.assertEqual(self.group.sprites_at_point((15, 15)), [self.sprite1, sprite4])
+        self.group.remove(self.sprite1)
+        self.group.add(self.sprite1)
+        self.assertEqual(self.group.sprites_at_point((15, 15)), [sprite4, self.sprite1])
+
+    def test_reindex(self):
+        self.sprite3.rect.topleft = (20, 20)
+        self.assertEqual(self.group.sprites_at_point((25, 25)), [self.sprite1])
+        self.group.reindex(self.sprite3)
+        self.assertEqual(self.group.sprites_at_point((25, 25)), [self.sprite1, self.sprite3])
+        self.assertEqual(self.group.sprites_in_rect(pygame.Rect(900, 900, 200, 200)), [])
+
+    def test_kill(self):
+        self.sprite2.kill()
+        self.assertEqual(self.group.sprites_in_rect(pygame.Rect(0, 0, 400, 400)), [self.sprite1])
+        self.assertNotIn(self.sprite2, self.group)
+        self.group.empty()
+        self.assertEqual(self.group.sprites_in_rect(pygame.Rect(0, 0, 2000, 2000)), [])
+
+    def test_is_free(self):
+        self.assertFalse(self.group.is_free(pygame.Rect(40, 40, 20, 20)))
+        self.assertTrue(self.group.is_free(pygame.Rect(50, 50, 100, 100)))
+
+    def test_find_free_rect(self):
+        rect = pygame.Rect(200, 200, 20, 20)
+        free_rect = self.group.find_free_rect(rect, max_distance=200, step=10)
+        self.assertTrue(self.group.is_free(free_rect))
+        self.assertEqual(free_rect.size, rect.size)
+        # The nearest free place is just out of the big sprite (70 pixels away).
+        self.assertEqual(abs(free_rect.x - rect.x) + abs(free_rect.y - rect.y), 70)
+        self.assertEqual(self.group.find_free_rect(pygame.Rect(60, 60, 20, 20), 100), pygame.Rect(60, 60, 20, 20))
+        self.assertIsNone(self.group.find_free_rect(rect, max_distance=50, step=10))
+        self.assertIsNone(self.group.find_free_rect(pygame.Rect(500, 500, 20, 20), 100,
+                                                    bounds=pygame.Rect(0, 0, 100, 100)))
@@ -0,0 +1,83 @@
+import os
+import unittest
+import pygame
+import image
+from game import Game
+from game_objects import races, empire
+from game_objects.units import scout
+from interface.interface_class import Interface
+
+
+class TestSpriteAtlas(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ELVES, start_resources=1000)
+        self.other_empire = empire.Empire(races.ORCS, start_resources=1000)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.first = scout.ElfScout(self.empire)
+        self.second = scout.ElfScout(self.empire)
+
+    def test_images_are_shared(self):
+        self.assertIs(self.first.image, self.second.image)
+        self.assertIs(self.first.minimap_image, self.second.minimap_image)
+        self.assertIs(self.first.image, image.get_sprite(races.ELVES, 'SCOUT', self.first.rect.size))
+        self.assertIsNot(self.first.image, scout.OrcScout(self.other_empire).image)
+
+    def test_copy_on_write(self):
+        shared = self.first.image
+        pixels = pygame.image.tostring(shared, 'RGBA')
+        self.first.add_borders()
+        self.assertIsNot(self.first.image, shared)
+        self.assertEqual(pygame.image.tostring(shared, 'RGBA'), pixels)
+        self.assertIs(self.second.image, shared)
+        # Without borders object uses shared image again.
+        self.first.remove_borders()
+        self.assertIs(self.first.image, shared)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(image.ImageError):
+            image.get_sprite(races.ELVES, 'DRAGON', (10, 10))
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
+
+
+class TestImageVariants(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ELVES, start_resources=1000)
+        self.other_empire = empire.Empire(races.ORCS, start_resources=1000)
+        Interface(self.empire, self.other_empire)
+        Game(self.empire, self.other_empire)
+        self.first = scout.ElfScout(self.empire)
+        self.second = scout.ElfScout(self.empire)
+
+    def test_bordered_images_are_shared(self):
+        self.first.add_borders()
+        self.second.add_borders()
+        self.assertIs(self.first.image, self.second.image)
+        self.assertTrue(image.SpriteAtlas().is_shared(self.first.image))
+        # Borders are not drawn twice.
+        self.assertIs(image.SpriteAtlas().bordered(self.first.image, self.first.borders_color,
+                                                   self.first.borders_size), self.first.image)
+
+    def test_damage_flash(self):
+        default = self.first.image
+        self.first.decrease_health(1)
+        self.second.decrease_health(1)
+        self.assertIs(self.first.image, self.second.image)
+        # Hit during flash does not make flash permanent.
+        self.first.decrease_health(1)
+        self.first._image_state._delay = -1
+        self.first.update()
+        self.assertIs(self.first.image, default)
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
@@ -0,0 +1,95 @@
+import os
+import unittest
+import pygame
+from game import Game
+from game_objects import races, empire
+from game_objects.units import scout
+from interface.interface_class import Interface
+from ai import TargetPlanner, BackgroundTargetPlanner
+
+
+class TestTargetPlanner(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.empire = empire.Empire(races.ELVES, start_resources=1000)
+        self.enemy = empire.Empire(races.ORCS, start_resources=1000)
+        Interface(self.empire, self.enemy)
+        Game(self.empire, self.enemy)
+        city = self.enemy.set_city(name='enemy city')
+        city.rect.topleft = (5000, 5000)
+        city.update_position()
+        self.near_wall = city.build_wall((1000, 1000))
+        self.far_wall = city.build_wall((1000, 1300))
+        self.scouts = [self._create_scout((1000 + 60 * i, 700)) for i in range(12)]
+        self.planner = TargetPlanner(self.empire)
+
+    def _create_scout(self, center):
+        unit = scout.ElfScout(self.empire)
+        unit.rect.center = center
+        unit.update_position()
+        return unit
+
+    def test_nearest_target(self):
+        self.planner.plan(self.scouts[:1])
+        self.assertIs(self.scouts[0].attack_target.sprite, self.near_wall)
+
+    def test_targets_are_spread(self):
+        self.planner.plan(self.scouts)
+        targets = [unit.attack_target.sprite for unit in self.scouts]
+        self.assertEqual(set(targets), {self.near_wall, self.far_wall})
+        self.assertGreater(targets.count(self.near_wall), targets.count(self.far_wall))
+
+    def test_only_idle_units_are_planned(self):
+        self.scouts[0].attack_target.add(self.far_wall)
+        self.planner.plan(self.scouts[:1])
+        self.assertIs(self.scouts[0].attack_target.sprite, self.far_wall)
+
+    def test_interval(self):
+        self.planner.update(self.scouts[:1])
+        self.planner.update(self.scouts[1:])
+        self.assertIsNone(self.scouts[1].attack_target.sprite)
+
+    def test_background_planning(self):
+        planner = BackgroundTargetPlanner(self.empire)
+        self.addCleanup(planner.close)
+        planner.plan(self.scouts)
+        self.assertTrue(planner.wait(timeout=5))
+        targets = [unit.attack_target.sprite for unit in self.scouts]
+        self.planner.reset()
+        for unit in self.scouts:
+            unit.attack_target.empty()
+        self.planner.plan(self.scouts)
+        self.assertEqual(targets, [unit.attack_target.sprite for unit in self.scouts])
+
+    def test_stale_plan_is_discarded(self):
+        planner = BackgroundTargetPlanner(self.empire, max_age=0)
+        self.addCleanup(planner.close)
+        planner.plan(self.scouts[:1])
+        ticks = Game().clock.ticks
+        Game().clock.set_ticks(ticks + 1)
+        self.addCleanup(Game().clock.set_ticks, ticks)
+        self.assertTrue(planner.wait(timeout=5))
+        self.assertIsNone(self.scouts[0].attack_target.sprite)
+
+    def test_dead_target_is_skipped(self):
+        planner = BackgroundTargetPlanner(self.empire)
+        self.addCleanup(planner.close)
+        planner.plan(self.scouts[:1])
+        self.near_wall.kill()
+        self.assertTrue(planner.wait(timeout=5))
+        self.assertIsNone(self.scouts[0].attack_target.sprite)
+
+    def test_reset_discards_plan_in_progress(self):
+        planner = BackgroundTargetPlanner(self.empire)
+        planner.plan(self.scouts[:1])
+        planner.reset()
+        # Lets the worker finish the plan.
+        planner.close()
+        planner.update([])
+        self.assertIsNone(self.scouts[0].attack_target.sprite)
+
+    def tearDown(self) -> None:
+        for obj in Game().objects:
+            obj.kill()
@@ -0,0 +1,43 @@
+import unittest
+import tournament
+
+
+def _result(player_race, enemy_race, result, ticks, player_resources, enemy_resources):
+    return {'player_race': player_race, 'enemy_race': enemy_race, 'seed': 0, 'result': result,
+            'winner': {tournament.PLAYER: player_race, tournament.ENEMY: enemy_race}.get(result),
+            'ticks': ticks, 'seconds': 1.0, 'sample_interval': 100,
+            'resources': {tournament.PLAYER: player_resources, tournament.ENEMY: enemy_resources}}
+
+
+class TestTournament(unittest.TestCase):
+    def test_schedule(self):
+        matches = tournament.schedule(matches=3, seed=1, races_=('elves', 'orcs'), max_ticks=10)
+        self.assertEqual(len(matches), 12)
+        self.assertEqual({(match.player_race, match.enemy_race) for match in matches},
+                         {('elves', 'elves'), ('elves', 'orcs'), ('orcs', 'elves'), ('orcs', 'orcs')})
+        self.assertEqual(len({match.seed for match in matches}), 12)
+        self.assertTrue(all(match.max_ticks == 10 for match in matches))
+        self.assertEqual(tournament.schedule(matches=3, seed=1, races_=('elves', 'orcs'), max_ticks=10), matches)
+
+    def test_report(self):
+        results = [_result('elves', 'orcs', tournament.PLAYER, 300, [100, 50, 20], [100, 80, 60]),
+                   _result('orcs', 'elves', tournament.PLAYER, 100, [100], [100]),
+                   _result('elves', 'orcs', tournament.DRAW, 200, [100, 30], [100, 40])]
+        report = tournament.report(results)
+        self.assertEqual(report['matches'], 3)
+        self.assertEqual(report['races']['elves'], {'matches': 3, 'wins': 1, 'losses': 1, 'win_rate': 1 / 3})
+        self.assertEqual(report['races']['orcs']['wins'], 1)
+
+        pairing = report['pairings']['elves vs orcs']
+        self.assertEqual((pairing['matches'], pairing[tournament.PLAYER], pairing[tournament.DRAW]), (2, 1, 1))
+        self.assertEqual(pairing['length'], {'mean': 250, 'p50': 200, 'max': 300})
+        self.assertEqual(report['length']['p50'], 200)
+
+        # Finished matches do not take part in means of later samples.
+        self.assertEqual(report['resource_curves']['elves'], {'ticks': [0, 100, 200], 'mean': [100, 40, 20]})
+        self.assertIn('elves vs orcs', tournament.format_report(report))
+
+    def test_empty_report(self):
+        report = tournament.report([])
+        self.assertEqual(report['matches'], 0)
+        self.assertEqual(report['length']['mean'], 0)
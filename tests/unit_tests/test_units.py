@@ -1,5 +1,4 @@
 import unittest
-import image
 from interface.interface import Interface
 from game import Game
 from game_objects import races, empire
@@ -19,7 +18,7 @@ class TestWarrior(unittest.TestCase):
                                           damage=20,
                                           fight_distance=300,
                                           size=(100, 100),
-                                          image=image.get_image(self.empire).WARRIOR)
+                                          kind='WARRIOR')
 
     def test_default(self):
         self.assertEqual(self.warrior.empire, self.empire)
@@ -55,7 +54,7 @@ class TestWarrior(unittest.TestCase):
                                         damage=2,
                                         fight_distance=300,
                                         size=(100, 100),
-                                        image=image.get_image(self.empire).WARRIOR)
+                                        kind='WARRIOR')
         other_unit.rect.center = (1000, 50)
         self.warrior.attack_target.add(other_unit)
         self.warrior.update()
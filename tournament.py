@@ -0,0 +1,207 @@
+""" This module plays AI-vs-AI matches without rendering to compare races balance.
+To start a tournament, put `python3 tournament.py` in terminal (see `--help` for options).
+
+Every race plays against every race (itself too) on both sides of the map
+`matches` times. Matches differ in seeds: a seed sets when AIs recruit their first units.
+Matches are played in parallel by a pool of processes. Game objects are singletons,
+so every match is played in a new process.
+Results are aggregated into a report: win rates, match lengths and resource curves. """
+
+
+import sys
+import json
+import time
+import random
+import itertools
+import multiprocessing
+import argparse
+from typing import Dict, Iterable, List, NamedTuple, Text
+# project modules #
+import game_configs as configs
+import headless
+import engine
+from ai import AIPlayer
+from game import Game
+from game_objects import races
+
+
+PLAYER, ENEMY = 'player', 'enemy'
+# Match results besides a win of a side.
+DRAW, TIMEOUT = 'draw', 'timeout'
+
+
+class Match(NamedTuple):
+    player_race: Text
+    enemy_race: Text
+    seed: int
+    # Game time limit (in ticks): if nobody has won, the match is a draw.
+    max_ticks: int = configs.TOURNAMENT_MAX_TICKS
+    # Real time limit (in seconds): the match is stopped if it takes longer.
+    timeout: float = configs.TOURNAMENT_TIMEOUT
+    sample_interval: int = configs.TOURNAMENT_SAMPLE_INTERVAL
+
+
+def schedule(matches: int = configs.TOURNAMENT_MATCHES, seed: int = 0,
+             races_: Iterable[Text] = tuple(races.races), **settings) -> List[Match]:
+    """ Returns `matches` matches of every races pairing. Seeds of matches are derived from `seed`,
+    so the same tournament can be played again. `settings` are passed to `Match`. """
+    rng = random.Random(seed)
+    return [Match(player_race, enemy_race, rng.randrange(2 ** 32), **settings)
+            for player_race, enemy_race in itertools.product(races_, repeat=2)
+            for _ in range(matches)]
+
+
+def play_match(match: Match) -> Dict:
+    """ Initializes the game and plays `match`. Must be called in a fresh process. """
+
+    random.seed(match.seed)
+    rng = random.Random(match.seed)
+    headless.init_pygame()
+    player_empire, enemy_empire = engine.init_game(match.player_race, enemy_race=match.enemy_race,
+                                                   ai_start_delay=rng.uniform(0, 2))
+    player_ai = AIPlayer(player_empire, start_delay=rng.uniform(0, 2))
+
+    resources = {PLAYER: [], ENEMY: []}
+    result = DRAW
+    start_time = time.perf_counter()
+    while Game().clock.ticks < match.max_ticks:
+        if Game().clock.ticks % match.sample_interval == 0:
+            resources[PLAYER].append(player_empire.resources)
+            resources[ENEMY].append(enemy_empire.resources)
+        player_ai.play_step()
+        if not engine.tick():
+            if player_empire.alive() != enemy_empire.alive():
+                result = PLAYER if player_empire.alive() else ENEMY
+            break
+        if time.perf_counter() - start_time > match.timeout:
+            result = TIMEOUT
+            break
+
+    return {'player_race': match.player_race,
+            'enemy_race': match.enemy_race,
+            'seed': match.seed,
+            'result': result,
+            'winner': {PLAYER: match.player_race, ENEMY: match.enemy_race}.get(result),
+            'ticks': Game().clock.ticks,
+            'seconds': time.perf_counter() - start_time,
+            'sample_interval': match.sample_interval,
+            'resources': resources}
+
+
+def run_tournament(matches: List[Match], processes: int = None, verbose: bool = False) -> List[Dict]:
+    """ Plays `matches` by a pool of `processes` processes (one per CPU core by default).
+    Returns results of matches in order of completion. """
+
+    results = []
+    with multiprocessing.Pool(processes, maxtasksperchild=1) as pool:
+        for result in pool.imap_unordered(play_match, matches):
+            results.append(result)
+            if verbose:
+                print(f"{len(results)}/{len(matches)}: {result['player_race']} vs {result['enemy_race']} - "
+                      f"{result['winner'] or result['result']} in {result['ticks']} ticks")
+    return results
+
+
+def report(results: List[Dict]) -> Dict:
+    """ Aggregates results of matches: win rates of races (overall and per pairing),
+    match lengths and mean resources of races over game time. """
+
+    race_stats = {}
+    pairings = {}
+    curves = {}
+    for result in results:
+        sides = ((result['player_race'], PLAYER), (result['enemy_race'], ENEMY))
+        for race, side in sides:
+            stats = race_stats.setdefault(race, {'matches': 0, 'wins': 0, 'losses': 0})
+            stats['matches'] += 1
+            if result['result'] == side:
+                stats['wins'] += 1
+            elif result['result'] in (PLAYER, ENEMY):
+                stats['losses'] += 1
+            # Sums and numbers of resources samples by sample index.
+            sums, numbers = curves.setdefault(race, ([], []))
+            for i, value in enumerate(result['resources'][side]):
+                if i == len(sums):
+                    sums.append(0)
+                    numbers.append(0)
+                sums[i] += value
+                numbers[i] += 1
+
+        pairing = pairings.setdefault(f"{result['player_race']} vs {result['enemy_race']}",
+                                      {'matches': 0, PLAYER: 0, ENEMY: 0, DRAW: 0, TIMEOUT: 0, 'ticks': []})
+        pairing['matches'] += 1
+        pairing[result['result']] += 1
+        pairing['ticks'].append(result['ticks'])
+
+    for stats in race_stats.values():
+        stats['win_rate'] = stats['wins'] / stats['matches']
+    for pairing in pairings.values():
+        pairing['length'] = _length_statistics(pairing.pop('ticks'))
+    sample_interval = results[0]['sample_interval'] if results else configs.TOURNAMENT_SAMPLE_INTERVAL
+    resource_curves = {race: {'ticks': [i * sample_interval for i in range(len(sums))],
+                              'mean': [total / number for total, number in zip(sums, numbers)]}
+                       for race, (sums, numbers) in curves.items()}
+    return {'matches': len(results),
+            'races': race_stats,
+            'pairings': pairings,
+            'length': _length_statistics([result['ticks'] for result in results]),
+            'resource_curves': resource_curves}
+
+
+def _length_statistics(ticks: List[int]) -> Dict[Text, float]:
+    """ Returns mean, median and max of match lengths (in ticks). """
+    if not ticks:
+        return {'mean': 0.0, 'p50': 0.0, 'max': 0.0}
+    ordered = sorted(ticks)
+    return {'mean': sum(ordered) / len(ordered),
+            'p50': ordered[(len(ordered) - 1) // 2],
+            'max': ordered[-1]}
+
+
+def format_report(tournament_report: Dict) -> Text:
+    """ Returns `tournament_report` as a human readable text. """
+    lines = [f"Matches: {tournament_report['matches']}, mean length: "
+             f"{tournament_report['length']['mean'] / configs.TICK_RATE:.1f} game seconds", '',
+             f"{'race':<10}{'matches':>9}{'wins':>7}{'losses':>8}{'win rate':>10}"]
+    for race, stats in sorted(tournament_report['races'].items()):
+        lines.append(f"{race:<10}{stats['matches']:>9}{stats['wins']:>7}{stats['losses']:>8}"
+                     f"{stats['win_rate']:>10.0%}")
+    lines += ['', f"{'pairing':<20}{PLAYER:>8}{ENEMY:>7}{DRAW:>6}{TIMEOUT:>9}{'mean length':>13}"]
+    for name, pairing in sorted(tournament_report['pairings'].items()):
+        lines.append(f"{name:<20}{pairing[PLAYER]:>8}{pairing[ENEMY]:>7}{pairing[DRAW]:>6}{pairing[TIMEOUT]:>9}"
+                     f"{pairing['length']['mean'] / configs.TICK_RATE:>12.1f}s")
+    return '\n'.join(lines)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Play AI-vs-AI matches of all races pairings without rendering.')
+    parser.add_argument('--matches', type=int, default=configs.TOURNAMENT_MATCHES,
+                        help='matches of every races pairing')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='number of processes which play matches (default: number of CPU cores)')
+    parser.add_argument('--max-ticks', type=int, default=configs.TOURNAMENT_MAX_TICKS,
+                        help='game time limit of a match (in ticks), a match is a draw after it')
+    parser.add_argument('--timeout', type=float, default=configs.TOURNAMENT_TIMEOUT,
+                        help='real time limit of a match (in seconds)')
+    parser.add_argument('--sample-interval', type=int, default=configs.TOURNAMENT_SAMPLE_INTERVAL,
+                        help='empires resources are sampled every N ticks')
+    parser.add_argument('--seed', type=int, default=0, help='seed matches seeds are derived from')
+    parser.add_argument('--output', default=None, help='write report and results of matches to this JSON file')
+    parser.add_argument('--quiet', action='store_true', help='do not print results of matches')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    ARGS = _parse_args()
+    MATCHES = schedule(ARGS.matches, ARGS.seed, max_ticks=ARGS.max_ticks, timeout=ARGS.timeout,
+                       sample_interval=ARGS.sample_interval)
+    START_TIME = time.perf_counter()
+    RESULTS = run_tournament(MATCHES, ARGS.processes, verbose=not ARGS.quiet)
+    ELAPSED = time.perf_counter() - START_TIME
+    REPORT = report(RESULTS)
+    print(format_report(REPORT))
+    print(f'\n{len(RESULTS)} matches in {ELAPSED:.1f}s ({len(RESULTS) / ELAPSED * 3600:.0f} matches per hour)')
+    if ARGS.output is not None:
+        with open(ARGS.output, 'w') as file:
+            json.dump({'report': REPORT, 'matches': RESULTS}, file, indent=2)
+        print(f'Report is written to {ARGS.output}', file=sys.stderr)
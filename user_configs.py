@@ -8,3 +8,5 @@ EMPIRE_NAME = 'My empire'
 CITY_NAME = 'My city'
 
 ENEMY_RACE = 'orcs'   # Can be: 'elves', 'orcs' or 'dwarfs'
+
+GAME_SPEED = 1  # Can be: 1, 2, 4, 8 or None (unbounded). Press +/- during the game to change it.
@@ -3,17 +3,27 @@
 
 from abc import ABC
 import pygame
+# project modules #
+import image as img
 
 
 def draw_borders(window):
-    """ Draws borders on window. """
-    pygame.draw.rect(window.image, window.borders_color,
-                     pygame.Rect((0, 0), window.rect.size), window.borders_size)
+    """ Draws borders on window. Shared images are replaced by their shared bordered variants. """
+    if img.SpriteAtlas().is_shared(window.image):
+        window.image = img.SpriteAtlas().bordered(window.image, window.borders_color, window.borders_size)
+    else:
+        pygame.draw.rect(window.image, window.borders_color,
+                         pygame.Rect((0, 0), window.rect.size), window.borders_size)
+    window.dirty = True
 
 
 def clear_borders(window):
     """ Removes borders from window. """
-    window.image = window._default_image.copy()
+    if img.SpriteAtlas().is_shared(window._default_image):
+        window.image = window._default_image
+    else:
+        window.image = window._default_image.copy()
+    window.dirty = True
 
 
 # State pattern.
@@ -2,8 +2,9 @@
 
 
 from abc import ABC
-import time
 import pygame
+# project modules #
+import game
 
 
 # State pattern.
@@ -27,13 +28,17 @@ class TemporaryImageState(ImageState):
     def __init__(self, window, tmp_image: pygame.Surface, delay: float):
         ImageState.__init__(self, window)
 
-        self._previous_image = window.image
+        # If window already shows temporary image, the image it has replaced is restored.
+        if isinstance(window._image_state, TemporaryImageState):
+            self._previous_image = window._image_state._previous_image
+        else:
+            self._previous_image = window.image
         self._delay = delay
-        self._set_time = time.time()
+        self._set_time = game.Game().clock.time()
 
         window.reset_image(tmp_image)
 
     def update(self):
-        if time.time() - self._set_time > self._delay:
+        if game.Game().clock.time() - self._set_time > self._delay:
             self.window.reset_image(self._previous_image)
             self.window._image_state = ConstantImageState(self.window)
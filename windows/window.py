@@ -5,6 +5,7 @@ Most game objects are inherited from this. """
 from typing import Tuple
 import pygame
 # project modules #
+import image as img
 from interface import interface_configs as configs
 from windows import window_states, image_states, borders_states
 
@@ -23,19 +24,30 @@ class Window(pygame.sprite.Sprite):
 
     _default_alpha = 255
 
+    # Shows if window image has changed since it was drawn last time.
+    # Renderers reset it after drawing.
+    dirty = True
+
     borders_size = configs.BORDERS_SIZE
     borders_color = configs.BORDERS_COLOR
 
-    def __init__(self, image: pygame.Surface, size: Tuple[int, int] = None):
+    def __init__(self, image: pygame.Surface, size: Tuple[int, int] = None, shared: bool = False):
+        """ If `shared` is true, `image` must be returned by `image.SpriteAtlas`. It is used as is
+        (it is neither scaled nor copied), so it is shared between many windows.
+        Shared images are copied only before window draws on them (see `_own_image`). """
+
         pygame.sprite.Sprite.__init__(self)
-        if size is not None:
-            self.image = pygame.transform.scale(image, size)
-        else:
+        if shared:
             self.image = image
+            self._default_image = image
+        else:
+            if size is not None:
+                self.image = pygame.transform.scale(image, size)
+            else:
+                self.image = image
+            self._default_image = self.image.copy()
         self.rect = self.image.get_rect()
 
-        self._default_image = self.image.copy()
-
         self._image_state = image_states.ConstantImageState(self)
         # Every window is created without borders.
         self._borders_state = borders_states.DisabledBordersState(self)
@@ -47,7 +59,14 @@ class Window(pygame.sprite.Sprite):
         255 is bright, 0 is transparent. """
 
         self._default_alpha = alpha
-        self.image.set_alpha(alpha)
+        self.set_image_alpha(alpha)
+        self.dirty = True
+
+    def set_image_alpha(self, alpha: int):
+        """ Sets alpha of current image. Unlike `set_default_alpha`, it is not kept after image change. """
+        if self.image.get_alpha() != alpha:
+            self._own_image()
+            self.image.set_alpha(alpha)
 
     def set_constant_bordered(self):
         """ Makes window constant bordered. """
@@ -66,6 +85,7 @@ class Window(pygame.sprite.Sprite):
         Use this instead of `=` or `blit`. """
         # We use `=` instead of `blit` because `=` does not save alpha.
         self.image = new_image
+        self.dirty = True
         self._borders_state.fix_borders()
 
     def hide(self):
@@ -106,7 +126,9 @@ class Window(pygame.sprite.Sprite):
 
     def clear(self):
         """ Removes window image and makes it transparrent. """
+        self._own_image()
         self.image.fill((0, 0, 0, 0))
+        self.dirty = True
 
     def add_borders(self):
         """ Makes window bordred (if it is not marked as never bordered). """
@@ -146,3 +168,9 @@ class Window(pygame.sprite.Sprite):
 
     def _handle(self, mouse_pos: Tuple[int, int]):
         self._state.handle(mouse_pos)
+
+    def _own_image(self):
+        """ Must be called before drawing on `image`.
+        Replaces shared image with window own copy (copy-on-write). """
+        if img.SpriteAtlas().is_shared(self.image):
+            self.image = self.image.copy()
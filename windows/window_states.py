@@ -26,7 +26,8 @@ class HiddenWindowState(WindowState):
     def __init__(self, window):
         super().__init__(window)
         # In hidden state window is invisible.
-        self.window.image.set_alpha(0)
+        self.window.set_image_alpha(0)
+        self.window.dirty = True
 
     def can_handle(self, mouse_pos: Tuple[int, int]) -> bool:
         return False
@@ -37,7 +38,8 @@ class PassiveWindowState(WindowState):
 
     def __init__(self, window):
         super().__init__(window)
-        self.window.image.set_alpha(self.window._default_alpha)
+        self.window.set_image_alpha(self.window._default_alpha)
+        self.window.dirty = True
         # In passive state window doesn't have borders.
         self.window.remove_borders()
 
@@ -51,7 +53,8 @@ class ActiveWindowState(WindowState):
 
     def __init__(self, window):
         super().__init__(window)
-        self.window.image.set_alpha(self.window._default_alpha)
+        self.window.set_image_alpha(self.window._default_alpha)
+        self.window.dirty = True
         # In active state window has borders.
         self.window.add_borders()
 